@@ -12,6 +12,10 @@ import multiprocessing as mp
 
 from RunReport import RunReport
 
+from PyInterpreter import InterpreterPool
+from BackgroundChecker import BackgroundChecker
+from gui.Console import ErrorCallback
+
 class Application:
     """
     The main class of the application
@@ -52,6 +56,7 @@ class Application:
         self.root.title("MrPython")
 
         self.mode = "full"
+        self.background_checker = BackgroundChecker(self.root, self.show_check_errors)
         self.main_view = MainView(self)
         self.editor_list = self.main_view.editor_widget.py_notebook
         self.icon_widget = self.main_view.icon_widget
@@ -63,6 +68,7 @@ class Application:
 
         self.running_interpreter_proxy = None
         self.running_interpreter_callback = None
+        self.interpreter_pool = InterpreterPool()
 
         self.expert_mode_warning_shown = False
 
@@ -89,6 +95,8 @@ class Application:
                 sys.exit(1)
                 
             self.open(event=None, filename=filename)
+        # warm up the interpreter processes once the window is displayed
+        self.root.after_idle(self.interpreter_pool.fill)
         self.main_view.show()
 
 
@@ -153,6 +161,7 @@ class Application:
         self.root.bind('<Control-Key-Return>', self.run_source)
         # File change in notebook
         self.root.bind('<<NotebookTabChanged>>', self.update_title)
+        self.root.bind('<<NotebookTabChanged>>', self.check_in_background, add='+')
 
         # Bind the keys
         if keydefs is None:
@@ -209,10 +218,41 @@ class Application:
         self.console.change_mode(tr(self.mode))
         self.status_bar.change_mode(tr(self.mode))
 
+        if self.mode == "student":
+            self.check_in_background()
+        else:
+            self.background_checker.cancel()
+            for tab in self.editor_list.tabs():
+                self.editor_list.nametowidget(tab).get_editor().clear_check_errors()
+
+    def watch_editor(self, file_editor):
+        """ Check the editor in the background when it is modified """
+        editor = file_editor.get_editor()
+        editor.set_change_hook(lambda: self.check_in_background(editor=editor))
+        self.check_in_background(editor=editor)
+
+    def check_in_background(self, event=None, editor=None):
+        """ Schedule the background checking of an editor (the current one by default) """
+        if self.mode != "student":
+            return
+        if editor is None:
+            if self.editor_list.get_size() == 0:
+                return
+            editor = self.editor_list.get_current_editor()
+        self.background_checker.schedule(editor)
+
+    def show_check_errors(self, editor, errors):
+        """ Show the errors found by the background checker in the editor """
+        if self.mode != "student":
+            return
+        editor.show_check_errors([ (error, ErrorCallback(self.console, error)) for error in errors ]
+                                 , self.status_bar.show_message)
+
     def new_file(self, event=None):
         """ Creates a new empty editor and put it into the pyEditorList """
         file_editor = PyEditorFrame(self.editor_list)
         self.editor_list.add(file_editor, self.main_view.editor_widget, text=file_editor.get_file_name())
+        self.watch_editor(file_editor)
 
     def open(self, event=None, filename=None):
         """ Open a file in the text editor """
@@ -220,6 +260,7 @@ class Application:
         if (self.editor_list.focusOn(file_editor.long_title()) == False):
             if (file_editor.isOpen()):
                 self.editor_list.add(file_editor, self.main_view.editor_widget, text=file_editor.get_file_name())
+                self.watch_editor(file_editor)
             #not clean, io should be handled here and should not require creation of PyEditor widget
             else:
               file_editor.destroy()
@@ -236,6 +277,8 @@ class Application:
             if self.running_interpreter_proxy and self.running_interpreter_proxy.process.is_alive():                
                 self.running_interpreter_proxy.process.terminate()
                 self.running_interpreter_proxy.process.join()
+            self.interpreter_pool.shutdown()
+            self.background_checker.shutdown()
             sys.exit(0)
 
 
@@ -301,6 +344,24 @@ if __name__ == "__main__":
                         help="Check the specified <file> (no GUI)")
     parser.add_argument('-r', '--run', action='store_true',
                         help="Chech and Run the specified <file> (no GUI)")
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help="Check (or run with --run) all the python files of the <file> directory or glob pattern, one JSON record per file (no GUI). The worker processes are reset after each run, and replaced periodically since a run may still change the standard modules")
+    parser.add_argument('-j', '--jobs', type=int, metavar='<n>', default=None,
+                        help="Number of worker processes in batch mode (default: number of cores), or checking the functions with --check")
+    parser.add_argument('--cpu-time', type=int, metavar='<s>', default=None,
+                        help="CPU time budget of a run, in seconds (0: no limit, default: configured)")
+    parser.add_argument('--wall-time', type=int, metavar='<s>', default=None,
+                        help="Wall time budget of a run, in seconds (0: no limit, default: configured; 60 s in batch mode without time limit)")
+    parser.add_argument('--memory', type=int, metavar='<MiB>', default=None,
+                        help="Memory (address space) budget of a run, in MiB (0: no limit, default: configured)")
+    parser.add_argument('--steps', type=int, metavar='<n>', default=None,
+                        help="Budget of executed lines of a run (0: no limit, default: configured)")
+    parser.add_argument('--test-time', type=int, metavar='<s>', default=None,
+                        help="CPU time budget of each test case (top-level assertion) of a run, in seconds (0: no limit, default: configured)")
+    parser.add_argument('--json', action='store_true',
+                        help="Print the report of --check (or --run) as JSON, with untranslated messages (cf. ReportFormat)")
+    parser.add_argument('-p', '--profile', action='store_true',
+                        help="Profile the type checking with --check (or --batch): time and calls of each phase and dispatch")
     import version
     parser.add_argument('-v', '--version', action='version', version=f"%(prog)s {version.version_string()}")
 
@@ -308,13 +369,40 @@ if __name__ == "__main__":
     config = parser.parse_args()
     
     mp.set_start_method('spawn')
+
+    budget = None
+    if config.run:
+        from StudentRunner import execution_budget
+        budget = execution_budget()
+        for (option, value) in (('cpu_time', config.cpu_time), ('wall_time', config.wall_time)
+                                , ('memory', config.memory), ('steps', config.steps)
+                                , ('test_time', config.test_time)):
+            if value is not None:
+                setattr(budget, option, value)
     
-    if config.run is False and config.check is False:
+    if config.run is False and config.check is False and config.batch is False:
         # launch app (GUI)
         app = Application()
         app.run(filename=config.file)
+    elif config.batch: # batch grading
+        import json
+        from Checkfile import BatchChecker, collect_submissions
+
+        if config.file is None:
+            print("Error: missing directory or glob pattern for batch mode.", file=sys.stderr)
+            print("<Abort>")
+            sys.exit(1)
+
+        filenames = collect_submissions(config.file)
+        print("Grading {} file(s)".format(len(filenames)), file=sys.stderr)
+
+        checker = BatchChecker(run=config.run, jobs=config.jobs, profile=config.profile, budget=budget)
+        for record in checker.grade(filenames):
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+
     else: # check and/or run
         from Checkfile import FileChecker
+        from ReportFormat import report_to_json
         filename = config.file
 
         if filename:
@@ -327,16 +415,19 @@ if __name__ == "__main__":
         
         print("Checking file: " + filename)
 
-        checker = FileChecker()
+        checker = FileChecker(jobs=config.jobs or 1, profile=config.profile, budget=budget)
 
         if config.check:
             print("<<<Typechecking>>>")
             report = checker.check(filename)
             print("<<<Check Report>>>")
-            print(report.show_detailed())
+            print(report_to_json(report) if config.json else report.show_detailed())
+            if checker.check_profile is not None:
+                print("<<<Check Profile>>>")
+                print(checker.check_profile.show())
 
         else: # config.run
             report = checker.run(filename)
         
             print("<<<Check Report>>>")
-            print(report.show_detailed())
+            print(report_to_json(report) if config.json else report.show_detailed())
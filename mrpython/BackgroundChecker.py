@@ -0,0 +1,137 @@
+from RunReport import RunReport
+from PyInterpreter import watch_connection
+from StudentRunner import recover_type_errors
+from translate import tr
+
+from typechecking.typechecker import typecheck_from_ast
+
+import multiprocessing as mp
+
+import ast
+import os
+
+# idle time (in ms) before checking a modified buffer
+CHECK_DELAY=600
+
+def check_source(source, filename, previous_ctx=None, recover=False):
+    """ Type-check a source, returns the list of reported errors
+        and the typing context (for incremental checking) """
+    report = RunReport()
+    try:
+        modast = ast.parse(source, filename or "<editor>")
+    except SyntaxError as err:
+        report.add_compilation_error('error', tr("Syntax error"), err.lineno, err.offset, details=err.text)
+        return (report.compilation_errors, previous_ctx)
+
+    ctx = typecheck_from_ast(modast, filename, source, previous_ctx, recover, incremental=True)
+    for type_error in ctx.type_errors:
+        type_error.report(report)
+
+    return (report.convention_errors, ctx)
+
+def check_worker(comm):
+    """ The main loop of the background checking process:
+        receives (job_id, source, filename) jobs and sends back
+        the (job_id, errors) results """
+    if hasattr(os, 'nice'):
+        os.nice(5) # the editor comes first
+
+    recover = recover_type_errors()
+    contexts = dict()
+    while True:
+        try:
+            job_id, source, filename = comm.recv()
+        except EOFError:
+            break
+
+        try:
+            errors, contexts[filename] = check_source(source, filename, contexts.get(filename), recover)
+        except Exception:
+            errors = [] # the checker does not handle this (incomplete) program
+
+        comm.send((job_id, errors))
+
+class BackgroundChecker:
+    """
+    Type-checks the editor buffers in a background process, once
+    they have not been modified for CHECK_DELAY ms.
+    At most one job is sent to the process at a time: a job waiting
+    for the process is replaced by any newer one, and the result of a
+    job is dropped if a check was requested in the meantime.
+    """
+    def __init__(self, root, show_errors):
+        self.root = root
+        self.show_errors = show_errors # called with the editor and the errors
+        self.process = None
+        self.comm = None
+        self.cancel_watch = None
+        self.delayed_id = None
+        self.job_id = 0
+        self.running_editor = None
+        self.pending_editor = None
+
+    def schedule(self, editor):
+        """ Check the editor after the idle delay (cancelling any previous job) """
+        self.cancel()
+        self.delayed_id = self.root.after(CHECK_DELAY, self.submit, editor)
+
+    def cancel(self):
+        """ Cancel the scheduled and pending jobs, and drop the result of the running one """
+        if self.delayed_id is not None:
+            self.root.after_cancel(self.delayed_id)
+            self.delayed_id = None
+        self.pending_editor = None
+        self.job_id += 1
+
+    def _ensure_started(self):
+        if self.process is None:
+            self.comm, there = mp.Pipe()
+            self.process = mp.Process(target=check_worker, args=(there,), daemon=True)
+            self.process.start()
+            there.close()
+
+    def submit(self, editor):
+        self.delayed_id = None
+        if self.running_editor is not None:
+            # the process is busy
+            self.pending_editor = editor
+            return
+
+        self._ensure_started()
+        self.job_id += 1
+        self.running_editor = editor
+        self.comm.send((self.job_id, editor.get("1.0", "end-1c"), editor.io.filename))
+        self.cancel_watch = watch_connection(self.root, self.comm, self.on_result, on_eof=self.on_process_exit)
+
+    def on_result(self, result):
+        self.cancel_watch = None
+        job_id, errors = result
+        editor, self.running_editor = self.running_editor, None
+        if job_id == self.job_id and editor.winfo_exists():
+            self.show_errors(editor, errors)
+
+        self.submit_pending()
+
+    def on_process_exit(self):
+        self.cancel_watch = None
+        self.running_editor = None
+        self.process = None
+        self.comm = None
+        self.submit_pending()
+
+    def submit_pending(self):
+        if self.pending_editor is not None:
+            editor, self.pending_editor = self.pending_editor, None
+            if editor.winfo_exists():
+                self.submit(editor)
+
+    def shutdown(self):
+        """ Stop the background checking """
+        self.cancel()
+        if self.cancel_watch is not None:
+            self.cancel_watch()
+            self.cancel_watch = None
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.process = None
@@ -1,33 +1,92 @@
 
-from PyInterpreter import InterpreterProxy
+from PyInterpreter import InterpreterProxy, PyInterpreter
+from StudentRunner import type_check_cache, recover_type_errors, execution_budget, preconditionsLineno
+from ExecutionBudget import budget_state, restore_budget_state
 
 import typechecking.prog_ast as prog_ast
 import typechecking.typechecker as typechecker
+import typechecking.profiler as profiler
 from RunReport import RunReport
+from translate import message
+
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+import glob
+import tokenize
+import sys
+import os
+import os.path
+import time
+
+# the wall time budget (in seconds) of a batch run, if none is configured
+BATCH_WALL_TIME = 60
+
+# a batch worker is killed this number of seconds after the budget of its run
+BATCH_GRACE_TIME = 5
+
+# the number of submissions graded by a batch worker before it is replaced
+# (the worker resets its state after each run, cf. WorkerState, but the
+# student code may still change the modules of the standard library)
+BATCH_CHECK_TASKS = 100
+BATCH_RUN_TASKS = 20
 
 class FileChecker:
-    def __init__(self):
+    def __init__(self, jobs=1, profile=False, budget=None):
+        self.jobs = jobs # number of processes checking the function bodies
+        self.profile = profile # profile the type checking (cf. typechecking.profiler)
+        self.budget = budget # the execution budget of the runs (None for the configured one)
+        self.check_profile = None # the CheckProfile of the last check
         self.interpreter = None
         self.report = None
 
     def check(self, filename):
         report = RunReport()
-        prog = prog_ast.Program()
-        prog.build_from_file(filename)
-        ctx = prog.type_check()
-        if ctx.type_errors:
-           for error in ctx.type_errors:
+        try:
+            type_errors = self.type_check(filename)
+        except IndentationError as err:
+            report.add_compilation_error('error', message("Bad indentation"), err.lineno, err.offset)
+            return report
+        except SyntaxError as err:
+            report.add_compilation_error('error', message("Syntax error"), err.lineno, err.offset, details=err.text)
+            return report
+        except UnicodeDecodeError as err:
+            report.add_compilation_error('error', message("Syntax error"), details=str(err))
+            return report
+
+        if type_errors:
+           for error in type_errors:
                error.report(report)
 
         return report
 
+    def type_check(self, filename):
+        """ The type errors of the file (SyntaxError if it cannot be parsed) """
+        cache = type_check_cache()
+        recover = recover_type_errors()
+        if self.profile:
+            # the checker must run (in this process)
+            prog = prog_ast.Program()
+            prog.build_from_file(filename)
+            ctx, self.check_profile = profiler.profile_type_check(prog, recover=recover)
+            type_errors = ctx.type_errors
+        elif cache is not None:
+            with tokenize.open(filename) as f:
+                source = f.read()
+            type_errors = cache.type_check(source, filename, recover=recover, jobs=self.jobs)
+        else:
+            prog = prog_ast.Program()
+            prog.build_from_file(filename)
+            type_errors = prog.type_check(recover=recover, jobs=self.jobs).type_errors
+        return type_errors
+
 
     def run(self, filename):
         """ Check and run the program in the current editor : execute, print results """
-        self.interpreter = InterpreterProxy(None, 'student', filename)
-        
+        self.interpreter = InterpreterProxy(None, 'student', filename, headless=True, budget=self.budget)
+
         callback_called = False
-        
+
         # the call back
         def callback(ok, report):
             # XXX: the ok is not trustable
@@ -46,15 +105,194 @@ class FileChecker:
             self.report = report
 
 
-        # non-blocking call
+        # without a Tk root, the call blocks until the report (or the death
+        # of the interpreter process) is received
         self.interpreter.execute(callback)
 
-        while self.report is None:
-            sleep(0.250)
-
         return self.report
 
 
+def collect_submissions(target):
+    """ Return the (sorted) list of python files designated by target,
+        which is either a directory, a glob pattern or a single file """
+    if os.path.isdir(target):
+        filenames = glob.glob(os.path.join(target, "**", "*.py"), recursive=True)
+    else:
+        filenames = glob.glob(target, recursive=True)
+
+    return sorted(filename for filename in filenames if os.path.isfile(filename))
+
+def grade_file(filename, run, profile=False, budget=None):
+    """ Check (and run if required, within the budget) a single submission
+        in the current process, and return its result record (with the profile
+        of the type checking if required) """
+    start_time = time.perf_counter()
+    check_profile = None
+    if run:
+        interp = PyInterpreter(None, 'student', filename, budget=budget)
+        ok, report = interp.execute()
+        if report.has_compilation_error() or report.has_execution_error():
+            ok = False
+    else:
+        checker = FileChecker(profile=profile)
+        report = checker.check(filename)
+        check_profile = checker.check_profile
+        ok = not (report.has_compilation_error()
+                  or any(err.severity == 'error' for err in report.convention_errors))
+
+    record = { 'file' : filename
+               , 'status' : 'ok' if ok else 'error'
+               , 'elapsed' : round(time.perf_counter() - start_time, 6) }
+    record.update(report.to_dict())
+    if check_profile is not None:
+        record['profile'] = check_profile.to_dict()
+    return record
+
+class WorkerState:
+    """ The state of a batch grading process that a submission may change:
+        the imported (student) modules, the module path, the working
+        directory, the preconditions and the budget timers and limits """
+    def __init__(self):
+        self.modules = set(sys.modules)
+        self.path = list(sys.path)
+        self.cwd = os.getcwd()
+        self.recursion_limit = sys.getrecursionlimit()
+        self.budget = budget_state()
+
+    def restore(self):
+        for name in [ name for name in sys.modules if name not in self.modules ]:
+            del sys.modules[name]
+        sys.path[:] = self.path
+        os.chdir(self.cwd)
+        sys.setrecursionlimit(self.recursion_limit)
+        # the preconditions of the previous submission must not be checked
+        # at runtime (cf. StudentRunner) in the next one
+        typechecker.preconditions.clear()
+        preconditionsLineno.clear()
+        restore_budget_state(self.budget)
+
+def batch_worker(comm):
+    """ The main loop of a (persistent) batch grading process:
+        receives (filename, run, profile, budget) tasks and sends back result records """
+    state = WorkerState()
+    while True:
+        try:
+            task = comm.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        filename, run, profile, budget = task
+        try:
+            record = grade_file(filename, run, profile, budget)
+        except Exception as err:
+            record = { 'file' : filename
+                       , 'status' : 'crash'
+                       , 'details' : "{}: {}".format(err.__class__.__name__, err) }
+        finally:
+            state.restore()
+        comm.send(record)
+
+class BatchWorker:
+    """ The parent side of a batch grading process """
+    def __init__(self):
+        self.comm, there = mp.Pipe()
+        self.process = mp.Process(target=batch_worker, args=(there,), daemon=True)
+        self.process.start()
+        there.close()
+        self.task = None
+        self.nb_tasks = 0
+        self.deadline = None
+
+    def submit(self, filename, run, profile=False, budget=None, time_limit=None):
+        self.task = filename
+        self.nb_tasks += 1
+        self.deadline = time.monotonic() + time_limit if time_limit is not None else None
+        self.comm.send((filename, run, profile, budget))
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+
+    def stop(self):
+        try:
+            self.comm.send(None)
+        except (OSError, EOFError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+class BatchChecker:
+    """
+    Grades a whole set of submissions with a pool of persistent
+    worker processes (one per core by default).
+    The result records are yielded as soon as they are available.
+    The runs are limited by the execution budget (the configured one by
+    default, with at least a wall time limit), and a worker still busy
+    a while after the budget of its run is killed.
+    """
+    def __init__(self, run=False, jobs=None, max_tasks_per_worker=None, profile=False, budget=None):
+        self.run = run
+        self.profile = profile # add the profiles of the type checking to the records
+        self.jobs = jobs if jobs else (os.cpu_count() or 1)
+        # workers are recycled so that student state cannot pile up
+        if max_tasks_per_worker is None:
+            max_tasks_per_worker = BATCH_RUN_TASKS if run else BATCH_CHECK_TASKS
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.budget = None
+        self.time_limit = None
+        if run:
+            self.budget = budget if budget is not None else execution_budget()
+            if self.budget.deadline() is None:
+                self.budget.wall_time = BATCH_WALL_TIME
+            self.time_limit = self.budget.deadline() + BATCH_GRACE_TIME
+
+    def submit(self, worker, filename):
+        worker.submit(filename, self.run, self.profile, self.budget, self.time_limit)
+
+    def grade(self, filenames):
+        pending = list(reversed(filenames))
+        workers = [ BatchWorker() for _ in range(min(self.jobs, len(filenames))) ]
+        try:
+            for worker in workers:
+                self.submit(worker, pending.pop())
+
+            while any(worker.task is not None for worker in workers):
+                busy = { worker.comm : worker for worker in workers if worker.task is not None }
+                deadlines = [ worker.deadline for worker in busy.values() if worker.deadline is not None ]
+                timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+                done = [ busy[comm] for comm in wait(list(busy.keys()), timeout) ]
+                # the runaway workers
+                done.extend(worker for worker in busy.values()
+                            if worker not in done and worker.deadline is not None and time.monotonic() > worker.deadline)
+                for worker in done:
+                    if worker.comm in wait([worker.comm], 0):
+                        try:
+                            record = worker.comm.recv()
+                        except EOFError:
+                            record = { 'file' : worker.task
+                                       , 'status' : 'crash'
+                                       , 'details' : "worker process died (exit code: {})".format(worker.process.exitcode) }
+                            worker.nb_tasks = self.max_tasks_per_worker # force replacement
+                    else:
+                        worker.kill()
+                        record = { 'file' : worker.task
+                                   , 'status' : 'timeout'
+                                   , 'details' : "killed after {} s (execution budget: {})".format(
+                                       self.time_limit, self.budget.limits()) }
+                        worker.nb_tasks = self.max_tasks_per_worker # force replacement
 
-        
+                    worker.task = None
+                    yield record
 
+                    if pending:
+                        if worker.nb_tasks >= self.max_tasks_per_worker:
+                            worker.stop()
+                            workers[workers.index(worker)] = worker = BatchWorker()
+                        self.submit(worker, pending.pop())
+        finally:
+            for worker in workers:
+                worker.stop()
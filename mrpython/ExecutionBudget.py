@@ -0,0 +1,191 @@
+"""
+Execution budgets of the student programs.
+
+A budget limits a single run (or evaluation) of a student program:
+  - cpu-time : the CPU seconds of the interpreter process (SIGPROF timer),
+  - wall-time : the elapsed seconds (SIGALRM timer),
+  - memory : the address space of the interpreter process, in MiB (soft RLIMIT_AS),
+  - steps : the number of executed lines of the student file (a line tracer,
+            which slows down the execution).
+Each test case (top-level assertion) of a run can also be limited to
+test-time CPU seconds (SIGVTALRM timer): a test case over budget is
+reported as an error, and the next test cases are run.
+The output of a run is also capped to max-output characters (beyond which
+it is truncated, cf. StreamedOutput).
+A limit of 0 is no limit.  Exceeding a budget interrupts the program with
+an ExecutionBudgetExceeded exception, that gives the last executed line
+of the student file.
+The timers and the memory limit are not available on every platform
+(e.g. Windows), where the budget is only enforced by the caller (e.g.
+the batch grading kills the runaway processes).
+"""
+
+import signal
+import sys
+import threading
+import traceback
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from translate import message
+
+# the budgets (in the order of the configuration options)
+BUDGETS = ('cpu-time', 'wall-time', 'memory', 'steps', 'test-time')
+
+class ExecutionBudgetExceeded(BaseException):
+    """ A budget is exhausted (not an Exception, the student code should not catch it) """
+    def __init__(self, budget, limit, lineno=None):
+        super().__init__(budget, limit)
+        self.budget = budget
+        self.limit = limit
+        self.lineno = lineno
+
+    def details(self):
+        units = { 'cpu-time' : "s", 'wall-time' : "s", 'memory' : " MiB", 'steps' : "", 'test-time' : "s" }
+        return message("the {} budget is exhausted (limit: {})", self.budget, "{}{}".format(self.limit, units[self.budget]))
+
+class ExecutionBudget:
+    """ The limits of a run (0 for no limit) """
+    def __init__(self, cpu_time=0, wall_time=0, memory=0, steps=0, max_output=0, test_time=0):
+        self.cpu_time = cpu_time # seconds
+        self.wall_time = wall_time # seconds
+        self.memory = memory # MiB
+        self.steps = steps # lines
+        self.test_time = test_time # seconds (of each test case)
+        self.max_output = max_output # characters (the output is truncated)
+        # the last executed line of the student file (known if the steps are counted)
+        self.last_lineno = None
+
+    def is_limited(self):
+        return bool(self.cpu_time or self.wall_time or self.memory or self.steps)
+
+    def limits(self):
+        return { 'cpu-time' : self.cpu_time, 'wall-time' : self.wall_time
+                 , 'memory' : self.memory, 'steps' : self.steps, 'test-time' : self.test_time }
+
+    def deadline(self):
+        """ The elapsed seconds after which the run is certainly over budget (or None) """
+        if not (self.cpu_time or self.wall_time):
+            return None
+        return max(self.cpu_time, self.wall_time)
+
+    def last_student_line(self, filename, tb):
+        if self.last_lineno is not None:
+            return self.last_lineno
+        lineno = None
+        for (frame, frame_lineno) in traceback.walk_tb(tb):
+            if frame.f_code.co_filename == filename:
+                lineno = frame_lineno
+        return lineno
+
+    def step_tracer(self, filename):
+        nb_steps = 0
+        def trace_line(frame, event, arg):
+            nonlocal nb_steps
+            if event == 'line':
+                self.last_lineno = frame.f_lineno
+                nb_steps += 1
+                if nb_steps > self.steps:
+                    raise ExecutionBudgetExceeded('steps', self.steps, frame.f_lineno)
+            return trace_line
+
+        def trace_call(frame, event, arg):
+            # only the student code is traced
+            if frame.f_code.co_filename == filename:
+                return trace_line
+            return None
+
+        return trace_call
+
+    def run(self, filename, fun):
+        """ Call fun() (running the code of the student file) within the budget """
+        if not self.is_limited():
+            return fun()
+
+        self.last_lineno = None
+        restore = []
+        memory_limit = None
+        timers = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+        def on_timer(budget, limit):
+            def handler(signum, frame):
+                raise ExecutionBudgetExceeded(budget, limit)
+            return handler
+
+        try:
+            if self.cpu_time and timers:
+                restore.append((signal.SIGPROF, signal.signal(signal.SIGPROF, on_timer('cpu-time', self.cpu_time))))
+                signal.setitimer(signal.ITIMER_PROF, self.cpu_time)
+            if self.wall_time and timers:
+                restore.append((signal.SIGALRM, signal.signal(signal.SIGALRM, on_timer('wall-time', self.wall_time))))
+                signal.setitimer(signal.ITIMER_REAL, self.wall_time)
+            if self.memory and resource is not None:
+                memory_limit = resource.getrlimit(resource.RLIMIT_AS)
+                soft = self.memory * 1024 * 1024
+                if memory_limit[1] != resource.RLIM_INFINITY:
+                    soft = min(soft, memory_limit[1])
+                resource.setrlimit(resource.RLIMIT_AS, (soft, memory_limit[1]))
+            if self.steps:
+                sys.settrace(self.step_tracer(filename))
+
+            return fun()
+        except MemoryError as err:
+            if not self.memory:
+                raise
+            raise ExecutionBudgetExceeded('memory', self.memory, self.last_student_line(filename, err.__traceback__)) from None
+        except ExecutionBudgetExceeded as err:
+            if err.lineno is None:
+                err.lineno = self.last_student_line(filename, err.__traceback__)
+            raise
+        finally:
+            if self.steps:
+                sys.settrace(None)
+            for (signum, handler) in restore:
+                signal.setitimer(signal.ITIMER_PROF if signum == signal.SIGPROF else signal.ITIMER_REAL, 0)
+                signal.signal(signum, handler)
+            if memory_limit is not None:
+                resource.setrlimit(resource.RLIMIT_AS, memory_limit)
+
+    def run_test(self, fun):
+        """ Call fun() (running a test case, within run) within the test time budget """
+        if not (self.test_time and hasattr(signal, 'SIGVTALRM')
+                and threading.current_thread() is threading.main_thread()):
+            return fun()
+
+        def on_timer(signum, frame):
+            raise ExecutionBudgetExceeded('test-time', self.test_time)
+
+        handler = signal.signal(signal.SIGVTALRM, on_timer)
+        signal.setitimer(signal.ITIMER_VIRTUAL, self.test_time)
+        try:
+            return fun()
+        finally:
+            signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+            signal.signal(signal.SIGVTALRM, handler)
+
+# the interval timers of the budgets, with their signals
+BUDGET_TIMERS = (('ITIMER_PROF', 'SIGPROF'), ('ITIMER_REAL', 'SIGALRM'), ('ITIMER_VIRTUAL', 'SIGVTALRM'))
+
+def budget_state():
+    """ The signal handlers and memory limit of the process, that the
+        budgets of a run change (cf. restore_budget_state) """
+    handlers = []
+    if hasattr(signal, 'setitimer'):
+        handlers = [ (getattr(signal, timer), getattr(signal, signum), signal.getsignal(getattr(signal, signum)))
+                     for (timer, signum) in BUDGET_TIMERS ]
+    memory_limit = resource.getrlimit(resource.RLIMIT_AS) if resource is not None else None
+    return (handlers, memory_limit)
+
+def restore_budget_state(state):
+    """ Cancel the timers and the line tracer left by a run (e.g. interrupted
+        while restoring them), and restore the handlers and memory limit """
+    handlers, memory_limit = state
+    sys.settrace(None)
+    for (timer, signum, handler) in handlers:
+        signal.setitimer(timer, 0)
+        signal.signal(signum, handler)
+    if memory_limit is not None:
+        resource.setrlimit(resource.RLIMIT_AS, memory_limit)
@@ -5,17 +5,19 @@ import tokenize
 import sys
 import traceback
 
-import tempfile
+from StreamedOutput import StreamedOutput
 
 class FullRunner:
     """
     Runs a code under the full mode
     """
     
-    def __init__(self, filename, source):
+    def __init__(self, filename, source, max_output=0):
         self.filename = filename
         self.source = source
         self.report = RunReport()        
+        # the cap of the captured errors (cf. StreamedOutput)
+        self.max_output = max_output
 
 
     def get_report(self):
@@ -27,55 +29,51 @@ class FullRunner:
         """ Run the code """
         basic_interpreter = InteractiveInterpreter(locals=locals)
 
-        with tempfile.TemporaryFile(mode='w+', prefix='interpreter_error') as error_output:
-        
-            original_error = sys.stderr
-            sys.stderr = error_output
-            try:
-                if mode == 'exec':
-                    code = compile(self.source, self.filename, 'exec')
-                else:
-                    code = compile(self.expr, '<string>', 'eval')
-            except:
-                InteractiveInterpreter.showsyntaxerror(self.filename)
-                sys.stderr.seek(0)
-                result = sys.stderr.read()
-                self.report.add_compilation_error('error', err_type='SyntaxError', details=result)
-                return False
-            else: # No compilation errors here
-                if mode == 'exec':
-                    result = basic_interpreter.runcode(code)
+        error_output = StreamedOutput(max_output=self.max_output)
+        original_error = sys.stderr
+        sys.stderr = error_output
+        try:
+            if mode == 'exec':
+                code = compile(self.source, self.filename, 'exec')
+            else:
+                code = compile(self.expr, '<string>', 'eval')
+        except:
+            InteractiveInterpreter.showsyntaxerror(self.filename)
+            result = sys.stderr.getvalue()
+            self.report.add_compilation_error('error', err_type='SyntaxError', details=result)
+            return False
+        else: # No compilation errors here
+            if mode == 'exec':
+                result = basic_interpreter.runcode(code)
 
-                    sys.stderr.seek(0)
-                    result = sys.stderr.read()
-                    if result:
-                        self.report.add_compilation_error('error', err_type='SyntaxError', details=result)
-                        return False
-                    else:
-                        sys.stdout.seek(0)
-                        result = sys.stdout.read()
-                        self.report.set_result(result)
-                        return True
+                result = sys.stderr.getvalue()
+                if result:
+                    self.report.add_compilation_error('error', err_type='SyntaxError', details=result)
+                    return False
+                else:
+                    # the output not streamed (cf. StreamedOutput)
+                    self.report.set_output(sys.stdout.getvalue())
+                    return True
 
-                else: # mode eval
-                    try:
-                        result = eval(code, locals, locals)
-                    except Exception as err:
-                        a, b, tb = sys.exc_info() # Get the traceback object
-                        # Extract the information for the traceback corresponding to the error
-                        # inside the source code : [0] refers to the result = exec(code)
-                        # traceback, [1] refers to the last error inside code
-                        filename, lineno, file_type, line = traceback.extract_tb(tb)[1]
-                        print(traceback.format_exception(a, b, tb))
-                        tb_str = "".join(traceback.format_exception_only(a, b))
-                        self.report.add_execution_error('error', a.__name__, details=str(err))
-                        return False
+            else: # mode eval
+                try:
+                    result = eval(code, locals, locals)
+                except Exception as err:
+                    a, b, tb = sys.exc_info() # Get the traceback object
+                    # Extract the information for the traceback corresponding to the error
+                    # inside the source code : [0] refers to the result = exec(code)
+                    # traceback, [1] refers to the last error inside code
+                    filename, lineno, file_type, line = traceback.extract_tb(tb)[1]
+                    print(traceback.format_exception(a, b, tb))
+                    tb_str = "".join(traceback.format_exception_only(a, b))
+                    self.report.add_execution_error('error', a.__name__, details=str(err))
+                    return False
 
-                    self.report.set_result(result)
-                    return True
+                self.report.set_result(result)
+                return True
 
-            finally:
-                sys.stderr = original_error
+        finally:
+            sys.stderr = original_error
 
     def execute(self, locals):
         """ Run the code """
@@ -1,7 +1,9 @@
-from StudentRunner import StudentRunner
+from StudentRunner import StudentRunner, execution_budget
 from FullRunner import FullRunner
-from translate import tr
+from translate import tr, message
 from RunReport import RunReport
+from StreamedOutput import StreamedOutput, OutputChunk
+from ReportFormat import encode_report, decode_report
 
 import multiprocessing as mp
 
@@ -11,63 +13,200 @@ import tokenize
 
 import sys
 
-import tempfile
+import threading
 
-import time
+# number of warm interpreter processes kept ready by the pool
+INTERPRETER_POOL_SIZE=1
 
-RUN_POLL_DELAY=250
+def start_interpreter_process(headless=False):
+    """ Start a new interpreter process, waiting for its setup message """
+    comm, there = mp.Pipe()
+    process = mp.Process(target=run_process, args=(there, headless), daemon=True)
+    process.start()
+    # only the child keeps its end of the pipe (so that we get EOF if it dies)
+    there.close()
+    return (process, comm)
+
+class InterpreterPool:
+    """
+    A pool of pre-started interpreter processes: the python start-up and
+    the imports (runners, typechecker, tkinter) are paid in advance so that
+    running a program does not wait for them.
+    A process is only used for a single run (it is never given back to the pool)
+    so that no student state can leak from one run to the next.
+    """
+    def __init__(self, size=INTERPRETER_POOL_SIZE, headless=False):
+        self.size = size
+        self.headless = headless
+        self.ready = []
+
+    def fill(self):
+        """ Start processes until the pool is full """
+        while len(self.ready) < self.size:
+            self.ready.append(start_interpreter_process(self.headless))
+
+    def acquire(self):
+        """ Take a warm process out of the pool (or start one if none is ready),
+            and replenish the pool """
+        process_comm = None
+        while self.ready:
+            process, comm = self.ready.pop(0)
+            if process.is_alive():
+                process_comm = (process, comm)
+                break
+        if process_comm is None:
+            process_comm = start_interpreter_process(self.headless)
+        self.fill()
+        return process_comm
+
+    def shutdown(self):
+        """ Stop all the idle processes """
+        for process, comm in self.ready:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.ready = []
+
+def watch_connection(root, comm, on_message, on_eof=None):
+    """
+    Call on_message with the next object received from comm (or on_eof if
+    the other side is gone) as soon as it is available.
+    With a Tk root the wait is left to the Tk event loop (no polling),
+    without a root the call simply blocks.
+    Returns a function cancelling the watch.
+    """
+    def deliver():
+        try:
+            message = comm.recv()
+        except (EOFError, OSError):
+            if on_eof is not None:
+                on_eof()
+            return
+        on_message(message)
+
+    if root is None:
+        deliver()
+        return lambda: None
+
+    tkapp = root.tk
+    watching = True
+
+    if hasattr(tkapp, 'createfilehandler'):
+        fd = comm.fileno()
+
+        def cancel():
+            nonlocal watching
+            if watching:
+                watching = False
+                tkapp.deletefilehandler(fd)
+
+        def on_readable(file, mask):
+            cancel()
+            deliver()
+
+        tkapp.createfilehandler(fd, tk.READABLE, on_readable)
+        return cancel
+
+    # no file handlers (Windows): wait in a helper thread and
+    # hand the delivery over to the Tk thread
+    def cancel():
+        nonlocal watching
+        watching = False
+
+    def deliver_if_watching():
+        if watching:
+            cancel()
+            deliver()
+
+    def wait_message():
+        try:
+            comm.poll(None)
+        except (EOFError, OSError):
+            pass
+        if watching:
+            try:
+                root.after_idle(deliver_if_watching)
+            except (RuntimeError, tk.TclError):
+                pass # the Tk root is gone
+
+    threading.Thread(target=wait_message, daemon=True).start()
+    return cancel
 
 class InterpreterProxy:
     """
     This is a multiprocessing proxy for the underlying python interpreter.
+    If a pool is given, the interpreter process is taken from it.
+    A headless interpreter only initializes Tk if the program opens a window.
+    The execution budget (cf. ExecutionBudget) is the configured one by default.
+    With stream_output (and a Tk root), the output of the program is passed
+    to the on_output callback (by chunks) while the program runs.
+    The reports are sent encoded (cf. ReportFormat).
     """
-    def __init__(self, root, mode, filename):
-        self.comm, there = mp.Pipe()
-        self.process = mp.Process(target=run_process, args=(there, mode, filename))
+    def __init__(self, root, mode, filename, pool=None, headless=False, budget=None, stream_output=False):
+        if pool is not None:
+            self.process, self.comm = pool.acquire()
+        else:
+            self.comm, there = mp.Pipe()
+            self.process = mp.Process(target=run_process, args=(there, headless))
+        self.comm.send('setup')
+        self.comm.send((mode, filename, budget, stream_output))
         self.root = root
+        self.cancel_watch = None
 
-    def run_evaluation(self, expr, callback):
-        if not self.process.is_alive():
+    def _ensure_started(self):
+        if self.process.pid is None:
             self.process.start()
 
-        def timer_callback():
-            if self.comm.poll():
-                try:
-                    ok, report = self.comm.recv()
-                    callback(ok, report)
-                except EOFError:
-                    self.kill()
-                    # report = RunReport()
-                    # report.add_execution_error('error', 'interpreter-stop')
-                    # callback(False, report)
-            else:
-                self.root.after(RUN_POLL_DELAY, timer_callback)
-            
-        self.comm.send('eval')
-        self.comm.send(expr)
-        timer_callback()
+    def _died(self, callback):
+        """ Report the death of the interpreter process (without any result) """
+        self.kill()
+        self.process.join()
+        report = RunReport()
+        report.add_execution_error('error', message("The interpreter process died")
+                                   , details=message("exit code: {}", self.process.exitcode))
+        callback(False, report)
 
-    def execute(self, callback):
-        if not self.process.is_alive():
-            self.process.start()
+    def _watch_result(self, callback, on_output=None):
+        def on_eof():
+            self.cancel_watch = None
+            self._died(callback)
 
-        def timer_callback():
-            if self.comm.poll():
-                ok, report = self.comm.recv()
-                # print("[proxy] RECV: exec ok ? {}  report={}".format(ok, report))
-                callback(ok, report)
-            else:
-                if self.root:
-                    self.root.after(RUN_POLL_DELAY, timer_callback)
-                else:
-                    time.sleep(RUN_POLL_DELAY / 1000.0)
-                    timer_callback()
+        def on_result(result):
+            self.cancel_watch = None
+            if isinstance(result, OutputChunk):
+                # the program is still running
+                if on_output is not None:
+                    on_output(result.text)
+                self._watch_result(callback, on_output)
+                return
+            ok, report = result
+            callback(ok, decode_report(report))
 
-            
-        self.comm.send('exec')
-        timer_callback()
+        self.cancel_watch = watch_connection(self.root, self.comm, on_result, on_eof=on_eof)
+
+    def run_evaluation(self, expr, callback, on_output=None):
+        self._ensure_started()
+        try:
+            self.comm.send('eval')
+            self.comm.send(expr)
+        except OSError: # the process is gone
+            self._died(callback)
+            return
+        self._watch_result(callback, on_output)
+
+    def execute(self, callback, on_output=None):
+        self._ensure_started()
+        try:
+            self.comm.send('exec')
+        except OSError:
+            self._died(callback)
+            return
+        self._watch_result(callback, on_output)
             
     def kill(self):
+        if self.cancel_watch is not None:
+            self.cancel_watch()
+            self.cancel_watch = None
         if self.process.is_alive():
             self.process.terminate()
             self.process.join()
@@ -75,28 +214,51 @@ class InterpreterProxy:
         else:
             return False
 
-def run_process(comm, mode, filename):
+def run_process(comm, headless=False):
+    """
+    The main loop of an interpreter process.
+    A headless process does not create any Tk root: the commands are
+    read in a blocking loop, until the program opens a window (cf. show_image)
+    and the Tk event loop has to take over.
+    """
     
-    root = tk.Tk()
+    root = None
     
-    interp = PyInterpreter(root, mode, filename)
+    interp = None
     
-    def run_loop():
-        command = comm.recv()
-        if command == 'eval':
+    def run_command(command):
+        nonlocal interp
+        if command == 'setup':
+            mode, filename, budget, stream_output = comm.recv()
+            interp = PyInterpreter(root, mode, filename, budget=budget,
+                                   send_output=comm.send if stream_output else None)
+        elif command == 'eval':
             expr = comm.recv()
             ok, report = interp.run_evaluation(expr)
-            comm.send((ok, report))
+            comm.send((ok, encode_report(report, shared_output=True)))
         elif command == 'exec':
             ok, report = interp.execute()
             # print("[interp] exec ok ? {}  report={}".format(ok, report))
-            comm.send((ok, report))
+            comm.send((ok, encode_report(report, shared_output=True)))
+
+    def run_tk_command(command):
+        run_command(command)
+        watch_connection(root, comm, run_tk_command, on_eof=root.destroy)
 
-        root.after(10, run_loop)
+    if headless:
+        while tk._default_root is None:
+            try:
+                command = comm.recv()
+            except EOFError:
+                return
+            run_command(command)
+        root = tk._default_root
+    else:
+        root = tk.Tk()
+        root.title(tr("Interpretation."))
+        root.withdraw()
 
-    root.title(tr("Interpretation."))
-    root.after(10, run_loop)
-    root.withdraw()
+    watch_connection(root, comm, run_tk_command, on_eof=root.destroy)
     root.mainloop()
     
         
@@ -106,11 +268,15 @@ class PyInterpreter:
     a report that will be sent to the Console
     """
 
-    def __init__(self, root, mode, filename, source=None):
+    def __init__(self, root, mode, filename, source=None, budget=None, send_output=None):
         self.root = root
         self.filename = filename
         self.source = source
         self.mode = mode
+        # the execution budget (in student mode) and the output cap
+        self.budget = budget if budget is not None else execution_budget()
+        # the output is streamed with send_output (if not None), cf. StreamedOutput
+        self.send_output = send_output
         # This dictionnary can keep the local declarations form the execution of code
         # Will be used for evaluation
         self.locals = dict()
@@ -119,16 +285,15 @@ class PyInterpreter:
     def run_evaluation(self, expr):
         """ Run the evaluation of expr """
 
-        with tempfile.TemporaryFile(mode='w+', prefix='interpreter_output') as output_file:
-
-            original_stdout = sys.stdout
-            sys.stdout = output_file
-        
+        output = StreamedOutput(self.send_output, self.budget.max_output)
+        original_stdout = sys.stdout
+        sys.stdout = output
+        try:
             runner = None
             if self.mode == "student":
-                runner = StudentRunner(self.root, self.filename, expr)
+                runner = StudentRunner(self.root, self.filename, expr, check_tk=self.root is not None, budget=self.budget)
             else:
-                runner = FullRunner(self.filename, expr)
+                runner = FullRunner(self.filename, expr, max_output=self.budget.max_output)
 
             ok = runner.evaluate(expr, self.locals)
             report = runner.get_report()
@@ -136,25 +301,27 @@ class PyInterpreter:
             report.set_header(begin_report)
             end_report = "\n" + ('=' * len(begin_report)) + "\n\n"
             report.set_footer(end_report)
-            
+        finally:
+            # the output chunks are sent before the report
+            output.finish()
             sys.stdout = original_stdout
-        
-            return (ok, report)
+
+        return (ok, report)
 
     def execute(self):
         """ Execute the runner corresponding to the chosen Python mode """
         with tokenize.open(self.filename) as fp:
             source = fp.read()
 
-        with tempfile.TemporaryFile(mode='w+', prefix="interpreter_output") as output_file:
-            original_stdout = sys.stdout
-            sys.stdout = output_file
-            
+        output = StreamedOutput(self.send_output, self.budget.max_output)
+        original_stdout = sys.stdout
+        sys.stdout = output
+        try:
             runner = None
             if self.mode == "student":
-                runner = StudentRunner(self.root, self.filename, source)
+                runner = StudentRunner(self.root, self.filename, source, check_tk=self.root is not None, budget=self.budget)
             else:
-                runner = FullRunner(self.filename, source)
+                runner = FullRunner(self.filename, source, max_output=self.budget.max_output)
 
             ok = runner.execute(self.locals)
 
@@ -175,8 +342,10 @@ class PyInterpreter:
             report.set_header(begin_report)
             end_report = "\n" + ('=' * len_begin_report) + "\n\n"
             report.set_footer(end_report)
-
+        finally:
+            # the output chunks are sent before the report
+            output.finish()
             sys.stdout = original_stdout
-            
-            return (ok, report)
+
+        return (ok, report)
 
@@ -0,0 +1,147 @@
+"""
+The (versioned) encoding of the run reports.
+
+The interpreter process sends its RunReport to the IDE (or to the
+batch checker) encoded with encode_report, a plain structure (dict,
+lists, strings and numbers) that is also the JSON export of a report:
+
+    { 'version' : 2
+      'errors' : [ [kind, severity, err_type, line, offset, details], ... ]
+      'output' : ...  'header' : ...  'footer' : ...  'result' : ...
+      'nb_defined_funs' : ...  'nb_passed_tests' : ...
+      'tests' : [ {'line', 'status', 'elapsed', 'calls'}, ... ] }
+
+where kind is 'convention', 'compilation' or 'execution'.  The messages
+(err_type and details) are sent untranslated, as a list [domain, msgid,
+arg, ...] (cf. translate.Message, an argument can itself be such a
+message), or as a plain string.  The result of
+an evaluation is sent as its repr.
+A large output is not copied through the pipe: it is written to a shared
+memory block, sent as a reference ['shm', name, size], that the receiver
+reads and releases (decode_report).  A truncated output (or error
+details, cf. StreamedOutput) is sent as ['truncated', head, dropped, tail].
+Decoding a report only requires this module, RunReport, StreamedOutput
+and the translations (not the GUI).
+"""
+
+import json
+import os
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from RunReport import RunReport
+from StreamedOutput import TruncatedOutput
+from translate import Message
+
+# the version of the encoding (a report of another version is rejected)
+REPORT_FORMAT_VERSION = 2
+
+# the outputs larger than this (in bytes) are sent through shared memory
+SHARED_OUTPUT_SIZE = 64 * 1024
+
+ERROR_KINDS = ('convention', 'compilation', 'execution')
+
+def encode_message(message):
+    if message is None or isinstance(message, (str, int)):
+        return message
+    if isinstance(message, Message):
+        return [ message.domain, message.msgid ] + [ encode_message(arg) for arg in message.args ]
+    if isinstance(message, TruncatedOutput):
+        return encode_output(message)
+    return str(message)
+
+def decode_message(message):
+    if isinstance(message, list) and message[0] == 'truncated':
+        return decode_output(message)
+    if isinstance(message, list):
+        domain, msgid, *args = message
+        return Message(msgid, *(decode_message(arg) for arg in args), domain=domain)
+    return message
+
+def encode_output(output, shared=False):
+    """ The output, or a reference to a shared memory block
+        holding it (if shared and the output is large) """
+    if isinstance(output, TruncatedOutput):
+        return [ 'truncated', encode_output(output.head, shared), output.dropped
+                 , encode_output(output.tail, shared) ]
+    if not (shared and shared_memory is not None and os.name == 'posix'):
+        # (on Windows the block would be gone before it is read)
+        return output
+    data = output.encode("utf-8", "surrogatepass")
+    if len(data) <= SHARED_OUTPUT_SIZE:
+        return output
+    try:
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+    except OSError:
+        return output
+    block.buf[:len(data)] = data
+    name = block.name
+    block.close()
+    return [ 'shm', name, len(data) ]
+
+def decode_output(output):
+    if not isinstance(output, list):
+        return output
+    if output[0] == 'truncated':
+        _, head, dropped, tail = output
+        return TruncatedOutput(decode_output(head), dropped, decode_output(tail))
+    _, name, size = output
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except OSError:
+        return ""
+    try:
+        return bytes(block.buf[:size]).decode("utf-8", "surrogatepass")
+    finally:
+        block.close()
+        block.unlink()
+
+def encode_report(report, shared_output=False):
+    """ The (plain) encoding of the report, with its output in
+        shared memory if shared_output (and the output is large) """
+    errors = []
+    for (kind, kind_errors) in zip(ERROR_KINDS, (report.convention_errors
+                                                 , report.compilation_errors
+                                                 , report.execution_errors)):
+        for err in kind_errors:
+            errors.append([ kind, err.severity, encode_message(err.err_type), err.line, err.offset
+                            , encode_message(err.details) ])
+
+    return { 'version' : REPORT_FORMAT_VERSION
+             , 'errors' : errors
+             , 'output' : encode_output(report.output, shared_output)
+             , 'header' : report.header
+             , 'footer' : report.footer
+             , 'result' : report.result_text() if report.has_result() else None
+             , 'nb_defined_funs' : report.nb_defined_funs
+             , 'nb_passed_tests' : report.nb_passed_tests
+             , 'tests' : report.test_results }
+
+def decode_report(data):
+    """ The RunReport encoded by encode_report """
+    if not isinstance(data, dict) or data.get('version') != REPORT_FORMAT_VERSION:
+        raise ValueError("Unsupported report format (version: {})".format(
+            data.get('version') if isinstance(data, dict) else None))
+
+    report = RunReport()
+    add_error = { 'convention' : report.add_convention_error
+                  , 'compilation' : report.add_compilation_error
+                  , 'execution' : report.add_execution_error }
+    for (kind, severity, err_type, line, offset, details) in data['errors']:
+        add_error[kind](severity, decode_message(err_type), line, offset, decode_message(details))
+
+    report.set_output(decode_output(data['output']))
+    report.set_header(data['header'])
+    report.set_footer(data['footer'])
+    report.result_repr = data['result']
+    report.nb_defined_funs = data['nb_defined_funs']
+    report.nb_passed_tests = data['nb_passed_tests']
+    report.test_results = data['tests']
+    return report
+
+def report_to_json(report):
+    """ The JSON export of the report (e.g. for the command line) """
+    return json.dumps(encode_report(report), ensure_ascii=False)
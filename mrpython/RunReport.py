@@ -25,13 +25,21 @@ class ErrorReport:
                               tr(": line {}\n").format(self.line) if self.line else "")
             s = s + self.error_details()
         else:
-            s = self.details
+            s = str(self.details)
 
         return s
 
     def __repr__(self):
         return str(self)
 
+    def to_dict(self):
+        """Return a plain (json-compatible) description of the error."""
+        return { 'severity' : self.severity
+                 , 'type' : str(self.err_type)
+                 , 'line' : self.line
+                 , 'offset' : self.offset
+                 , 'details' : str(self.details) if self.details is not None else "" }
+
 
 class RunReport:
     """
@@ -45,12 +53,17 @@ class RunReport:
         self.execution_errors = []
 
         self.result = None
+        # the repr of the result, for a decoded report (cf. ReportFormat)
+        self.result_repr = None
         self.output = ""
 
         self.header = ""
         self.footer = ""
 
         self.nb_passed_tests = 0
+        self.nb_defined_funs = 0
+        # the results of the test cases (top-level assertions), in order
+        self.test_results = []
 
 
     def add_convention_error(self, severity, err_type, line=None, offset=None, details=""):
@@ -71,14 +84,32 @@ class RunReport:
     def has_execution_error(self):
         return bool(self.execution_errors)
         
+    def add_test_result(self, line, status, elapsed, calls):
+        """ Add the result of a test case: its status ('pass', 'fail' or 'error'),
+            its (wall) time in seconds and the number of calls of the tested functions """
+        self.test_results.append({ 'line' : line
+                                   , 'status' : status
+                                   , 'elapsed' : round(elapsed, 6)
+                                   , 'calls' : calls })
+
     def set_output(self, output):
-        """Set the (standard) output of an execution."""
+        """Set the (standard) output of an execution (a string, or a
+           TruncatedOutput if it is too large, cf. StreamedOutput)."""
         self.output = output
 
     def set_result(self, result):
         """ Set the result of the execution : no error occured """
         self.result = result
 
+    def has_result(self):
+        return self.result is not None or self.result_repr is not None
+
+    def result_text(self):
+        """ The repr of the result of the evaluation """
+        if self.result_repr is not None:
+            return self.result_repr
+        return repr(self.result)
+
     def set_header(self, header):
         self.header = header
 
@@ -97,6 +128,16 @@ Report:
            self.execution_errors,
            self.output)
 
+    def to_dict(self):
+        """Return a plain (json-compatible) description of the report."""
+        return { 'convention_errors' : [ err.to_dict() for err in self.convention_errors ]
+                 , 'compilation_errors' : [ err.to_dict() for err in self.compilation_errors ]
+                 , 'execution_errors' : [ err.to_dict() for err in self.execution_errors ]
+                 , 'output' : str(self.output)
+                 , 'nb_defined_funs' : self.nb_defined_funs
+                 , 'nb_passed_tests' : self.nb_passed_tests
+                 , 'tests' : self.test_results }
+
     def show_detailed(self):
         
         ret = ""
@@ -125,9 +166,19 @@ Report:
                 ret += str(err)
                 ret += "\n"
 
+        if self.test_results:
+            ret += tr("Tests:\n")
+            ret += "------\n"
+
+            for test in self.test_results:
+                ret += tr("line {}: {} ({:.3f} s)").format(test['line'], tr(test['status']), test['elapsed'])
+                for (fun_name, nb_calls) in test['calls'].items():
+                    ret += ", {}: {}".format(fun_name, nb_calls)
+                ret += "\n"
+
         if self.output:
             ret += tr("<<<Output>>>\n")
-            ret += self.output
+            ret += str(self.output)
 
         return ret
     
@@ -0,0 +1,168 @@
+"""
+The (in-memory) capture of the output of the student programs.
+
+The output written by a running program is either streamed by chunks
+(e.g. to the console of the IDE, while the program runs) or kept in
+memory (e.g. for the batch grading, which reports it at the end).
+In both cases the output is capped: only its head and its tail (the
+last characters, kept in a ring buffer) are retained, and a note says
+how many characters were dropped in between (cf. TruncatedOutput, the
+note is translated where the output is displayed).
+
+The chunks are sent by a helper thread, at most FLUSH_DELAY seconds
+after they are written (or as soon as CHUNK_SIZE characters are
+pending), so that the (main) thread of the program is never interrupted
+in the middle of a message (cf. ExecutionBudget).  When the other side
+does not keep up, the pipe fills up and the program waits before its
+next chunk: the output never piles up in memory.
+"""
+
+import collections
+import io
+import threading
+
+from translate import message
+
+# the size of the streamed chunks (in characters)
+CHUNK_SIZE = 8192
+
+# the pending output is sent after this delay (in seconds), even if it is small
+FLUSH_DELAY = 0.1
+
+class TailBuffer:
+    """ A ring buffer of the last (at most) size characters written """
+    def __init__(self, size):
+        self.size = size
+        self.parts = collections.deque()
+        self.length = 0
+
+    def append(self, s):
+        self.parts.append(s)
+        self.length += len(s)
+        while self.parts and self.length - len(self.parts[0]) >= self.size:
+            self.length -= len(self.parts.popleft())
+        excess = self.length - self.size
+        if excess > 0:
+            self.parts[0] = self.parts[0][excess:]
+            self.length -= excess
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+class TruncatedOutput:
+    """ An output whose middle is dropped: its head, the number of
+        dropped characters and its tail """
+    def __init__(self, head, dropped, tail):
+        self.head = head
+        self.dropped = dropped
+        self.tail = tail
+
+    def truncation_note(self):
+        return message("\n[... output truncated: {} characters not shown]\n", self.dropped)
+
+    def __str__(self):
+        return self.head + str(self.truncation_note()) + self.tail
+
+class OutputChunk:
+    """ A chunk of the output of a running program (sent to the console) """
+    def __init__(self, text):
+        self.text = text
+
+class StreamedOutput(io.TextIOBase):
+    """ The sys.stdout (or sys.stderr) of a student program: the output is
+        sent by chunks with send_chunk (if not None) or kept, and capped to
+        max_output characters (0 for no cap), half of them for its tail """
+    def __init__(self, send_chunk=None, max_output=0):
+        self.send_chunk = send_chunk
+        self.max_output = max_output
+        self.head_size = max_output - max_output // 2
+        self.size = 0 # the number of characters of the head
+        self.overflow = 0 # the number of characters after the head
+        self.tail = TailBuffer(max_output // 2)
+        self.parts = [] # the pending chunk or the kept head
+        self.pending = 0
+        self.cond = threading.Condition()
+        self.stopping = False
+        self.sender = None
+        if send_chunk is not None:
+            self.sender = threading.Thread(target=self.send_chunks, daemon=True)
+            self.sender.start()
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        if not isinstance(s, str):
+            raise TypeError("write() argument must be str, not {}".format(s.__class__.__name__))
+        length = len(s)
+        with self.cond:
+            if self.max_output:
+                room = self.head_size - self.size
+                if length > room:
+                    self.tail.append(s[room:])
+                    self.overflow += length - room
+                    s = s[:room]
+            if not s:
+                return length
+            self.size += len(s)
+            self.parts.append(s)
+            if self.sender is not None:
+                self.pending += len(s)
+                if self.pending >= CHUNK_SIZE:
+                    # wait for the previous chunk (backpressure)
+                    self.cond.notify_all()
+                    self.cond.wait_for(lambda: self.pending < CHUNK_SIZE or self.sender is None)
+        return length
+
+    def send_chunks(self):
+        """ The loop of the sending thread """
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending >= CHUNK_SIZE or self.stopping, FLUSH_DELAY)
+                text = "".join(self.parts)
+                self.parts = []
+                self.pending = 0
+                stopping = self.stopping
+                self.cond.notify_all()
+            if text:
+                try:
+                    self.send_chunk(OutputChunk(text))
+                except (OSError, EOFError):
+                    stopping = True # nobody is listening anymore
+            if stopping:
+                with self.cond:
+                    self.sender = None
+                    self.parts = []
+                    self.cond.notify_all()
+                return
+
+    def finish(self):
+        """ Send the pending output and stop the sending thread """
+        sender = self.sender
+        if sender is not None:
+            with self.cond:
+                self.stopping = True
+                self.cond.notify_all()
+            sender.join()
+
+    def flush(self):
+        # the chunks are sent in the background (cf. send_chunks)
+        pass
+
+    def getvalue(self):
+        """ The output to report at the end of the run: the kept head
+            (nothing if it is streamed) and the tail, as a TruncatedOutput
+            if characters were dropped in between """
+        if self.send_chunk is not None:
+            self.finish()
+            head = ""
+        else:
+            head = "".join(self.parts)
+        dropped = self.overflow - self.tail.length
+        if not dropped:
+            return head + self.tail.getvalue()
+        return TruncatedOutput(head, dropped, self.tail.getvalue())
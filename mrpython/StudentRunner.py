@@ -1,6 +1,7 @@
 from code import InteractiveInterpreter
 import inspect
 from RunReport import RunReport
+from ExecutionBudget import ExecutionBudget, ExecutionBudgetExceeded
 import ast
 import tokenize
 import sys
@@ -8,9 +9,10 @@ import traceback
 import os
 import copy
 import re
+import time
 from PreconditionHandler import PreconditionAstLinenoUpdater
 
-from translate import tr
+from translate import message
 
 import studentlib.gfx.image
 import studentlib.gfx.img_canvas
@@ -19,6 +21,55 @@ import typing
 
 from typechecking.typechecker import typecheck_from_ast
 from typechecking.type_ast import PREDEFINED_TYPE_VARIABLES
+from typechecking.check_cache import TypeCheckCache
+
+TYPE_CHECK_CACHE = None
+
+def type_check_cache():
+    """ The type-check cache of the process (configured in the [Checking]
+        section of the main configuration), or None if disabled """
+    global TYPE_CHECK_CACHE
+    if TYPE_CHECK_CACHE is None:
+        from configHandler import MrPythonConf
+        if not MrPythonConf.GetOption('main', 'Checking', 'type-check-cache', default=True, type='bool'):
+            return None
+        cache_dir = None
+        if MrPythonConf.GetOption('main', 'Checking', 'type-check-disk-cache', default=False, type='bool'):
+            cache_dir = os.path.join(MrPythonConf.GetUserCfgDir(), 'type-check-cache')
+        TYPE_CHECK_CACHE = TypeCheckCache(cache_dir)
+    return TYPE_CHECK_CACHE
+
+def recover_type_errors():
+    """ Should the type checker report all the errors (recovery mode)
+        rather than stop at the first fatal one ? """
+    from configHandler import MrPythonConf
+    return MrPythonConf.GetOption('main', 'Checking', 'recover-type-errors', default=True, type='bool')
+
+def execution_budget():
+    """ The budget of the student runs (configured in the [Execution]
+        section of the main configuration, 0 for no limit) """
+    from configHandler import MrPythonConf
+    return ExecutionBudget(cpu_time=MrPythonConf.GetOption('main', 'Execution', 'cpu-time', default=0, type='int')
+                           , wall_time=MrPythonConf.GetOption('main', 'Execution', 'wall-time', default=0, type='int')
+                           , memory=MrPythonConf.GetOption('main', 'Execution', 'memory', default=0, type='int')
+                           , steps=MrPythonConf.GetOption('main', 'Execution', 'steps', default=0, type='int')
+                           , max_output=MrPythonConf.GetOption('main', 'Execution', 'max-output', default=0, type='int')
+                           , test_time=MrPythonConf.GetOption('main', 'Execution', 'test-time', default=0, type='int'))
+
+def install_module_path(filename):
+    """ Make the (student) modules of the program directory importable,
+        the ones imported by a previous run are imported again """
+    if filename is None:
+        return
+    directory = os.path.dirname(os.path.realpath(filename))
+    if directory == os.path.dirname(os.path.realpath(__file__)):
+        return # not the modules of MrPython
+    if directory not in sys.path:
+        sys.path.append(directory)
+    for (name, module) in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if module_file is not None and os.path.dirname(os.path.realpath(module_file)) == directory:
+            del sys.modules[name]
 
 def install_locals(locals):
     # install the gfx lib
@@ -62,13 +113,15 @@ class StudentRunner:
     Runs a code under the student mode
     """
 
-    def __init__(self, tk_root, filename, source, check_tk=True):
+    def __init__(self, tk_root, filename, source, check_tk=True, budget=None):
         self.filename = filename
         self.source = source
         self.AST = None
         self.report = RunReport()
         self.tk_root = tk_root
         self.running = True
+        # the limits of the run (cf. ExecutionBudget)
+        self.budget = budget if budget is not None else execution_budget()
 
         if check_tk:
             ## This is a hack so let's check...
@@ -93,10 +146,10 @@ class StudentRunner:
             self.AST = ast.parse(self.source, self.filename)
         # Handle the different kinds of compilation errors
         except IndentationError as err:
-            self.report.add_compilation_error('error', tr("Bad indentation"), err.lineno, err.offset)
+            self.report.add_compilation_error('error', message("Bad indentation"), err.lineno, err.offset)
             return False
         except SyntaxError as err:
-            self.report.add_compilation_error('error', tr("Syntax error"), err.lineno, err.offset, details=err.text)
+            self.report.add_compilation_error('error', message("Syntax error"), err.lineno, err.offset, details=err.text)
             return False
         except Exception as err:
             typ, exc, tb = sys.exc_info()
@@ -113,8 +166,6 @@ class StudentRunner:
         else:
             self.add_FunctionPreconditions()
             ret_val = self.run(locals, capture_stdout) # Run the code if it passed all the convention tests
-            if ret_val:
-                self.report.nb_passed_tests = self.nb_asserts
 
         return ret_val
 
@@ -125,18 +176,31 @@ class StudentRunner:
         details = err_str[start:end]
         return details
 
-    def _exec_or_eval(self, mode, code, globs, locs):
+    def _exec_or_eval(self, mode, code, globs, locs, test=False):
+        """ Execute the units of the module (cf. compile_units) or evaluate an
+            expression, within the budget, and report the error if any.
+            A test case (test=True) is executed within the budget of the
+            run, whose interruptions are passed on """
         assert mode=='exec' or mode=='eval'
         try:
-            if mode=='exec':
-                result = exec(code, globs, locs)
+            if test:
+                result = self.budget.run_test(lambda: exec(code, globs, locs))
+            elif mode=='exec':
+                result = self.budget.run(self.filename, lambda: self.exec_units(code, globs, locs))
             elif mode=='eval':
-                result = eval(code, globs, locs)
+                result = self.budget.run(self.filename, lambda: eval(code, globs, locs))
+        except ExecutionBudgetExceeded as err:
+            if test and err.budget != 'test-time':
+                raise
+            if err.lineno is None:
+                err.lineno = self.budget.last_student_line(self.filename, err.__traceback__)
+            self.report.add_execution_error('error', message("Execution budget exceeded"), err.lineno, details=err.details())
+            return (False, None)
         except TypeError as err:
             a, b, tb = sys.exc_info()
             filename, lineno, file_type, line = traceback.extract_tb(tb)[-1]
             err_str = self._extract_error_details(err)
-            self.report.add_execution_error('error', tr("Type error"), lineno, details=str(err))
+            self.report.add_execution_error('error', message("Type error"), lineno, details=str(err))
             return (False, None)
         except NameError as err:
             a, b, tb = sys.exc_info() # Get the traceback object
@@ -145,12 +209,12 @@ class StudentRunner:
             # traceback, [1] refers to the last error inside code
             filename, lineno, file_type, line = traceback.extract_tb(tb)[-1]
             err_str = self._extract_error_details(err)
-            self.report.add_execution_error('error', tr("Name error (unitialized variable?)"), lineno, details=err_str)
+            self.report.add_execution_error('error', message("Name error (unitialized variable?)"), lineno, details=err_str)
             return (False, None)
         except ZeroDivisionError:
             a, b, tb = sys.exc_info()
             filename, lineno, file_type, line = traceback.extract_tb(tb)[-1]
-            self.report.add_execution_error('error', tr("Division by zero"), lineno if mode=='exec' else None)
+            self.report.add_execution_error('error', message("Division by zero"), lineno if mode=='exec' else None)
             return (False, None)
         except AssertionError as err:
             _, _, tb = sys.exc_info()
@@ -192,11 +256,16 @@ class StudentRunner:
                     raise ValueError("Precondition handling fails (wrong parameter/value, please report)")
                         
                 if lineno in preconditionsLineno:
-                    self.report.add_execution_error('error', tr(s).format(func_name, lineno, line.split(':', 1)[-1].strip(), arg), assert_lineno)
+                    self.report.add_execution_error('error', message(s, func_name, lineno, line.split(':', 1)[-1].strip(), arg), assert_lineno)
             else:
-                self.report.add_execution_error('error', tr("Assertion error (failed test?)") + (f"\n ==> {str(err)}" if str(err) else ""), lineno)
+                if str(err):
+                    self.report.add_execution_error('error', message("Assertion error (failed test?)\n ==> {}", err), lineno)
+                else:
+                    self.report.add_execution_error('error', message("Assertion error (failed test?)"), lineno)
             return (True, None)
         except Exception as err:
+            if test and isinstance(err, MemoryError):
+                raise # cf. ExecutionBudget.run
             a, b, tb = sys.exc_info() # Get the traceback object
             # Extract the information for the traceback corresponding to the error
             # inside the source code : [0] refers to the result = exec(code)
@@ -233,26 +302,89 @@ class StudentRunner:
     def run(self, locals, capture_stdout=True):
         """ Run the code, add the execution errors to the rapport, if any """
         locals = install_locals(locals)
-        code = None
+        install_module_path(self.filename)
+        units = None
         try:
-            code = compile(self.AST, self.filename, 'exec')
+            units = self.compile_units()
         except SyntaxError as err:
-            self.report.add_compilation_error('error', tr("Syntax error"), err.lineno, err.offset, details=str(err))
+            self.report.add_compilation_error('error', message("Syntax error"), err.lineno, err.offset, details=str(err))
             return False
         except Exception as err:
             typ, exc, tb = sys.exc_info()
             self.report.add_compilation_error('error', str(typ), err.lineno, err.offset, details=str(err))
             return False
-        (ok, result) = self._exec_or_eval('exec', code, locals, locals)
+        (ok, tests_ok) = self._exec_or_eval('exec', units, locals, locals)
         #if not ok:
         #    return False
 
         # if no error get the output
         if capture_stdout:
-            sys.stdout.seek(0)
-            result = sys.stdout.read()
-            self.report.set_output(result)
+            # the output not streamed (cf. StreamedOutput)
+            self.report.set_output(sys.stdout.getvalue())
+
+        return ok and tests_ok
+
+    def compile_units(self):
+        """ Compile the module as a list of units (test, code), in order:
+            the consecutive statements (test is None) and each test case,
+            i.e. top-level assertion (test is its line and tested functions) """
+        defined_funs = { node.name for node in self.AST.body if isinstance(node, ast.FunctionDef) }
+        units = []
+        statements = []
+        for node in self.AST.body + [None]:
+            if (node is None or isinstance(node, ast.Assert)) and statements:
+                units.append((None, compile(ast.Module(body=statements, type_ignores=[]), self.filename, 'exec')))
+                statements = []
+            if isinstance(node, ast.Assert):
+                call_visit = FunCallsVisitor()
+                call_visit.visit(node)
+                test = (node.lineno, sorted(call_visit.funcalls & defined_funs))
+                units.append((test, compile(ast.Module(body=[node], type_ignores=[]), self.filename, 'exec')))
+            elif node is not None:
+                statements.append(node)
+        return units
+
+    def exec_units(self, units, globs, locs):
+        """ Execute the units of the module: an error in the statements stops
+            the run, but all the test cases are run (and reported) """
+        ok = True
+        for (test, code) in units:
+            if test is None:
+                exec(code, globs, locs)
+            elif not self.run_test(test, code, globs, locs):
+                ok = False
+        return ok
+
+    def run_test(self, test, code, globs, locs):
+        """ Run a test case, and add its result to the report """
+        lineno, tested_funs = test
+        calls = { fun_name : 0 for fun_name in tested_funs }
+        fun_codes = { locs[fun_name].__code__ : fun_name for fun_name in tested_funs
+                      if hasattr(locs.get(fun_name), '__code__') }
 
+        def count_call(frame, event, arg):
+            if event == 'call' and frame.f_code in fun_codes:
+                calls[fun_codes[frame.f_code]] += 1
+
+        nb_errors = len(self.report.execution_errors)
+        start_time = time.perf_counter()
+        sys.setprofile(count_call)
+        try:
+            (ok, _) = self._exec_or_eval('exec', code, globs, locs, test=True)
+        except BaseException:
+            # the run is interrupted (cf. ExecutionBudget)
+            self.report.add_test_result(lineno, 'error', time.perf_counter() - start_time, calls)
+            raise
+        finally:
+            sys.setprofile(None)
+        elapsed = time.perf_counter() - start_time
+
+        if len(self.report.execution_errors) == nb_errors:
+            status = 'pass'
+            self.report.nb_passed_tests += 1
+        else:
+            status = 'fail' if ok else 'error' # (a failed assertion is not an error)
+        self.report.add_test_result(lineno, status, elapsed, calls)
         return ok
 
 
@@ -263,9 +395,7 @@ class StudentRunner:
         if not ok:
             return False
         else:
-            sys.stdout.seek(0)
-            outp = sys.stdout.read()
-            self.report.set_output(outp)
+            self.report.set_output(sys.stdout.getvalue())
             self.report.set_result(result)
             return True
 
@@ -311,25 +441,29 @@ class StudentRunner:
         missing = defined_funs.difference(funcalls)
 
         if missing:
-            self.report.add_convention_error('warning', tr('Missing tests')
-                                             , details="\n" + tr('Untested functions: ')
-                                             + "{}".format(missing) + "\n")
+            self.report.add_convention_error('warning', message('Missing tests')
+                                             , details=message("\nUntested functions: {}\n", missing))
         elif defined_funs:
             # all the functions are tested at least once
-            self.report.add_convention_error('run', tr('All functions tested'), details="==> " + tr("All functions tested (good)"))
+            self.report.add_convention_error('run', message('All functions tested'), details=message("==> All functions tested (good)"))
 
         return True
 
     def check_types(self):
-        type_ctx = typecheck_from_ast(self.AST, self.filename, self.source)
+        cache = type_check_cache()
+        recover = recover_type_errors()
+        if cache is not None:
+            type_errors = cache.type_check(self.source, self.filename, self.AST, recover=recover)
+        else:
+            type_errors = typecheck_from_ast(self.AST, self.filename, self.source, recover=recover).type_errors
         fatal_error = False
-        if len(type_ctx.type_errors) == 0:
+        if len(type_errors) == 0:
             # no type error
-            self.report.add_convention_error('run', tr('Program type-checked'), details=tr('==> the program is type-checked (very good)\n'))
+            self.report.add_convention_error('run', message('Program type-checked'), details=message('==> the program is type-checked (very good)\n'))
             return True
 
         # convert type errors to report messages
-        for type_error in type_ctx.type_errors:
+        for type_error in type_errors:
             type_error.report(self.report)
             if type_error.is_fatal():
                 fatal_error = True
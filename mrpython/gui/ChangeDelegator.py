@@ -0,0 +1,24 @@
+from Delegator import Delegator
+
+class ChangeDelegator(Delegator):
+    """
+    Calls a hook after each modification of the text
+    (it must stay below the undo delegator, so that undo/redo are seen)
+    """
+
+    def __init__(self):
+        Delegator.__init__(self)
+        self.change_hook = None
+
+    def set_change_hook(self, change_hook):
+        self.change_hook = change_hook
+
+    def insert(self, index, chars, tags=None):
+        self.delegate.insert(index, chars, tags)
+        if self.change_hook:
+            self.change_hook()
+
+    def delete(self, index1, index2=None):
+        self.delegate.delete(index1, index2)
+        if self.change_hook:
+            self.change_hook()
@@ -304,6 +304,8 @@ class Console:
             
         self.hyperlinks.reset()
 
+        # the report begins before the output streamed while the program ran
+        self.output_console.mark_set("iomark", "outputmark")
         self.write(report.header, tags=(tag))
         #self.write("\n")
         
@@ -333,7 +335,8 @@ class Console:
             self.write(str(error), tags=(error.severity, hyper, hyper_spec))
             self.write("\n")
 
-        # write the stdout that has been generated
+        # write the stdout that has been generated (after the streamed one)
+        self.output_console.mark_set("iomark", "end-1c")
         self.write(str(report.output), tags=('stdout'))
             
         # show execution errors, if any
@@ -349,8 +352,8 @@ class Console:
             self.write("\n")
 
         # show evaluation result
-        if status and report.result is not None:
-            self.write(repr(report.result), tags=('normal'))
+        if status and report.has_result():
+            self.write(report.result_text(), tags=('normal'))
 
         if exec_mode == 'exec' and status and self.mode == tr('student') and report.nb_defined_funs > 0:
             if report.nb_passed_tests > 1:
@@ -359,6 +362,8 @@ class Console:
                 self.write("==> " + tr("Only one (successful) test found, it's probably not enough"), tags=('warning'))
             else:
                 self.write("==> " + tr("There is no test! you have to write tests!"), tags=('error'))
+        elif exec_mode == 'exec' and report.nb_passed_tests < len(report.test_results):
+            self.write("==> " + tr("{} of the {} tests passed").format(report.nb_passed_tests, len(report.test_results)), tags=('error'))
         
         self.write(report.footer, tags=(tag))
 
@@ -369,7 +374,8 @@ class Console:
             return
         local_interpreter = False
         if self.interpreter is None:
-            self.interpreter = InterpreterProxy(self.app.root, self.app.mode, "<<console>>")
+            self.interpreter = InterpreterProxy(self.app.root, self.app.mode, "<<console>>", pool=self.app.interpreter_pool,
+                                                stream_output=True)
             local_interpreter = True
             self.app.running_interpreter_proxy = self.interpreter
 
@@ -401,7 +407,12 @@ class Console:
         # non-blocking call
         self.app.icon_widget.enable_icon_running()
         self.app.running_interpreter_callback = callback
-        self.interpreter.run_evaluation(expr, callback)
+        def on_output(text):
+            if not callback_called: # not stopped
+                self.write_output(text)
+
+        self.begin_output()
+        self.interpreter.run_evaluation(expr, callback, on_output=on_output)
 
     def history_up_action(self, event=None):
         self._hide_placeholder()
@@ -502,7 +513,8 @@ class Console:
             self.app.running_interpreter_proxy = None
 
             
-        self.interpreter = InterpreterProxy(self.app.root, self.app.mode, filename)
+        self.interpreter = InterpreterProxy(self.app.root, self.app.mode, filename, pool=self.app.interpreter_pool,
+                                            stream_output=True)
         self.app.running_interpreter_proxy = self.interpreter
 
         callback_called = False
@@ -538,7 +550,22 @@ class Console:
         # non-blocking call
         self.app.icon_widget.enable_icon_running()
         self.app.running_interpreter_callback = callback
-        self.interpreter.execute(callback)
+        def on_output(text):
+            if not callback_called: # not stopped
+                self.write_output(text)
+
+        self.begin_output()
+        self.interpreter.execute(callback, on_output=on_output)
+
+    def begin_output(self):
+        """ Mark the beginning of the output of a run (or evaluation),
+            where its report is written once the program is over """
+        self.output_console.mark_set("outputmark", "iomark")
+        self.output_console.mark_gravity("outputmark", "left")
+
+    def write_output(self, text):
+        """ Write the output of the running program (cf. StreamedOutput) """
+        self.write(text, tags=('stdout',))
 
     def no_file_to_run_message(self):
         self.reset_output()
@@ -15,13 +15,19 @@ import sys
 import Bindings
 
 from .HighlightingText import HighlightingText
+from .HyperlinkManager import HyperlinkManager
 _py_version = ' (%s)' % platform.python_version()
 
+# the underline colours of the errors and warnings of the background checker
+CHECK_ERROR_COLOR = '#dc2626'
+CHECK_WARNING_COLOR = '#d97706'
+
 class PyEditor(HighlightingText):
     from .IOBinding import  IOBinding, filesystemencoding, encoding
     from .UndoDelegator import  UndoDelegator
     from .Percolator import Percolator
     from .ColorDelegator import  ColorDelegator
+    from .ChangeDelegator import ChangeDelegator
 
     def __init__(self, parent, linewidget, open=False, filename=None):
 
@@ -81,6 +87,8 @@ class PyEditor(HighlightingText):
         # Making the initial values larger slows things down more often.
         self.num_context_lines = 50, 500, 5000000
         self.per = per = self.Percolator(self)
+        self.change = change = self.ChangeDelegator()
+        per.insertfilter(change)
         self.undo = undo = self.UndoDelegator()
         per.insertfilter(undo)
 
@@ -116,6 +124,47 @@ class PyEditor(HighlightingText):
         self.font = nametofont(self.cget('font')).copy()
         self.configure(font=self.font)
 
+        # errors of the background checker
+        self.check_hyperlinks = HyperlinkManager(self)
+        self.tag_configure("check-error", underline=1)
+        self.tag_configure("check-warning", underline=1)
+        try:
+            self.tag_configure("check-error", underlinefg=CHECK_ERROR_COLOR)
+            self.tag_configure("check-warning", underlinefg=CHECK_WARNING_COLOR)
+        except TclError: # (Tk < 8.6.6) the warnings are only coloured
+            self.tag_configure("check-warning", underline=0, foreground=CHECK_WARNING_COLOR)
+
+    def set_change_hook(self, change_hook):
+        """ Call change_hook after each modification of the text """
+        self.change.set_change_hook(change_hook)
+
+    def show_check_errors(self, checked_errors, show_message):
+        """ Tag the lines of the errors found by the background checker,
+            checked_errors is a list of (error, action) pairs, the action
+            being called when the error is clicked """
+        self.clear_check_errors()
+        for (error, action) in checked_errors:
+            if not error.line:
+                continue
+            start = "{}.0".format(error.line)
+            end = start + " lineend"
+            tag = "check-warning" if error.severity == 'warning' else "check-error"
+            hyper, hyper_spec = self.check_hyperlinks.add(action)
+            self.tag_add(tag, start, end)
+            self.tag_add(hyper, start, end)
+            self.tag_add(hyper_spec, start, end)
+            message = " ".join(str(error).split())
+            self.tag_bind(hyper_spec, "<Enter>", lambda event, message=message: show_message(message))
+
+    def clear_check_errors(self):
+        """ Remove the errors of the background checker """
+        for tag in self.tag_names():
+            if tag.startswith("hyper-"):
+                self.tag_delete(tag)
+        for tag in ("hyper", "check-error", "check-warning"):
+            self.tag_remove(tag, "1.0", "end")
+        self.check_hyperlinks.reset()
+
     def apply_bindings(self,keydefs=None):
         self.bind("<<smart-backspace>>",self.smart_backspace_event)
         self.bind("<<newline-and-indent>>",self.newline_and_indent_event)
@@ -44,10 +44,14 @@ class StatusBar(ttk.Frame):
 
     def update_save_label(self, filename):
         """ Display the saved file in the save_label """
+        import os
+        self.show_message(tr("Saving file") + " '" + os.path.basename(filename) + "'")
+
+    def show_message(self, message):
+        """ Display a (temporary) message in the save_label """
         if self.displaying_save:
             self.after_cancel(self.callback_id)
-        import os
-        display_text = "   " + tr("Saving file") + " '" + os.path.basename(filename) + "'"
+        display_text = "   " + message
         self.save_label.config(text=display_text, style='StatusBarHighlight.TLabel')
         self.displaying_save = True
         # Then clear the text after a few seconds
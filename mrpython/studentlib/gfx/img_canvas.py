@@ -1,4 +1,5 @@
 from tkinter import *
+import tkinter
 
 CANVAS_DEFAULT_RATIO = 4.0 / 4.0
 
@@ -89,6 +90,15 @@ class ImgCanvas(Canvas):
 
 CANVAS_WIDGET = None
 
+def image_root():
+    """ The Tk root of the image windows, created (hidden) on first use
+        if the program runs in a headless interpreter """
+    root = tkinter._default_root
+    if root is None:
+        root = Tk()
+        root.withdraw()
+    return root
+
 def show_image(img):
     global CANVAS_WIDGET
     if CANVAS_WIDGET:
@@ -98,7 +108,7 @@ def show_image(img):
             CANVAS_WIDGET = None
 
     if not CANVAS_WIDGET:
-        myTop = Toplevel(width=480, height=480)
+        myTop = Toplevel(image_root(), width=480, height=480)
         myTop.title("Image")
         myframe = Frame(myTop, width=480, height=480)
         myframe.pack(fill=BOTH, expand=YES)
@@ -1,4 +1,6 @@
 
+from typechecking.translate import Message, MESSAGE_DOMAINS
+
 AVAILABLE_LOCALE_KEYS = { 'fr', 'en' }
 
 TRANSLATOR_LOCALE_KEY = None
@@ -33,28 +35,40 @@ TRANSLATOR_DICT = {
     ,"Name error (unitialized variable?)" : { 'fr': "Erreur de nommage (variable non initialisée ?)" }
     ,"Division by zero" : { 'fr' : "Division par zéro" }
     ,"Assertion error (failed test?)" : { 'fr' : "Erreur d'assertion (test invalide ?)" }
+    ,"Assertion error (failed test?)\n ==> {}" : { 'fr' : "Erreur d'assertion (test invalide ?)\n ==> {}" }
     ,"Precondition error\n\t Function : {} (Line {})\n\t Precondition : {}\n\t False with {}" : { 
     'fr' : "Erreur de précondition\n\t Fonction : {} (Ligne {})\n\t Précondition : {}\n\t Fausse avec {}" 
     }
     ,"in line :" :{ 'fr' : "dans la ligne :"}
     ,"User interruption" : { 'fr' : "Interruption par l'utilisateur"}
+    ,"Execution budget exceeded" : { 'fr' : "Budget d'exécution dépassé" }
+    ,"the {} budget is exhausted (limit: {})" : { 'fr' : "le budget {} est épuisé (limite : {})" }
+    ,"The interpreter process died" : { 'fr' : "Le processus de l'interprète s'est arrêté" }
+    ,"exit code: {}" : { 'fr' : "code de sortie : {}" }
+    ,"\n[... output truncated: {} characters not shown]\n" : { 'fr' : "\n[... affichage tronqué : {} caractères non affichés]\n" }
     # Erreurs de conventions
     , ": line {}\n" : { 'fr' : ": ligne {}\n"}
     ,"Missing tests" : { 'fr' : "Tests manquants"}
-    ,"Untested functions: " : { 'fr' : "Fonctions non-testées : "}
-    ,"All functions tested (good)" : { 'fr' : "Toutes les fonctions sont testées (bien)"}
+    ,"\nUntested functions: {}\n" : { 'fr' : "\nFonctions non-testées : {}\n"}
+    ,"==> All functions tested (good)" : { 'fr' : "==> Toutes les fonctions sont testées (bien)"}
     , '==> the program is type-checked (very good)\n' : {'fr' : '==> le programme est bien typé (très bien)\n' }
     # status
     ,"Saving file" : { 'fr' : "Enregistre" }
     ,"All the {} tests passed with success" : { 'fr' : "Les {} tests sont passés avec succès" }
     , "Only one (successful) test found, it's probably not enough" : { 'fr' : "Je n'ai trouvé qu'un seul test, il passe mais ce n'est sans doute pas suffisant" }
     , "There is no test! you have to write tests!" : { 'fr' : "Je ne trouve pas de test, il faut tester vos fonctions !" }
+    , "{} of the {} tests passed" : { 'fr' : "{} tests sur {} sont passés" }
     , "-----\nPython101 convention errors:\n-----\n" : { 'fr' : "-----\nErreurs de convention (Python101) :\n-----\n" }
     , "\n-----\nCompilation errors (Python interpreter):\n-----\n" : { 'fr' : "\n-----\nErreurs de compilation (Interprète Python) :\n-----\n" }
     , "\n-----\nExecution errors (Python interpreter):\n-----\n" : { 'fr' : "\n-----\nErreurs à l'exécution (Interprète Python) :\n-----\n" }
     , "Compilation Errors:\n" : {'fr' : "Erreurs de Compilation :\n"}
     , "Conventions:\n" : {'fr' : "Conventions :\n"}
     , "Execution Errors:\n" : {'fr' : "Erreurs d'exécution :\n"}
+    , "Tests:\n" : {'fr' : "Tests :\n"}
+    , "line {}: {} ({:.3f} s)" : {'fr' : "ligne {} : {} ({:.3f} s)"}
+    , "pass" : {'fr' : "réussi"}
+    , "fail" : {'fr' : "échoué"}
+    , "error" : {'fr' : "erreur"}
     , "<<<Output>>>\n" : {'fr' : "<<<Sorties>>>\n"}
     , 'Switch to expert mode?' : {'fr' : "Passer en mode expert ?"}
     , "Are you sure to switch to 'expert' mode ?\n All code verifications will be turned off!"
@@ -85,3 +99,8 @@ def tr(msg):
 
     return tmsg
 
+MESSAGE_DOMAINS['mrpython'] = tr
+
+def message(msgid, *args):
+    """ A Message of this domain (translated when it is displayed) """
+    return Message(msgid, *args, domain='mrpython')
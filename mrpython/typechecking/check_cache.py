@@ -0,0 +1,239 @@
+"""
+A content-addressed cache of type-checking results.
+
+The results are keyed on the hash of the source code, together with
+the version of the checker (a digest of the typechecking sources and
+the python version) and the interfaces of the imported modules of the
+program directory (cf. project).
+The type errors are stored in serialized form: the (untranslated)
+messages they report, cf. translate.Message, so that a result is shared
+by all the locales (and the parsed preconditions of the functions, used
+at runtime).
+
+The lowered programs (cf. prog_ast) are also cached, with the converted
+signatures of their functions but without their python AST, so that
+checking again an unchanged source (e.g. in another mode)
+neither parses nor lowers it.  Pickling a large program costs more than
+lowering it again, so a program is only cached with the disk cache, or
+once its source has missed the cache twice (e.g. in both modes).
+"""
+
+import ast
+import collections
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+try:
+    from . import prog_ast
+    from . import project
+    from . import stub_registry
+    from . import type_converter
+    from . import typechecker
+except ImportError:
+    import prog_ast
+    import project
+    import stub_registry
+    import type_converter
+    import typechecker
+
+CHECKER_DIGEST = None
+
+def checker_digest():
+    """ A digest of the typechecker sources, so that a new version
+        of the checker never reuses stale results """
+    global CHECKER_DIGEST
+    if CHECKER_DIGEST is None:
+        digest = hashlib.sha256()
+        digest.update("{}.{}".format(sys.version_info.major, sys.version_info.minor).encode())
+        checker_dir = os.path.dirname(os.path.realpath(__file__))
+        for name in sorted(os.listdir(checker_dir)):
+            if name.endswith(".py"):
+                with open(os.path.join(checker_dir, name), "rb") as f:
+                    digest.update(name.encode())
+                    digest.update(f.read())
+        # the signatures of the builtins and modules
+        for name in sorted(os.listdir(stub_registry.STUB_DIR)):
+            if name.endswith(".pyi"):
+                with open(os.path.join(stub_registry.STUB_DIR, name), "rb") as f:
+                    digest.update(name.encode())
+                    digest.update(f.read())
+        CHECKER_DIGEST = digest.hexdigest()
+    return CHECKER_DIGEST
+
+class ReportRecorder:
+    """ Records the messages reported by a type error """
+    def __init__(self):
+        self.messages = []
+
+    def add_convention_error(self, severity, err_type, line=None, offset=None, details=""):
+        self.messages.append((severity, err_type, line, offset, details))
+
+class CachedTypeError(typechecker.TypeError):
+    """ A type error restored from the cache """
+    def __init__(self, fatal, failure, messages):
+        self.fatal = fatal
+        self.failure = failure
+        self.messages = messages
+
+    @staticmethod
+    def from_type_error(type_error):
+        recorder = ReportRecorder()
+        type_error.report(recorder)
+        try:
+            failure = type_error.fail_string()
+        except (NotImplementedError, AttributeError):
+            failure = type_error.__class__.__name__
+        return CachedTypeError(type_error.is_fatal(), failure, recorder.messages)
+
+    def is_fatal(self):
+        return self.fatal
+
+    def fail_string(self):
+        return self.failure
+
+    def report(self, report):
+        for (severity, err_type, line, offset, details) in self.messages:
+            report.add_convention_error(severity, err_type, line, offset, details)
+
+# the size (in bytes of serialized data) of the memory cache
+MEMORY_CACHE_SIZE = 64 * 1024 * 1024
+
+# the number of sources whose first miss is remembered
+MISSED_SOURCES = 256
+
+class TypeCheckCache:
+    """
+    Caches the type errors of the checked programs, in memory
+    (at most max_bytes of serialized data, the least recently used entries
+    are dropped first) and on disk if a cache directory is given.
+    """
+    def __init__(self, cache_dir=None, max_bytes=MEMORY_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.nb_bytes = 0
+        # the program keys of the sources that missed the cache once
+        self.missed_programs = collections.OrderedDict()
+
+    def key(self, source, recover=False, imports=""):
+        digest = hashlib.sha256()
+        digest.update(checker_digest().encode())
+        digest.update(b"recover" if recover else b"strict")
+        digest.update(imports.encode())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def program_key(self, source):
+        digest = hashlib.sha256()
+        digest.update(checker_digest().encode())
+        digest.update(b"program")
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".pickle")
+
+    def lookup(self, key):
+        """ Return the (serialized) cached result for key, or None """
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+            return data
+
+        if self.cache_dir is not None:
+            try:
+                with open(self.entry_path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self.remember(key, data)
+
+        return data
+
+    def remember(self, key, data):
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.nb_bytes -= len(previous)
+        self.entries[key] = data
+        self.nb_bytes += len(data)
+        while self.nb_bytes > self.max_bytes:
+            _, dropped = self.entries.popitem(last=False)
+            self.nb_bytes -= len(dropped)
+
+    def missed_again(self, program_key):
+        """ Whether the source of the program already missed the cache
+            (its first miss is remembered otherwise) """
+        if program_key in self.missed_programs:
+            del self.missed_programs[program_key]
+            return True
+        self.missed_programs[program_key] = True
+        if len(self.missed_programs) > MISSED_SOURCES:
+            self.missed_programs.popitem(last=False)
+        return False
+
+    def store(self, key, data):
+        self.remember(key, data)
+        if self.cache_dir is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.entry_path(key))
+            except OSError:
+                pass # the disk cache is only an optimization
+
+    def type_check(self, source, filename=None, modast=None, recover=False, jobs=1):
+        """ Return the type errors of the program,
+            without running the checker if the result is cached """
+        key = self.key(source, recover, project.imports_digest(source, filename))
+        data = self.lookup(key)
+        if data is not None:
+            try:
+                type_errors, fun_preconditions = pickle.loads(data)
+                typechecker.preconditions.update(fun_preconditions)
+                return type_errors
+            except Exception:
+                pass # corrupted entry: check again
+
+        prog = self.load_program(source, filename)
+        if prog is None:
+            if modast is None:
+                modast = ast.parse(source, mode="exec")
+            prog = prog_ast.Program()
+            prog.build_from_ast(modast, filename, source)
+            program_key = self.program_key(source)
+            if self.cache_dir is not None or self.missed_again(program_key):
+                # saved before the checking (which modifies the program)
+                for fun_def in prog.functions.values():
+                    if fun_def.returns is not None:
+                        type_converter.converted_fun_type(fun_def)
+                self.store(program_key, pickle.dumps(prog, pickle.HIGHEST_PROTOCOL))
+
+        ctx = prog.type_check(recover=recover, jobs=jobs)
+
+        fun_preconditions = { fun_name : typechecker.preconditions[fun_name]
+                              for fun_name in prog.functions
+                              if fun_name in typechecker.preconditions }
+        cached_errors = [ CachedTypeError.from_type_error(type_error) for type_error in ctx.type_errors ]
+        self.store(key, pickle.dumps((cached_errors, fun_preconditions)))
+
+        return ctx.type_errors
+
+    def load_program(self, source, filename=None):
+        """ Return the cached (lowered) program of the source, or None """
+        data = self.lookup(self.program_key(source))
+        if data is None:
+            return None
+
+        try:
+            with prog_ast.paused_gc():
+                prog = pickle.loads(data)
+        except Exception:
+            return None # corrupted entry: lower again
+
+        prog.filename = filename
+        return prog
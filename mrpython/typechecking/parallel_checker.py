@@ -0,0 +1,152 @@
+"""
+Parallel type checking of the function bodies.
+
+Once the signatures are registered, the body of each function is
+checked from the same typing context, so the bodies can be checked
+independently.  Each worker process receives the signature context
+(the typing context up to the signatures, without the function bodies,
+pickled once for all the workers), parses and lowers the source of its
+share of the functions only, checks them and sends back their type
+errors and preconditions.  The results are then merged in the order of
+the functions, as if the functions had been checked sequentially.
+The number of worker processes is bounded by the available processors
+and by the size of the functions to check (cf. parallel_jobs).
+"""
+
+import ast
+import copy
+import os
+import pickle
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing as mp
+
+try:
+    from .prog_ast import FunctionDef
+    from . import typechecker
+except ImportError:
+    from prog_ast import FunctionDef
+    import typechecker
+
+# the (measured) number of lines of function bodies below which a worker
+# costs more (sending the context, parsing and lowering) than it saves
+PARALLEL_MIN_LINES = 2500
+
+CHECK_POOL = None
+CHECK_POOL_JOBS = 0
+
+def check_pool(jobs):
+    """ The (persistent) pool of checking processes """
+    global CHECK_POOL, CHECK_POOL_JOBS
+    if CHECK_POOL is None or CHECK_POOL_JOBS != jobs:
+        shutdown_check_pool()
+        CHECK_POOL = concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=mp.get_context('spawn'))
+        CHECK_POOL_JOBS = jobs
+    return CHECK_POOL
+
+def signature_context(prog, ctx):
+    """ The pickled typing context of prog up to the signatures,
+        without the function bodies (nor the test cases) """
+    sig_prog = copy.copy(prog)
+    sig_prog.functions = dict()
+    sig_prog.test_cases = []
+    sig_prog.other_top_defs = []
+    sig_ctx = copy.copy(ctx)
+    sig_ctx.prog = sig_prog
+    sig_ctx.functions = dict()
+    sig_ctx.type_errors = []
+    sig_ctx.function_checks = dict()
+    return pickle.dumps(sig_ctx, protocol=pickle.HIGHEST_PROTOCOL)
+
+def parse_function(prog, fun_name, lineno, end_lineno):
+    """ The (lowered) function fun_name, parsed from its lines in the
+        source of prog, or None if they cannot be parsed alone """
+    if prog.source_lines is None:
+        prog.source_lines = prog.source.split('\n')
+    try:
+        # (the blank lines keep the line numbers of the source)
+        modast = ast.parse('\n' * (lineno - 1) + '\n'.join(prog.source_lines[lineno-1:end_lineno]), mode="exec")
+    except SyntaxError:
+        return None
+    if not modast.body or not isinstance(modast.body[0], ast.FunctionDef):
+        return None
+    fun_def = FunctionDef(modast.body[0])
+    if fun_def.name != fun_name or fun_def.end_lineno != end_lineno:
+        return None
+    return fun_def
+
+def check_function_bodies(sig_ctx, functions):
+    """ Check the bodies of the given (fun_name, lineno, end_lineno)
+        functions (in a worker process) from the signature context,
+        returns the list of (fun_name, type_errors, fatal, preconditions) """
+    ctx = pickle.loads(sig_ctx)
+    results = []
+    for (fun_name, lineno, end_lineno) in functions:
+        fun_def = parse_function(ctx.prog, fun_name, lineno, end_lineno)
+        if fun_def is None:
+            # left to the main process
+            continue
+        ctx.functions[fun_name] = fun_def
+        checkpoint = ctx.checkpoint()
+        nb_errors = len(ctx.type_errors)
+        ctx.fatal_error = False
+        fun_def.type_check(ctx)
+        results.append((fun_name, ctx.type_errors[nb_errors:], ctx.fatal_error,
+                        typechecker.preconditions.get(fun_name, [])))
+        if ctx.fatal_error:
+            # the main process decides if the checking goes on
+            ctx.restore(checkpoint)
+
+    return results
+
+def function_size(fun_def):
+    return fun_def.end_lineno - fun_def.lineno + 1
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def parallel_jobs(prog, fun_names, jobs):
+    """ The number of processes (at most jobs) worth checking the bodies
+        of the functions, 1 if they should be checked sequentially """
+    if prog.source is None:
+        return 1
+    nb_lines = sum(function_size(prog.functions[fun_name]) for fun_name in fun_names)
+    return max(1, min(jobs, available_cpus(), nb_lines // PARALLEL_MIN_LINES))
+
+def check_functions_in_parallel(prog, ctx, fun_names, jobs):
+    """ Check the bodies of the functions of prog in a pool of jobs processes
+        (from the context ctx, up to the signatures),
+        returns a dictionary mapping each function name to its
+        (type_errors, fatal, preconditions) """
+    # balance the work (largest functions first)
+    shares = [ [] for _ in range(jobs) ]
+    share_sizes = [ 0 ] * jobs
+    for fun_name in sorted(fun_names, key=lambda fun_name: -function_size(prog.functions[fun_name])):
+        share = share_sizes.index(min(share_sizes))
+        fun_def = prog.functions[fun_name]
+        shares[share].append((fun_name, fun_def.lineno, fun_def.end_lineno))
+        share_sizes[share] += function_size(prog.functions[fun_name])
+
+    results = dict()
+    try:
+        pool = check_pool(jobs)
+        sig_ctx = signature_context(prog, ctx)
+        futures = [ pool.submit(check_function_bodies, sig_ctx, share)
+                    for share in shares if share ]
+        for future in futures:
+            for (fun_name, type_errors, fatal, fun_preconditions) in future.result():
+                results[fun_name] = (type_errors, fatal, fun_preconditions)
+    except (concurrent.futures.process.BrokenProcessPool, OSError):
+        # the missing functions are checked sequentially
+        shutdown_check_pool()
+
+    return results
+
+def shutdown_check_pool():
+    global CHECK_POOL
+    if CHECK_POOL is not None:
+        CHECK_POOL.shutdown(wait=False, cancel_futures=True)
+        CHECK_POOL = None
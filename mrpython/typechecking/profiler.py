@@ -0,0 +1,183 @@
+"""
+Profiling of the type checker (opt-in).
+
+While a program is profiled, the type checking methods of the program
+nodes and of the types (type_check, type_infer, type_compare, subst and
+rename_type_variables) and the phases of type_check_Program are replaced
+by timed versions, which record the number of calls and the wall time
+of each dispatch (with and without the nested dispatches), and the
+number of types built during the substitutions and renamings.
+The original methods are restored once the program is checked.
+"""
+
+import inspect
+import time
+
+try:
+    from . import prog_ast
+    from . import type_ast
+    from . import typechecker
+except ImportError:
+    import prog_ast
+    import type_ast
+    import typechecker
+
+PROFILED_METHODS = ('type_check', 'type_infer', 'type_compare', 'subst', 'rename_type_variables')
+
+# the methods building new types
+TYPE_BUILDING_METHODS = ('subst', 'rename_type_variables')
+
+# the phases of type_check_Program
+PHASES = (('top_level', 'type_check_top_level')
+          , ('aliases', 'type_check_type_aliases')
+          , ('imports', 'type_check_imports')
+          , ('signatures', 'type_check_signatures')
+          , ('bodies', 'type_check_function_bodies')
+          , ('globals', 'type_check_globals')
+          , ('tests', 'type_check_test_cases'))
+
+class CheckProfile:
+    """ The measures of a profiled type checking """
+    def __init__(self):
+        self.total = 0.0
+        # phase name -> wall time
+        self.phases = dict()
+        # dispatch name -> [calls, time, self time]
+        self.dispatches = dict()
+        # method name -> number of types built
+        self.type_allocations = { method : 0 for method in TYPE_BUILDING_METHODS }
+        self.type_allocations['total'] = 0
+        # the time spent in the nested dispatches of the running ones
+        self.nested_times = []
+        # the running dispatches (for the recursive ones)
+        self.running = dict()
+        # the running type building methods
+        self.building = []
+
+    def timed_dispatch(self, name, method):
+        def profiled_dispatch(*args, **kwargs):
+            stats = self.dispatches.get(name)
+            if stats is None:
+                stats = self.dispatches[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            depth = self.running.get(name, 0)
+            self.running[name] = depth + 1
+            self.nested_times.append(0.0)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats[2] += elapsed - self.nested_times.pop()
+                if depth == 0:
+                    # the time of the recursive calls is already counted
+                    stats[1] += elapsed
+                self.running[name] = depth
+                if self.nested_times:
+                    self.nested_times[-1] += elapsed
+
+        return profiled_dispatch
+
+    def type_building(self, name, method):
+        def profiled_type_building(*args, **kwargs):
+            self.building.append(name)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.building.pop()
+
+        return profiled_type_building
+
+    def counted_type_init(self, init):
+        def profiled_type_init(type_ast, *args, **kwargs):
+            # called once per type built
+            self.type_allocations['total'] += 1
+            if self.building:
+                self.type_allocations[self.building[-1]] += 1
+            return init(type_ast, *args, **kwargs)
+
+        return profiled_type_init
+
+    def timed_phase(self, name, phase):
+        def profiled_phase(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return phase(*args, **kwargs)
+            finally:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+        return profiled_phase
+
+    def to_dict(self):
+        """ The measures as a (JSON serializable) dictionary """
+        return { 'total' : round(self.total, 6)
+                 , 'phases' : { name : round(self.phases.get(name, 0.0), 6) for (name, _) in PHASES }
+                 , 'dispatches' : { name : { 'calls' : calls, 'time' : round(total, 6), 'self_time' : round(self_time, 6) }
+                                    for (name, (calls, total, self_time)) in self.dispatches.items() }
+                 , 'type_allocations' : dict(self.type_allocations) }
+
+    def show(self, nb_dispatches=20):
+        """ A textual summary (with the costliest dispatches) """
+        lines = [ "Type checking: {:.4f} s".format(self.total), "Phases:" ]
+        for (name, _) in PHASES:
+            lines.append("  {:<12} {:9.4f} s".format(name, self.phases.get(name, 0.0)))
+        lines.append("Dispatches (by self time):")
+        lines.append("  {:<40} {:>9} {:>11} {:>11}".format("name", "calls", "time (s)", "self (s)"))
+        ranked = sorted(self.dispatches.items(), key=lambda item: -item[1][2])
+        for (name, (calls, total, self_time)) in ranked[:nb_dispatches]:
+            lines.append("  {:<40} {:>9} {:>11.4f} {:>11.4f}".format(name, calls, total, self_time))
+        lines.append("Types built: {} (subst: {}, rename_type_variables: {})".format(
+            self.type_allocations['total'], self.type_allocations['subst'], self.type_allocations['rename_type_variables']))
+        return "\n".join(lines)
+
+def instrumented_classes():
+    for module in (prog_ast, type_ast):
+        for (_, cls) in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                yield cls
+
+def instrument(profile, dispatches=True):
+    """ Install the profiled methods (only the timed phases without
+        the dispatches), returns what must be restored """
+    restore = []
+    for (phase_name, function_name) in PHASES:
+        phase = getattr(typechecker, function_name)
+        restore.append((typechecker, function_name, phase))
+        setattr(typechecker, function_name, profile.timed_phase(phase_name, phase))
+
+    if not dispatches:
+        return restore
+
+    for cls in instrumented_classes():
+        for method_name in PROFILED_METHODS:
+            # only the methods defined by the class (the inherited ones are profiled once)
+            method = cls.__dict__.get(method_name)
+            if method is None:
+                continue
+            profiled = profile.timed_dispatch("{}_{}".format(method_name, cls.__name__), method)
+            if method_name in TYPE_BUILDING_METHODS:
+                profiled = profile.type_building(method_name, profiled)
+            restore.append((cls, method_name, method))
+            setattr(cls, method_name, profiled)
+
+    restore.append((type_ast.TypeAST, '__init__', type_ast.TypeAST.__init__))
+    type_ast.TypeAST.__init__ = profile.counted_type_init(type_ast.TypeAST.__init__)
+
+    return restore
+
+def profile_type_check(prog, recover=False, dispatches=True):
+    """ Type-check the program with the instrumentation,
+        returns the typing context and the CheckProfile.
+        (the function bodies are checked in this process)
+        Timing only the phases (without the dispatches) costs nothing noticeable """
+    profile = CheckProfile()
+    restore = instrument(profile, dispatches)
+    try:
+        start = time.perf_counter()
+        ctx = prog.type_check(recover=recover)
+        profile.total = time.perf_counter() - start
+    finally:
+        for (owner, name, original) in reversed(restore):
+            setattr(owner, name, original)
+
+    return (ctx, profile)
@@ -1,6 +1,8 @@
 """The abstract syntax tree of programs."""
 
 import ast
+import contextlib
+import gc
 import tokenize
 
 try:
@@ -29,9 +31,6 @@ import astpp
 
 class Program:
     def __init__(self):
-        # python parsed AST
-        self.ast = None
-
         # list[str:Import]
         # the list of imported modules
         self.imports = dict()
@@ -55,11 +54,21 @@ class Program:
         #multi-declared functions
         self.multi_declared_functions = dict()
 
+        # the interfaces of the imported modules of the program directory
+        # (cf. project.imported_interfaces)
+        self.module_interfaces = None
+
         # metadata
         self.filename = None
         self.source = None
         self.source_lines = None
-        self.ast = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['source_lines'] = None
+        # the imported modules may change
+        state['module_interfaces'] = None
+        return state
 
     def get_source_line(self, linum):
         if self.source is None:
@@ -87,44 +96,61 @@ class Program:
 
         if not isinstance(modast, ast.Module):
             raise ValueError("Cannot build program from AST: not a module (please report)")
-        self.ast = modast
-
-        for node in modast.body:
-            #print(str(dir(node)))
-            if isinstance(node, ast.Import):
-                imp_ast = Import(node)
-                self.imports[imp_ast.name] = imp_ast
-            elif isinstance(node, ast.ImportFrom):
-                if not check_typing_imports(node):
-                    self.other_top_defs.append(UnsupportedNode(node))
-            elif isinstance(node, ast.FunctionDef):
-                fun_ast = FunctionDef(node)
-                if fun_ast.python101ready:
-                    if fun_ast.name in self.functions:
-                        self.multi_declared_functions[fun_ast.name] = node.lineno
-                    else:
-                        self.functions[fun_ast.name] = fun_ast
+        # (the python AST is not kept once lowered)
+
+        with paused_gc():
+            for node in modast.body:
+                self.build_top_level(node)
+
+    def build_top_level(self, node):
+        if isinstance(node, ast.Import):
+            imp_ast = Import(node)
+            self.imports[imp_ast.name] = imp_ast
+        elif isinstance(node, ast.ImportFrom):
+            if not check_typing_imports(node):
+                self.other_top_defs.append(UnsupportedNode(node))
+        elif isinstance(node, ast.FunctionDef):
+            fun_ast = FunctionDef(node)
+            if fun_ast.python101ready:
+                if fun_ast.name in self.functions:
+                    self.multi_declared_functions[fun_ast.name] = node.lineno
                 else:
-                    self.other_top_defs.append(UnsupportedNode(node))
-            elif isinstance(node, ast.Assert):
-                assert_ast = TestCase(node)
-                self.test_cases.append(assert_ast)
-            elif isinstance(node, ast.AnnAssign) and node.value is None:
-                DeclareVar_ast = DeclareVar(node)
-                self.global_vars.append(DeclareVar_ast)
-            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
-                if not check_typevar_assign(node):
-                    if isinstance(node, ast.AnnAssign):
-                        # Type annotation with initialization
-                        DeclareVar_ast = DeclareVar(node)
-                        self.global_vars.append(DeclareVar_ast)
-                    # assignment is also a global variables
-                    assign_ast = Assign(node)
-                    self.global_vars.append(assign_ast)
-                # else do nothing for typevar declarations
+                    self.functions[fun_ast.name] = fun_ast
             else:
-                # print("Unsupported instruction: " + node)
                 self.other_top_defs.append(UnsupportedNode(node))
+        elif isinstance(node, ast.Assert):
+            assert_ast = TestCase(node)
+            self.test_cases.append(assert_ast)
+        elif isinstance(node, ast.AnnAssign) and node.value is None:
+            DeclareVar_ast = DeclareVar(node)
+            self.global_vars.append(DeclareVar_ast)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            if not check_typevar_assign(node):
+                if isinstance(node, ast.AnnAssign):
+                    # Type annotation with initialization
+                    DeclareVar_ast = DeclareVar(node)
+                    self.global_vars.append(DeclareVar_ast)
+                # assignment is also a global variables
+                assign_ast = Assign(node)
+                # (the assigned value may be a type alias)
+                assign_ast.value_ast = node.value
+                self.global_vars.append(assign_ast)
+            # else do nothing for typevar declarations
+        else:
+            # print("Unsupported instruction: " + node)
+            self.other_top_defs.append(UnsupportedNode(node))
+
+@contextlib.contextmanager
+def paused_gc():
+    """ Pauses the garbage collector while building (acyclic) trees, or
+        checking them: its collections would scan the whole trees again and again """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
 
 ALLOWED_TYPING_IMPORTS = { 'Optional', 'Tuple', 'List', 'Dict', 'Set', 'TypeVar' }
 
@@ -156,35 +182,85 @@ def check_typevar_assign(node):
     return True
 
 
-class UnsupportedNode:
+# the names referred to by the function being lowered (cf. FunctionDef.names)
+LOWERED_NAMES = None
+
+def refer_name(name):
+    if LOWERED_NAMES is not None:
+        LOWERED_NAMES.add(name)
+
+class Node:
+    """ The base of the program nodes: the source position of the node
+        is stored inline, the python AST node is only kept (in the ast slot)
+        by the nodes that need it after the lowering """
+    __slots__ = ('lineno', 'col_offset')
+
+    def __init__(self, node):
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+
+def node_type_dispatch(classes):
+    """ The table classes (keyed on the names of the python AST nodes)
+        keyed on the types of the nodes, built once for the lowering """
+    dispatch = dict()
+    node_types = [ ast.AST ]
+    while node_types:
+        node_type = node_types.pop()
+        if node_type.__name__ in classes:
+            dispatch[node_type] = classes[node_type.__name__]
+        node_types.extend(node_type.__subclasses__())
+    return dispatch
+
+class UnsupportedNode(Node):
+    __slots__ = ('ast',)
     def __init__(self, node):
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.ast = node
         #print("Unsupported node:", astpp.dump(node))
 
-class Import:
+class Import(Node):
+    __slots__ = ('name',)
     def __init__(self, node):
-        self.ast = node
-        #print_ast_fields(self.ast)
-        alias = self.ast.names[0]
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        #print_ast_fields(node)
+        alias = node.names[0]
         self.name = alias.name
 
-class FunctionDef:
+class FunctionDef(Node):
+    __slots__ = ('end_lineno', 'name', 'python101ready', 'param_types', 'parameters', 'preconditions'
+                 , 'docstring', 'procedure', 'body', 'returns', 'fun_type', 'names')
     def __init__(self, node):
-        self.ast = node
-        self.name = self.ast.name
+        global LOWERED_NAMES
+        # the names referred to by the body and the preconditions (cf. refer_name)
+        self.names = set()
+        outer_names, LOWERED_NAMES = LOWERED_NAMES, self.names
+        try:
+            self.lower(node)
+        finally:
+            LOWERED_NAMES = outer_names
+
+    def lower(self, node):
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.end_lineno = node.end_lineno
+        # the converted signature (set by the type checker)
+        self.fun_type = None
+        self.name = node.name
         self.python101ready = True
 
         self.param_types = []
         self.parameters = []
 
         self.preconditions = []
-        for arg_obj in self.ast.args.args:
+        for arg_obj in node.args.args:
             self.parameters.append(arg_obj.arg)
 
-        for arg_obj in self.ast.args.args:
+        for arg_obj in node.args.args:
             self.param_types.append(arg_obj.annotation)
 
-        first_instr = self.ast.body[0]
+        first_instr = node.body[0]
         next_instr_index = 0
         self.docstring = None
         if isinstance(first_instr, ast.Expr) and isinstance(first_instr.value, ast.Str):
@@ -245,22 +321,27 @@ class FunctionDef:
                 self.procedure = True
 
         self.body = []
-        for inner_node in self.ast.body[next_instr_index:]:
+        for inner_node in node.body[next_instr_index:]:
             self.body.append(parse_instruction(inner_node))
 
-        self.returns = self.ast.returns
+        self.returns = node.returns
 
-class TestCase:
+class TestCase(Node):
+    __slots__ = ('expr',)
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         #print(astpp.dump(node))
 
-        self.expr = parse_expression(self.ast.test)
+        self.expr = parse_expression(node.test)
 
-class LHSVar:
+class LHSVar(Node):
+    __slots__ = ('var_name',)
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.var_name = node.id
+        refer_name(self.var_name)
 
     def variables(self):
         return [self]
@@ -274,9 +355,11 @@ class LHSVar:
     def __repr__(self):
         return "LHSVar({})".format(self.var_name)
 
-class LHSTuple:
+class LHSTuple(Node):
+    __slots__ = ('elements',)
     def __init__(self, node, elements):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.elements = elements
         #print(dir(node))
 
@@ -306,29 +389,37 @@ def build_lhs_destruct(node):
     else:
         return UnsupportedNode(node)
 
-class Assign:
+class Assign(Node):
+    # the python AST of the value is only kept for the global assignments
+    # (cf. Program.build_top_level)
+    __slots__ = ('value_ast', 'type_annotation', 'target', 'expr')
     def __init__(self, node):
-
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.value_ast = None
 
         if isinstance(node, ast.AnnAssign):
-            self.type_annotation = self.ast.annotation
-            self.target = build_lhs_destruct(self.ast.target)
+            self.type_annotation = node.annotation
+            self.target = build_lhs_destruct(node.target)
 
         else:
-            self.target = build_lhs_destruct(self.ast.targets[0])
+            self.target = build_lhs_destruct(node.targets[0])
 
-        self.expr = parse_expression(self.ast.value)
+        self.expr = parse_expression(node.value)
 
-class DeclareVar:
+class DeclareVar(Node):
+    __slots__ = ('type_annotation', 'target')
     def __init__(self, node):
-        self.ast = node
-        self.type_annotation = self.ast.annotation
-        self.target = build_lhs_destruct(self.ast.target)
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.type_annotation = node.annotation
+        self.target = build_lhs_destruct(node.target)
 
-class ContainerAssign:
+class ContainerAssign(Node):
+    __slots__ = ('container_expr', 'container_index', 'assign_expr')
     def __init__(self, node, target, expr):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.container_expr = parse_expression(target.value)
         if isinstance(target.slice, ast.Index):
             # Python <= 3.8 < 3.9
@@ -336,7 +427,7 @@ class ContainerAssign:
         else:
             # Python >= 3.9
             self.container_index = parse_expression(target.slice)
-        
+
         self.assign_expr = parse_expression(expr)
 
 
@@ -361,18 +452,19 @@ def parse_assign(node):
     else:
         return assign
 
-class For:
+class For(Node):
+    __slots__ = ('has_forbidden_orelse', 'target', 'iter', 'body')
     def __init__(self, node):
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         # avoid else clause
         if hasattr(node, 'orelse') and len(node.orelse) > 0:
             self.has_forbidden_orelse = True
-            self.ast = node
             return # does not construct the rest
 
         self.has_forbidden_orelse = False
-        self.ast = node
 
-        self.target = build_lhs_destruct(self.ast.target)
+        self.target = build_lhs_destruct(node.target)
 
         self.iter = parse_expression(node.iter)
         self.body = []
@@ -381,10 +473,12 @@ class For:
             self.body.append(iinstr)
 
 
-class Return:
+class Return(Node):
+    __slots__ = ('expr',)
     def __init__(self, node):
-        self.ast = node
-        self.expr = parse_expression(self.ast.value)
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.expr = parse_expression(node.value)
 
 def parse_return(node):
     if node.value:
@@ -392,43 +486,50 @@ def parse_return(node):
     else:
         return UnsupportedNode(node)
 
-class If:
+class If(Node):
+    __slots__ = ('cond', 'body', 'orelse')
     def __init__(self, node):
-        self.ast = node
-        self.cond = parse_expression(self.ast.test)
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.cond = parse_expression(node.test)
         self.body = []
-        for instr in self.ast.body:
+        for instr in node.body:
             iinstr = parse_instruction(instr)
             self.body.append(iinstr)
         self.orelse = []
-        for instr in self.ast.orelse:
+        for instr in node.orelse:
             iinstr = parse_instruction(instr)
             self.orelse.append(iinstr)
 
-class While:
+class While(Node):
+    __slots__ = ('has_forbidden_orelse', 'cond', 'body')
     def __init__(self, node):
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         # avoid else clause
         if hasattr(node, 'orelse') and len(node.orelse) > 0:
             self.has_forbidden_orelse = True
-            self.ast = node
             return # does not construct the rest
 
         self.has_forbidden_orelse = False
-        self.ast = node
-        self.cond = parse_expression(self.ast.test)
+        self.cond = parse_expression(node.test)
         self.body = []
-        for instr in self.ast.body:
+        for instr in node.body:
             iinstr = parse_instruction(instr)
             self.body.append(iinstr)
 
-class Assertion:
+class Assertion(Node):
+    __slots__ = ('test',)
     def __init__(self, node):
-        self.ast = node
-        self.test = parse_expression(self.ast.test)
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        self.test = parse_expression(node.test)
 
-class With:
+class With(Node):
+    __slots__ = ('call', 'var_name', 'body')
     def __init__(self, node, call, var_name, body):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.call = call
         self.var_name = var_name
         self.body = body
@@ -471,46 +572,47 @@ INSTRUCTION_CLASSES = {"Assign" : parse_assign
                        , "With" : parse_with
 }
 
+INSTRUCTION_DISPATCH = node_type_dispatch(INSTRUCTION_CLASSES)
+
 def parse_instruction(node):
-    instruction_type_name = node.__class__.__name__
-    #print("instruction type=",instruction_type_name)
-    if instruction_type_name in INSTRUCTION_CLASSES:
-        wrap_node = INSTRUCTION_CLASSES[instruction_type_name](node)
-        return wrap_node
+    parse = INSTRUCTION_DISPATCH.get(node.__class__)
+    if parse is not None:
+        return parse(node)
     else:
         #print(">>>> not supported")
         return UnsupportedNode(node)
 
-class Expr:
-    pass
+class Expr(Node):
+    __slots__ = ()
 
 class ENum(Expr):
+    __slots__ = ('value',)
     def __init__(self, node, setval=None):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         if setval is not None:
             self.value = setval
         else:
             self.value = node.n
 
 class EStr(Expr):
+    __slots__ = ('value',)
     def __init__(self, node, setval=None):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         if setval is not None:
             self.value = setval
         else:
             self.value = node.s
 
 class ETrue(Expr):
-    def __init__(self, node):
-        self.ast = node
+    __slots__ = ()
 
 class EFalse(Expr):
-    def __init__(self, node):
-        self.ast = node
+    __slots__ = ()
 
 class ENone(Expr):
-    def __init__(self, node):
-        self.ast = node
+    __slots__ = ()
 
 def parse_constant(node):
     if node.value is True:
@@ -539,12 +641,14 @@ def parse_constant_expr(node):
     raise ValueError("Constant not supported: {} (please report)".format(node.value))
 
 class EVar(Expr):
+    __slots__ = ('name',)
     def __init__(self, node):
-        self.ast = node
-        if isinstance(self.ast, ast.Name):
-            self.name = self.ast.id
-        elif isinstance(self.ast, ast.Attribute):
-            node = self.ast
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
+        if isinstance(node, ast.Name):
+            self.name = node.id
+            refer_name(self.name)
+        elif isinstance(node, ast.Attribute):
             names = []
             while isinstance(node, ast.Attribute):
                 names.append(node.attr)
@@ -556,76 +660,56 @@ class EVar(Expr):
             names.append(node.id)
             names.reverse()
             self.name = ".".join(names)
+            refer_name(names[0])
+            refer_name(names[0] + "." + names[1])
 
         else:
-            raise NotImplementedError("Unsupported EVar type (please report): {}".format(self.ast))
+            raise NotImplementedError("Unsupported EVar type (please report): {}".format(node))
 
 class ETuple(Expr):
+    __slots__ = ('elements',)
     def __init__(self, node):
-        # print("tuple : " + str(dir(node)) + "\n")
-        # print("elts: " + str(dir(node.elts)))
-        # print("_attributes: " + str(dir(node._attributes)))
-        # print("_fields: " + str(dir(node._fields)))
-        # print("node : " + str(type(node)))
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.elements = []
         for elem_node in node.elts:
             elem = parse_expression(elem_node)
             self.elements.append(elem)
 
-class EAdd(Expr):
+class EBinaryOp(Expr):
+    __slots__ = ('left', 'right')
     def __init__(self, node, left, right):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.left = left
         self.right = right
 
-class ESub(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EAdd(EBinaryOp):
+    __slots__ = ()
 
-class EMult(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class ESub(EBinaryOp):
+    __slots__ = ()
 
-class EDiv(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EMult(EBinaryOp):
+    __slots__ = ()
 
-class EFloorDiv(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EDiv(EBinaryOp):
+    __slots__ = ()
 
-class EMod(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EFloorDiv(EBinaryOp):
+    __slots__ = ()
 
-class EPow(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EMod(EBinaryOp):
+    __slots__ = ()
 
-class EBitOr(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EPow(EBinaryOp):
+    __slots__ = ()
 
-class EBitAnd(Expr):
-    def __init__(self, node, left, right):
-        self.ast = node
-        self.left = left
-        self.right = right
+class EBitOr(EBinaryOp):
+    __slots__ = ()
+
+class EBitAnd(EBinaryOp):
+    __slots__ = ()
 
 BINOP_CLASSES = { "Add" : EAdd
                   , "Sub" : ESub
@@ -638,73 +722,85 @@ BINOP_CLASSES = { "Add" : EAdd
                   , "BitAnd" : EBitAnd
 }
 
+BINOP_DISPATCH = node_type_dispatch(BINOP_CLASSES)
+
 def EBinOp(node):
     #print(astpp.dump(node))
-    binop_type_name = node.op.__class__.__name__
-    #print("binop type=",binop_type_name)
-    if binop_type_name in BINOP_CLASSES:
+    binop_class = BINOP_DISPATCH.get(node.op.__class__)
+    if binop_class is not None:
         left = parse_expression(node.left)
         right = parse_expression(node.right)
-        wrap_node = BINOP_CLASSES[binop_type_name](node, left, right)
-        return wrap_node
+        return binop_class(node, left, right)
     else:
         # print(astpp.dump(node))
         return UnsupportedNode(node)
 
 class EAnd(Expr):
+    __slots__ = ('operands',)
     def __init__(self, node, operands):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.operands = operands
 
 class EOr(Expr):
+    __slots__ = ('operands',)
     def __init__(self, node, operands):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.operands = operands
 
 BOOLOP_CLASSES = { "And" : EAnd
                   , "Or" : EOr
 }
 
+BOOLOP_DISPATCH = node_type_dispatch(BOOLOP_CLASSES)
+
 def EBoolOp(node):
-    boolop_type_name = node.op.__class__.__name__
-    #print("boolop type=",boolop_type_name)
-    if boolop_type_name in BOOLOP_CLASSES:
+    boolop_class = BOOLOP_DISPATCH.get(node.op.__class__)
+    if boolop_class is not None:
         operands = []
         for operand in node.values:
             operand = parse_expression(operand)
             operands.append(operand)
 
-        wrap_node = BOOLOP_CLASSES[boolop_type_name](node, operands)
-        return wrap_node
+        return boolop_class(node, operands)
     else:
         return UnsupportedNode(node)
 
 class EUSub(Expr):
+    __slots__ = ('operand',)
     def __init__(self, node, operand):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.operand = operand
 
 class ENot(Expr):
+    __slots__ = ('operand',)
     def __init__(self, node, operand):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.operand = operand
 
 UNOP_CLASSES = { "USub" : EUSub
                  , "Not" : ENot
 }
 
+UNOP_DISPATCH = node_type_dispatch(UNOP_CLASSES)
+
 def EUnaryOp(node):
-    unop_type_name = node.op.__class__.__name__
-    if unop_type_name in UNOP_CLASSES:
+    unop_class = UNOP_DISPATCH.get(node.op.__class__)
+    if unop_class is not None:
         operand = parse_expression(node.operand)
-        return UNOP_CLASSES[unop_type_name](node, operand)
+        return unop_class(node, operand)
     else:
         return UnsupportedNode(node)
 
 
 class ECompare(Expr):
+    __slots__ = ('conds',)
     def __init__(self, node, conds):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.conds = conds
 
 def parse_compare(node):
@@ -727,42 +823,35 @@ def parse_compare(node):
     return ECompare(node, conds)
 
 class Condition:
+    # the comparison operators have no source position
+    __slots__ = ('left', 'right')
     def __init__(self, op, left, right):
-        self.ast = op
         self.left = left
         self.right = right
 
 class CEq(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CNotEq(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CGtE(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CGt(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CLtE(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CLt(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CIn(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 class CNotIn(Condition):
-    def __init__(self, op, left, right):
-        super().__init__(op, left, right)
+    __slots__ = ()
 
 COMPARE_CLASSES = { "Eq" : CEq
                     , "NotEq" : CNotEq
@@ -774,10 +863,12 @@ COMPARE_CLASSES = { "Eq" : CEq
                     , "NotIn" : CNotIn
 }
 
+COMPARE_DISPATCH = node_type_dispatch(COMPARE_CLASSES)
+
 def parse_cond(op, left, right):
-    compare_type_name = op.__class__.__name__
-    if compare_type_name in COMPARE_CLASSES:
-        return COMPARE_CLASSES[compare_type_name](op, left, right)
+    compare_class = COMPARE_DISPATCH.get(op.__class__)
+    if compare_class is not None:
+        return compare_class(op, left, right)
     else:
         return None
 
@@ -792,8 +883,10 @@ def parse_function(func_descr):
     return parts
 
 class ECall(Expr):
+    __slots__ = ('receiver', 'fun_name', 'full_fun_name', 'multi_receivers', 'arguments')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
 
         if isinstance(node.func, ast.Name):
             self.receiver = None
@@ -808,21 +901,23 @@ class ECall(Expr):
             else:
                 self.multi_receivers = True
             self.full_fun_name = (node.func.value.id if not self.multi_receivers else "<multi-reicevers>") + "." + self.fun_name
+        refer_name(self.full_fun_name)
 
         #print("function receiver={}".format(self.receiver))
         #print("function name=", self.fun_name)
         self.arguments = []
 
-        for arg in self.ast.args:
+        for arg in node.args:
             #print(astpp.dump(arg))
             earg = parse_expression(arg)
             self.arguments.append(earg)
             #print("---")
 
 class ERange(Expr):
+    __slots__ = ('start', 'stop', 'step')
     def __init__(self, node):
-
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.start = None
         if len(node.args) >= 1:
             self.start = parse_expression(node.args[0])
@@ -861,26 +956,34 @@ def parse_call(node):
 
 
 class EMin(Expr):
+    __slots__ = ('args',)
     def __init__(self, node, args):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.args = args
 
 class EMax(Expr):
+    __slots__ = ('args',)
     def __init__(self, node, args):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.args = args
 
 class EList(Expr):
+    __slots__ = ('elements',)
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.elements = []
         for elt in node.elts:
             elt_expr = parse_expression(elt)
             self.elements.append(elt_expr)
 
 class Indexing(Expr):
+    __slots__ = ('subject', 'index')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.subject = parse_expression(node.value)
         if isinstance(node.slice, ast.Index):
             # Python <= 3.8 < 3.8
@@ -889,10 +992,12 @@ class Indexing(Expr):
             # Python >= 3.9
             self.index = parse_expression(node.slice)
 
-        
+
 class Slicing(Expr):
+    __slots__ = ('subject', 'lower', 'upper', 'step')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.subject = parse_expression(node.value)
         self.lower = None
         if node.slice.lower is not None:
@@ -913,19 +1018,22 @@ def parse_subscript(node):
             return Indexing(node)
     else:
         raise ValueError("Wrong subscript AST (please report)")
-        
+
 class Generator:
+    # the comprehensions have no source position
+    __slots__ = ('target', 'iter', 'conditions')
     def __init__(self, generator):
-        self.ast = generator
-        self.target = build_lhs_destruct(self.ast.target)
-        self.iter = parse_expression(self.ast.iter)
+        self.target = build_lhs_destruct(generator.target)
+        self.iter = parse_expression(generator.iter)
         self.conditions  = []
-        for ifcond in self.ast.ifs:
+        for ifcond in generator.ifs:
             self.conditions.append(parse_expression(ifcond))
 
 class EListComp(Expr):
+    __slots__ = ('compr_expr', 'generators')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         #print(astpp.dump(node))
         self.compr_expr = parse_expression(node.elt)
         self.generators = []
@@ -933,8 +1041,10 @@ class EListComp(Expr):
             self.generators.append(Generator(gen))
 
 class ESet(Expr):
+    __slots__ = ('elements',)
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         #print(astpp.dump(node))
         self.elements = []
         for elt in node.elts:
@@ -942,8 +1052,10 @@ class ESet(Expr):
             self.elements.append(elt_expr)
 
 class ESetComp(Expr):
+    __slots__ = ('compr_expr', 'generators')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         #print(astpp.dump(node))
         self.compr_expr = parse_expression(node.elt)
         self.generators = []
@@ -951,8 +1063,10 @@ class ESetComp(Expr):
             self.generators.append(Generator(gen))
 
 class EDict(Expr):
+    __slots__ = ('keys', 'values')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         self.keys = []
         for key in node.keys:
             key_expr = parse_expression(key)
@@ -964,8 +1078,10 @@ class EDict(Expr):
             self.values.append(val_expr)
 
 class EDictComp(Expr):
+    __slots__ = ('key_expr', 'val_expr', 'generators')
     def __init__(self, node):
-        self.ast = node
+        self.lineno = node.lineno
+        self.col_offset = node.col_offset
         #print(astpp.dump(node))
         self.key_expr = parse_expression(node.key)
         self.val_expr = parse_expression(node.value)
@@ -995,12 +1111,13 @@ EXPRESSION_CLASSES = { "Num" : ENum
                        , "DictComp" : EDictComp
 }
 
+# the lowering functions keyed on the types of the python AST nodes
+EXPRESSION_DISPATCH = node_type_dispatch(EXPRESSION_CLASSES)
+
 def parse_expression(node):
-    expression_type_name = node.__class__.__name__
-    #print("expression type=",expression_type_name)
-    if expression_type_name in EXPRESSION_CLASSES:
-        wrap_node = EXPRESSION_CLASSES[expression_type_name](node)
-        return wrap_node
+    parse = EXPRESSION_DISPATCH.get(node.__class__)
+    if parse is not None:
+        return parse(node)
     else:
         return UnsupportedNode(node)
 
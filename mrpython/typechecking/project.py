@@ -0,0 +1,192 @@
+"""
+Multi-module Python101 projects.
+
+A program can import the (student) modules of its directory, e.g.
+``import geometry`` then ``geometry.area(...)`` or ``geometry.Point``.
+An imported module is checked before the modules importing it (the
+imports are resolved depth-first, hence in topological order) and its
+interface, i.e. the signatures of its functions and its type aliases,
+is cached.  The interface of a module is keyed on its source and on
+the interfaces of the modules it imports: editing a module only checks
+it again, and the modules depending on it if its interface changed.
+"""
+
+import ast
+import collections
+import hashlib
+import os.path
+import re
+import tokenize
+
+try:
+    from . import typechecker
+    from .prog_ast import Program
+except ImportError:
+    import typechecker
+    from prog_ast import Program
+
+# the (top-level) imports, as lowered by prog_ast.Import
+IMPORT_REGEXP = re.compile(r"^import[ \t]+([^\W\d]\w*)", re.MULTILINE)
+
+# the cached interfaces, by key (at most MAX_INTERFACES)
+INTERFACES = collections.OrderedDict()
+MAX_INTERFACES = 256
+
+# the paths of the modules whose imports are being resolved (for the import cycles)
+RESOLVING = []
+
+class ModuleInterface:
+    """ What a (student) module exports to the modules importing it """
+    def __init__(self, name, filename, key=None):
+        self.name = name
+        self.filename = filename
+        self.key = key
+        # the signatures of the functions and the type aliases (by qualified name)
+        self.signatures = dict()
+        self.type_defs = dict()
+        # the number of (fatal) type errors of the module
+        self.nb_errors = 0
+        # the import cycle (the list of modules) if the module is in one
+        self.cycle = None
+        self.digest = None
+
+    def compute_digest(self):
+        digest = hashlib.sha256()
+        for (name, type_ast) in sorted(self.signatures.items()):
+            digest.update("{}:{};".format(name, type_ast).encode("utf-8"))
+        for (name, type_ast) in sorted(self.type_defs.items()):
+            digest.update("{}={};".format(name, type_ast).encode("utf-8"))
+        digest.update("errors={}".format(self.nb_errors).encode("utf-8"))
+        self.digest = digest.hexdigest()
+
+def module_filename(name, directory):
+    """ The file of the module of the directory, or None """
+    if name in typechecker.REGISTERED_IMPORTS:
+        return None
+    filename = os.path.join(directory, name + ".py")
+    return filename if os.path.isfile(filename) else None
+
+def module_imports(source, directory):
+    """ The names of the modules of the directory imported by the source """
+    names = []
+    for name in IMPORT_REGEXP.findall(source):
+        if name not in names and module_filename(name, directory) is not None:
+            names.append(name)
+    return names
+
+def module_interface(name, filename):
+    """ The interface of the module, checked (with its imports) if required """
+    filename = os.path.realpath(filename)
+    if filename in RESOLVING:
+        interface = ModuleInterface(name, filename)
+        cycle = [ os.path.splitext(os.path.basename(path))[0] for path in RESOLVING[RESOLVING.index(filename):] ]
+        interface.cycle = cycle + [ name ]
+        return interface
+
+    try:
+        with tokenize.open(filename) as f:
+            source = f.read()
+    except (OSError, SyntaxError):
+        interface = ModuleInterface(name, filename)
+        interface.nb_errors = 1
+        interface.compute_digest()
+        return interface
+
+    directory = os.path.dirname(filename)
+    RESOLVING.append(filename)
+    try:
+        imported = { import_name : module_interface(import_name, module_filename(import_name, directory))
+                     for import_name in module_imports(source, directory) }
+    finally:
+        RESOLVING.pop()
+
+    key = interface_key(source, imported)
+    interface = INTERFACES.get(key)
+    if interface is not None:
+        INTERFACES.move_to_end(key)
+        return interface
+
+    interface = check_module(name, filename, source, imported, key)
+    if interface.cycle is None:
+        INTERFACES[key] = interface
+        if len(INTERFACES) > MAX_INTERFACES:
+            INTERFACES.popitem(last=False)
+    return interface
+
+def interface_key(source, imported):
+    digest = hashlib.sha256()
+    digest.update(source.encode("utf-8", "surrogatepass"))
+    for (import_name, interface) in sorted(imported.items()):
+        digest.update(import_name.encode("utf-8"))
+        # the modules in an import cycle are checked again
+        digest.update((interface.digest or "cycle").encode("utf-8"))
+    return digest.hexdigest()
+
+def check_module(name, filename, source, imported, key):
+    """ Type-check an imported module (in recovery mode,
+        so that its interface does not depend on the mode) """
+    interface = ModuleInterface(name, filename, key)
+    for imported_interface in imported.values():
+        if imported_interface.cycle is not None:
+            interface.cycle = imported_interface.cycle
+    try:
+        modast = ast.parse(source, filename)
+    except SyntaxError:
+        interface.nb_errors = 1
+        interface.compute_digest()
+        return interface
+
+    prog = Program()
+    prog.build_from_ast(modast, filename, source)
+    prog.module_interfaces = imported
+    ctx = prog.type_check(recover=True)
+
+    for fun_name in prog.functions:
+        if fun_name in ctx.global_env:
+            interface.signatures[name + "." + fun_name] = ctx.global_env[fun_name]
+    for (type_name, type_def) in ctx.type_defs.items():
+        if "." not in type_name: # not imported
+            interface.type_defs[name + "." + type_name] = type_def
+    interface.nb_errors = sum(1 for type_error in ctx.type_errors if type_error.is_fatal())
+    interface.compute_digest()
+    return interface
+
+def imported_interfaces(prog):
+    """ The interfaces of the modules imported by the program
+        (which are resolved once), by name """
+    if prog.module_interfaces is None:
+        prog.module_interfaces = dict()
+        if prog.filename is not None and prog.imports:
+            filename = os.path.realpath(prog.filename)
+            directory = os.path.dirname(filename)
+            RESOLVING.append(filename)
+            try:
+                for import_name in prog.imports:
+                    module_file = module_filename(import_name, directory)
+                    if module_file is not None:
+                        prog.module_interfaces[import_name] = module_interface(import_name, module_file)
+            finally:
+                RESOLVING.pop()
+
+    return prog.module_interfaces
+
+def imports_digest(source, filename):
+    """ A digest of the interfaces of the modules imported by the source
+        (empty if it imports none), that the cached results depend on """
+    if filename is None:
+        return ""
+    filename = os.path.realpath(filename)
+    directory = os.path.dirname(filename)
+    names = module_imports(source, directory)
+    if not names:
+        return ""
+
+    digest = hashlib.sha256()
+    RESOLVING.append(filename)
+    try:
+        for name in names:
+            interface = module_interface(name, module_filename(name, directory))
+            digest.update("{}:{};".format(name, interface.digest or "cycle").encode("utf-8"))
+    finally:
+        RESOLVING.pop()
+    return digest.hexdigest()
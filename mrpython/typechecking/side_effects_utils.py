@@ -1,6 +1,5 @@
 import os.path, sys
 import ast
-from collections import deque
 
 if __name__ == "__main__":
     main_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), os.pardir)
@@ -25,33 +24,37 @@ else:
         from type_ast import *
         
 class AliasRef:
-    def __init__(self, ref, nb_def, index_in = None, index_out = None):
+    """
+    A reference to (a part of) the variable ref, at its nb_def-th definition.
+    The paths index_out and index_in are tuples of accessors ('.' for an
+    element of a container, 'i' for the i-th component of a tuple).
+    The references are immutable (access and unaccess return new references),
+    so that they can be shared and hashed once.
+    """
+    __slots__ = ('ref', 'nb_def', 'index_in', 'index_out', 'key', 'hash')
+
+    def __init__(self, ref, nb_def, index_in = (), index_out = ()):
         self.ref = ref
         self.nb_def = nb_def
-        if index_in:
-            self.index_in = index_in
-        else:
-            self.index_in = deque()
-
-        if index_out:
-            self.index_out = index_out
-        else:
-            self.index_out = deque()
+        self.index_in = tuple(index_in) if index_in else ()
+        self.index_out = tuple(index_out) if index_out else ()
+        self.key = (self.index_out, ref, nb_def, self.index_in)
+        self.hash = hash(self.key)
 
     def access(self, c):
         if self.index_out and self.index_out[0] == c:
-            p = self.index_out.popleft()
+            return AliasRef(self.ref, self.nb_def, self.index_in, self.index_out[1:])
         else:
-            self.index_in.append(c)
+            return AliasRef(self.ref, self.nb_def, self.index_in + (c,), self.index_out)
 
     def unaccess(self, c):
-        self.index_out.appendleft(c)
+        return AliasRef(self.ref, self.nb_def, self.index_in, (c,) + self.index_out)
 
     def __eq__(self, other):
-        return isinstance(other, AliasRef) and self.__repr__() == other.__repr__()
+        return isinstance(other, AliasRef) and self.key == other.key
 
     def __hash__(self):
-        return self.__repr__().__hash__()
+        return self.hash
 
     def __repr__(self):
         repr_index_out = ""
@@ -68,14 +71,16 @@ class AliasRef:
 
 
     def simplify(self):
-        if self.index_out and self.index_out[0] != ".":
-            if self.index_in[len(self.index_in)-1] == self.index_out[0]:
-                self.index_in.pop()
-                self.index_out.popleft()
-                return self.simplify()
+        index_in, index_out = self.index_in, self.index_out
+        while index_out and index_out[0] != ".":
+            if index_in[len(index_in)-1] == index_out[0]:
+                index_in = index_in[:-1]
+                index_out = index_out[1:]
             else:
                 return None
-        return self
+        if index_in is self.index_in and index_out is self.index_out:
+            return self
+        return AliasRef(self.ref, self.nb_def, index_in, index_out)
 
 
 def alias_expr (expr, ctx):
@@ -83,18 +88,27 @@ def alias_expr (expr, ctx):
 Expr.alias = alias_expr
 
 def get_all_alias_ctx(ctx, var):
+    """ The references (transitively) aliased by the variable var
+        (cached until the aliasing changes, cf. TypingContext.add_alias) """
+    var_ref = AliasRef(var.name, ctx.var_def[var.name])
+    closure = ctx.alias_closures.get(var_ref)
+    if closure is None:
+        closure = alias_closure(ctx, var_ref)
+        ctx.alias_closures[var_ref] = closure
+    return set(closure)
+
+def alias_closure(ctx, var_ref):
     res = set()
     marked = set()
-    to_add = set([AliasRef(var.name, ctx.var_def[var.name])])
+    to_add = { var_ref }
     while to_add:
-        res = res | to_add
+        res |= to_add
         to_add_next = set()
         for alias in to_add:
-            #to_add_next = to_add_next | (ctx.get_alias(alias.ref) - res)
             if alias.ref not in marked:
                 marked.add(alias.ref)
                 for a in ctx.get_alias(AliasRef(alias.ref, ctx.var_def[alias.ref])):
-                    a = AliasRef(a.ref, ctx.var_def[a.ref], concat_deque(a.index_in, alias.index_in), concat_deque(alias.index_out, a.index_out))
+                    a = AliasRef(a.ref, ctx.var_def[a.ref], a.index_in + alias.index_in, alias.index_out + a.index_out)
                     if not (a in res):
                         to_add_next.add(a)
         to_add = to_add_next
@@ -106,7 +120,7 @@ def get_all_alias_ctx(ctx, var):
         if tmp:
             final_res.add(tmp)
 
-    return final_res
+    return frozenset(final_res)
 
 
 def alias_var (var, ctx):
@@ -124,10 +138,7 @@ def alias_EList(lst, ctx):
     for elt in lst.elements:
         res = res | elt.alias(ctx)
 
-    for ref in res:
-        ref.unaccess('.')
-
-    return res
+    return { ref.unaccess('.') for ref in res }
 
 EList.alias = alias_EList
 
@@ -136,8 +147,7 @@ def alias_ETuple(tpl, ctx):
     res = set()
     for elt in tpl.elements:
         for a in elt.alias(ctx):
-            a.unaccess(str(i))
-            res.add(a)
+            res.add(a.unaccess(str(i)))
         i = i + 1
     return res
 
@@ -146,9 +156,7 @@ ETuple.alias = alias_ETuple
 
 def alias_Indexing(indexing, ctx):
     aliases = indexing.subject.alias(ctx)
-    for a in aliases:
-        a.access(".")
-    return aliases
+    return { a.access(".") for a in aliases }
 
 Indexing.alias = alias_Indexing
 
@@ -157,39 +165,16 @@ def alias_EAdd(eadd, ctx):
     aliases_r = eadd.right.alias(ctx)
     res = aliases_l | aliases_r
 
-    for a in res:
-        a.access(".")
-        a.unaccess(".")
-    return res
+    return { a.access(".").unaccess(".") for a in res }
 EAdd.alias = alias_EAdd
 
 def alias_Slicing(slc, ctx):
     res = slc.subject.alias(ctx)
 
-    for a in res:
-        a.access(".")
-        a.unaccess(".")
-    return res
+    return { a.access(".").unaccess(".") for a in res }
 
 Slicing.alias = alias_Slicing
 
-#########################
-## python <= 3.4  fixes
-def copy_deque(deq):
-    ndeque = deque()
-    for e in deq:
-        ndeque.append(e)
-    return ndeque
-
-
-def concat_deque(deq1, deq2):
-    ndeque = copy_deque(deq1)
-    for e in deq2:
-        ndeque.append(e)
-    return ndeque
-
-#########################
-
 def side_effect_ECall(call, ctx):
     is_side_effect = False
     protected_var = set()
@@ -216,9 +201,8 @@ def side_effect_ECall(call, ctx):
             if not alias_rec.index_out:
                 for alias_arg in aliases_arg:
                     #to ensure all aliasing links are in form LL->[.]P rather than LL[.]->P
-                    alias_index_in =  concat_deque(alias_rec.index_in, alias_arg.index_out)
-                    alias_index_in.appendleft(".")
-                    tmp.add(AliasRef(alias_arg.ref, ctx.var_def[alias_arg.ref], copy_deque(alias_arg.index_in), alias_index_in))
+                    alias_index_in = (".",) + alias_rec.index_in + alias_arg.index_out
+                    tmp.add(AliasRef(alias_arg.ref, ctx.var_def[alias_arg.ref], alias_arg.index_in, alias_index_in))
 
                 ctx.add_alias(alias_rec.ref, tmp)
 
@@ -261,9 +245,7 @@ def linearize(ctx, lhs_expr, aliases):
         for i in range(len(lhs_expr.elements)):
             alias_elem = set()
             for a in aliases:
-                tmp = AliasRef(a.ref, ctx.var_def[a.ref], copy_deque(a.index_in), copy_deque(a.index_out))
-                tmp.access(str(i))
-                alias_elem.add(tmp)
+                alias_elem.add(AliasRef(a.ref, ctx.var_def[a.ref], a.index_in, a.index_out).access(str(i)))
             linearize(ctx, lhs_expr.elements[i], alias_elem)
 
 
@@ -271,9 +253,8 @@ def assign_extended(ctx, working_var, working_expr, suffix):
     if isinstance(working_var, LHSVar):
         ctx.add_var_def(working_var.var_name)
         aliases = working_expr.alias(ctx)
-        for a in aliases:
-            for s in suffix:
-                a.access(s)
+        for s in suffix:
+            aliases = { a.access(s) for a in aliases }
         ctx.add_alias(working_var.var_name, aliases)
 
     if isinstance(working_var, LHSTuple):
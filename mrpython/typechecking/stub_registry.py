@@ -0,0 +1,155 @@
+"""
+The signatures of the builtins and of the supported library modules.
+
+They are declared in the stubs directory, one (.pyi) file per module
+(builtins.pyi for the builtins), with Python101 annotations:
+
+    pi : float                                # a constant
+    def sqrt(x : float) -> float: ...         # a function
+
+    class list:                               # the methods (with their receiver)
+        def append(self : List[α], x : α) -> None: ...
+        def pop(self : List[α], i : int = ...) -> α: ...   # an optional parameter
+
+A function with optional parameters, or declared several times (e.g. a
+method of several classes), is overloaded: its signatures are kept in a
+list, and the signature of a call is chosen on its number of arguments,
+then on the type of its receiver (cf. typechecker.select_signature).
+A stub is only parsed when its module is first imported by a checked
+program, and its signatures are then shared by all the checks.
+"""
+
+import ast
+import collections.abc
+import os
+
+try:
+    from .type_ast import *
+    from .type_converter import type_converter
+except ImportError:
+    from type_ast import *
+    from type_converter import type_converter
+
+STUB_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "stubs")
+
+# the module of the builtins (registered first, without prefix)
+BUILTINS_MODULE = ''
+BUILTINS_STUB = 'builtins'
+
+# the names of the stub types (that are not Python101 types)
+STUB_TYPE_DEFS = { 'Any' : Anything()
+                   , 'number' : NumberType()
+                   , 'File' : FileType()
+                   , 'α' : TypeVariable('α')
+                   , 'β' : TypeVariable('β') }
+
+# the empty set and dictionary (e.g. the return type of set())
+STUB_EMPTY_TYPES = { 'Set' : SetType()
+                     , 'Dict' : DictType() }
+
+class StubModule:
+    """ The (parsed) stub of a module """
+    def __init__(self, module_name):
+        self.module_name = module_name
+        # name -> FunctionType, or list of FunctionType if overloaded
+        # (the methods are named '.method')
+        self.signatures = dict()
+        # name -> type
+        self.constants = dict()
+
+def stub_type(annotation, stub_file):
+    if isinstance(annotation, ast.Name) and annotation.id in STUB_EMPTY_TYPES:
+        return STUB_EMPTY_TYPES[annotation.id]
+
+    ok, type_annot = type_converter(annotation)
+    if ok:
+        stype, unknown_alias = type_annot.unalias(STUB_TYPE_DEFS)
+        if stype is not None:
+            return stype.unannotated()
+
+    raise ValueError("Wrong type in stub {} at line {} (please report)".format(stub_file, annotation.lineno))
+
+def stub_signatures(fun_def, stub_file):
+    param_types = []
+    for arg in fun_def.args.args:
+        if arg.annotation is None:
+            raise ValueError("Missing parameter type in stub {} at line {} (please report)".format(stub_file, fun_def.lineno))
+        param_types.append(stub_type(arg.annotation, stub_file))
+
+    if fun_def.returns is None:
+        raise ValueError("Missing return type in stub {} at line {} (please report)".format(stub_file, fun_def.lineno))
+    ret_type = stub_type(fun_def.returns, stub_file)
+
+    # one signature for each number of (given) optional parameters
+    nb_required = len(param_types) - len(fun_def.args.defaults)
+    return [ FunctionType(param_types[:nb_params], ret_type)
+             for nb_params in range(nb_required, len(param_types) + 1) ]
+
+def add_signatures(module, name, signatures):
+    """ Declare the signatures of name in the module (overloaded
+        if it is already declared, or has several signatures) """
+    if name in module.signatures:
+        previous = module.signatures[name]
+        signatures = (previous if isinstance(previous, list) else [ previous ]) + signatures
+    module.signatures[name] = signatures[0] if len(signatures) == 1 else signatures
+
+def parse_stub(module_name, stub_file):
+    """ Parse the stub file of the module """
+    with open(stub_file, encoding="utf-8") as f:
+        stub_ast = ast.parse(f.read(), stub_file)
+
+    module = StubModule(module_name)
+    prefix = module_name + "." if module_name != BUILTINS_MODULE else ""
+    for node in stub_ast.body:
+        if isinstance(node, ast.FunctionDef):
+            add_signatures(module, prefix + node.name, stub_signatures(node, stub_file))
+        elif isinstance(node, ast.ClassDef):
+            for method in node.body:
+                if isinstance(method, ast.FunctionDef):
+                    add_signatures(module, "." + method.name, stub_signatures(method, stub_file))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            module.constants[prefix + node.target.id] = stub_type(node.annotation, stub_file)
+        elif not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)):
+            raise ValueError("Unsupported declaration in stub {} at line {} (please report)".format(stub_file, node.lineno))
+
+    return module
+
+class StubRegistry(collections.abc.Mapping):
+    """ The signatures of the modules, by module name (loaded on first use) """
+    def __init__(self, stub_dir=STUB_DIR):
+        self.stub_dir = stub_dir
+        self.module_files = None
+        self.modules = dict()
+
+    def stub_files(self):
+        if self.module_files is None:
+            self.module_files = dict()
+            for name in sorted(os.listdir(self.stub_dir)):
+                module_name, ext = os.path.splitext(name)
+                if ext == ".pyi":
+                    if module_name == BUILTINS_STUB:
+                        module_name = BUILTINS_MODULE
+                    self.module_files[module_name] = os.path.join(self.stub_dir, name)
+        return self.module_files
+
+    def module(self, module_name):
+        """ The StubModule of the module (KeyError if there is none) """
+        module = self.modules.get(module_name)
+        if module is None:
+            module = self.modules[module_name] = parse_stub(module_name, self.stub_files()[module_name])
+        return module
+
+    def constants(self, module_name):
+        return self.module(module_name).constants
+
+    def __getitem__(self, module_name):
+        return self.module(module_name).signatures
+
+    def __contains__(self, module_name):
+        return module_name in self.stub_files()
+
+    def __iter__(self):
+        return iter(self.stub_files())
+
+    def __len__(self):
+        return len(self.stub_files())
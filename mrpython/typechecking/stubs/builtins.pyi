@@ -0,0 +1,94 @@
+# Signatures of the Python101 builtins (cf. stub_registry)
+#
+#   - Any : any type,  number : int or float,  File : an opened file
+#   - Set and Dict (without parameters) : the empty set and dictionary
+#   - α, β : type variables
+#   - the methods are declared in classes, with the receiver as first parameter
+#   - a parameter with a default (= ...) is optional, and a function declared
+#     several times (e.g. a method of several classes) is overloaded
+
+def len(xs : Iterable[α]) -> int: ...
+def abs(x : float) -> float: ...
+def print(x : Any) -> None: ...
+def min(x : float, y : float) -> float: ...
+def max(x : float, y : float) -> float: ...
+def int(x : Any) -> int: ...
+def float(x : Any) -> float: ...
+def str(x : Any) -> str: ...
+def ord(c : str) -> int: ...
+def chr(n : int) -> str: ...
+def round(x : number) -> int: ...
+
+# images   ... TODO: the type system is not precise enough (for now)
+def draw_line(x1 : float, y1 : float, x2 : float, y2 : float, color : Any) -> Image: ...
+def overlay(img1 : Image, img2 : Image, more : Any) -> Image: ...
+def underlay(img1 : Image, img2 : Image, more : Any) -> Image: ...
+def fill_triangle(x1 : float, y1 : float, x2 : float, y2 : float, x3 : float, y3 : float, color : Any) -> Image: ...
+def draw_triangle(x1 : float, y1 : float, x2 : float, y2 : float, x3 : float, y3 : float, color : Any) -> Image: ...
+def draw_ellipse(x1 : float, y1 : float, x2 : float, y2 : float, color : Any) -> Image: ...
+def fill_ellipse(x1 : float, y1 : float, x2 : float, y2 : float, color : Any) -> Image: ...
+def show_image(img : Image) -> None: ...
+
+# fichiers
+def open(filename : str, mode : str) -> File: ...
+
+class file:
+    def readlines(self : File) -> List[str]: ...
+    def read(self : File) -> str: ...
+    def write(self : File, s : str) -> None: ...
+
+# chaînes
+class str:
+    def upper(self : str) -> str: ...
+    def lower(self : str) -> str: ...
+    def capitalize(self : str) -> str: ...
+    def title(self : str) -> str: ...
+    def strip(self : str, chars : str = ...) -> str: ...
+    def lstrip(self : str, chars : str = ...) -> str: ...
+    def rstrip(self : str, chars : str = ...) -> str: ...
+    def split(self : str, sep : str = ...) -> List[str]: ...
+    def join(self : str, parts : Iterable[str]) -> str: ...
+    def replace(self : str, old : str, new : str) -> str: ...
+    def startswith(self : str, prefix : str) -> bool: ...
+    def endswith(self : str, suffix : str) -> bool: ...
+    def find(self : str, sub : str) -> int: ...
+    def count(self : str, sub : str) -> int: ...
+    def index(self : str, sub : str) -> int: ...
+    def isdigit(self : str) -> bool: ...
+    def isalpha(self : str) -> bool: ...
+    def isalnum(self : str) -> bool: ...
+    def isspace(self : str) -> bool: ...
+    def isupper(self : str) -> bool: ...
+    def islower(self : str) -> bool: ...
+
+# listes
+class list:
+    def append(self : List[α], x : α) -> None: ...
+    def extend(self : List[α], xs : Iterable[α]) -> None: ...
+    def insert(self : List[α], i : int, x : α) -> None: ...
+    def pop(self : List[α], i : int = ...) -> α: ...
+    def index(self : List[α], x : α) -> int: ...
+    def count(self : List[α], x : α) -> int: ...
+    def remove(self : List[α], x : α) -> None: ...
+    def reverse(self : List[α]) -> None: ...
+    def sort(self : List[α]) -> None: ...
+
+# ensembles
+def set() -> Set: ...
+
+class set:
+    def add(self : Set[α], x : α) -> None: ...
+    def remove(self : Set[α], x : α) -> None: ...
+
+# dictionnaires
+def dict() -> Dict: ...
+
+class dict:
+    def items(self : Dict[α, β]) -> Iterable[Tuple[α, β]]: ...
+    def keys(self : Dict[α, β]) -> Set[α]: ...
+    def values(self : Dict[α, β]) -> Iterable[β]: ...
+    def get(self : Dict[α, β], key : α) -> Optional[β]: ...
+    def get(self : Dict[α, β], key : α, default : β) -> β: ...
+
+# iterables
+def zip(xs : Iterable[α], ys : Iterable[β]) -> Iterable[Tuple[α, β]]: ...
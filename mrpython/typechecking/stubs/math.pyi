@@ -0,0 +1,38 @@
+# Signatures of the math module (cf. stub_registry)
+
+pi : float
+e : float
+tau : float
+inf : float
+
+def sqrt(x : float) -> float: ...
+def isqrt(n : int) -> int: ...
+def exp(x : float) -> float: ...
+def log(x : float) -> float: ...
+def log2(x : float) -> float: ...
+def log10(x : float) -> float: ...
+def pow(x : float, y : float) -> float: ...
+def floor(x : float) -> int: ...
+def ceil(x : float) -> int: ...
+def trunc(x : float) -> int: ...
+def fabs(x : float) -> float: ...
+def sin(x : float) -> float: ...
+def cos(x : float) -> float: ...
+def tan(x : float) -> float: ...
+def cosh(x : float) -> float: ...
+def sinh(x : float) -> float: ...
+def tanh(x : float) -> float: ...
+def acos(x : float) -> float: ...
+def asin(x : float) -> float: ...
+def atan(x : float) -> float: ...
+def atan2(y : float, x : float) -> float: ...
+def acosh(x : float) -> float: ...
+def asinh(x : float) -> float: ...
+def atanh(x : float) -> float: ...
+def hypot(x : float, y : float) -> float: ...
+def degrees(x : float) -> float: ...
+def radians(x : float) -> float: ...
+def factorial(n : int) -> int: ...
+def gcd(a : int, b : int) -> int: ...
+def comb(n : int, k : int) -> int: ...
+def perm(n : int, k : int) -> int: ...
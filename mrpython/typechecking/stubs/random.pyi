@@ -0,0 +1,9 @@
+# Signatures of the random module (cf. stub_registry)
+
+def random() -> float: ...
+def seed(n : int) -> None: ...
+def randint(a : int, b : int) -> int: ...
+def uniform(a : float, b : float) -> float: ...
+def choice(xs : Sequence[α]) -> α: ...
+def shuffle(xs : List[α]) -> None: ...
+def sample(xs : Sequence[α], k : int) -> List[α]: ...
@@ -16,6 +16,8 @@ TRANSLATOR_DICT = {
     , "Warning you've initialzed in 2 differents ways the variable: '{}'" : {'fr' : "Vous avez initailisé de 2 façons différentes la variable : '{}'"}
     , "Warning you've initialzed and not used the variable: '{}'" : {'fr' : "Attention, vous initialisez sans utiliser la variable : '{}'" }
     , "the module '{}' is not supported in Python101" : { 'fr' : "le module '{}' n'est pas disponible en Python101"}
+    , "the modules import each other: {}" : { 'fr' : "les modules s'importent mutuellement : {}"}
+    , "the module '{}' has {} type error(s)" : { 'fr' : "le module '{}' a {} erreur(s) de typage"}
     , "Signature problem" : { 'fr' : "Problème de signature"}
     , "I don't understand the signature of function '{}'" : { 'fr' : "je ne comprends pas la signature de la fonction '{}'"}
     , "Function arity issue" : { 'fr' : "Problème d'arité" }
@@ -179,3 +181,23 @@ def tr(msg):
         return msg
 
     return tmsg
+
+# the translation function of each domain of messages (cf. Message)
+MESSAGE_DOMAINS = { 'typechecking' : tr }
+
+class Message:
+    """ A message translated when it is displayed: its id (the english
+        text, with {} for the arguments), its arguments and its domain
+        (the dictionary that translates it, cf. MESSAGE_DOMAINS) """
+    def __init__(self, msgid, *args, domain='typechecking'):
+        self.msgid = msgid
+        # the arguments are kept as numbers, messages (translated with
+        # this one) or (rendered) strings
+        self.args = tuple(arg if isinstance(arg, (int, float, Message)) else str(arg) for arg in args)
+        self.domain = domain
+
+    def __str__(self):
+        msg = MESSAGE_DOMAINS[self.domain](self.msgid)
+        if not self.args:
+            return msg
+        return msg.format(*self.args)
@@ -1,7 +1,70 @@
-"""The abstract syntax tree of type expressions."""
-
+"""The abstract syntax tree of type expressions.
+
+The type terms are hash-consed on demand: the canonical type of a type
+(its unannotated representative, shared by the structurally equal types)
+is only looked up when it is first needed, i.e. when the type is compared
+(cf. typechecker.memoize_type_compare) or a signature is renamed.
+The types must not be modified once built.
+The table of the canonical types only keeps the types that are still
+in use (it does not grow with the checked programs).
+"""
+
+import weakref
+
+# the (weak references to the) canonical types, indexed by their
+# structure (cf. intern_type)
+TYPE_TABLE = dict()
+
+def interned_type(key):
+    """ The canonical type of the key (if it is still in use) """
+    ref = TYPE_TABLE.get(key)
+    return ref() if ref is not None else None
+
+def register_type(key, type_ast):
+    def forget(ref):
+        if TYPE_TABLE.get(key) is ref:
+            del TYPE_TABLE[key]
+    TYPE_TABLE[key] = weakref.ref(type_ast, forget)
+
+def intern_type(type_ast):
+    """ Records (and returns) the canonical type of type_ast, which is
+        type_ast itself if it is unannotated and made of canonical types
+        (and no equal type is interned yet) """
+    key = [ type_ast.__class__ ]
+    canonical = not type_ast.annotated
+    pure = type_ast.pure_node
+    for component in type_ast.components():
+        if isinstance(component, TypeAST):
+            component_canonical = component.canonical
+            key.append(id(component_canonical))
+            canonical = canonical and component_canonical is component
+            pure = pure and component.pure
+        else:
+            key.append(component)
+    key = tuple(key)
+
+    type_ast._pure = pure
+    interned = interned_type(key)
+    if interned is None:
+        # (the unannotated type has the same key)
+        interned = type_ast if canonical else type_ast.unannotated()
+        interned._canonical = interned
+        interned._pure = pure
+        register_type(key, interned)
+
+    type_ast._canonical = interned
+    return interned
+
+def unpickle_type(cls, fields):
+    """ Rebuilds a pickled type """
+    type_ast = object.__new__(cls)
+    for (name, value) in fields:
+        setattr(type_ast, name, value)
+    return type_ast
 
 class TypeAST:
+    __slots__ = ('annotated', 'annotation', '_canonical', '_pure', '__weakref__')
+
     def __init__(self, annotation):
         if annotation:
             self.annotated=True
@@ -10,6 +73,41 @@ class TypeAST:
             self.annotated=False
             self.annotation = None
 
+    def components(self):
+        """ The sub-terms (types or plain values) that identify the type """
+        return ()
+
+    def unannotated(self):
+        """ The same type without annotation (and with canonical sub-terms) """
+        return self.__class__()
+
+    @property
+    def canonical(self):
+        """ The canonical type (interned on first use) """
+        canonical = getattr(self, '_canonical', None)
+        return canonical if canonical is not None else intern_type(self)
+
+    def compared_again(self):
+        """ Whether the type was already compared (cf. typechecker.memoize_type_compare),
+            marks it as compared """
+        if getattr(self, '_canonical', False) is False:
+            self._canonical = None # (not interned yet)
+            return False
+        return True
+
+    @property
+    def pure(self):
+        """ Whether the type and its sub-terms are pure (cf. pure_node) """
+        try:
+            return self._pure
+        except AttributeError:
+            intern_type(self)
+            return self._pure
+
+    # False if comparing with this type may depend on (or modify)
+    # the typing context (cf. typechecker.memoize_type_compare)
+    pure_node = True
+
     def rename_type_variables(self, rmap):
         raise NotImplementedError("Type variable renaming not implemented for this node type (please report)\n  ==> {}".format(self))
 
@@ -28,7 +126,18 @@ class TypeAST:
     def unalias(self, type_defs):
         raise NotImplementedError("Method unalias is abstract")
 
+    def __reduce__(self):
+        # the canonical types of another process are not the ones of this process
+        fields = []
+        for cls in self.__class__.__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in ('_canonical', '_pure', '__weakref__'):
+                    fields.append((name, getattr(self, name)))
+        return (unpickle_type, (self.__class__, tuple(fields)))
+
 class Anything(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -54,10 +163,20 @@ class Anything(TypeAST):
         return "Anything()"
 
 class TypeAlias(TypeAST):
+    __slots__ = ('alias_name',)
+
     def __init__(self, alias_name, annotation=None):
         super().__init__(annotation)
         self.alias_name = alias_name
 
+    def components(self):
+        return (self.alias_name,)
+
+    def unannotated(self):
+        return TypeAlias(self.alias_name)
+
+    pure_node = False
+
     def is_hashable(self):
         return True
 
@@ -74,7 +193,6 @@ class TypeAlias(TypeAST):
         unaliased_type, unknown_alias = type_defs[self.alias_name].unalias(type_defs)
         if unaliased_type is None:
             return (None, unknown_alias)
-        unaliased_type.alias_name = self.alias_name
 
         return (unaliased_type, None)
 
@@ -88,6 +206,8 @@ class TypeAlias(TypeAST):
         return "TypeAlias({})".format(self.alias_name)
 
 class FileType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -114,6 +234,8 @@ class FileType(TypeAST):
 
 
 class BoolType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -139,6 +261,8 @@ class BoolType(TypeAST):
         return "BoolType()"
 
 class IntType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -164,6 +288,8 @@ class IntType(TypeAST):
         return "IntType()"
 
 class FloatType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -190,6 +316,8 @@ class FloatType(TypeAST):
 
 
 class NumberType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -205,6 +333,8 @@ class NumberType(TypeAST):
     def unalias(self, type_defs):
         return (self, None)
 
+    pure_node = False # comparisons with int are imprecise
+
     def __eq__(self, other):
         return isinstance(other, NumberType)
 
@@ -216,6 +346,8 @@ class NumberType(TypeAST):
 
 
 class NoneTypeType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -241,6 +373,8 @@ class NoneTypeType(TypeAST):
         return "NoneType()"
 
 class ImageType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
 
@@ -267,6 +401,8 @@ class ImageType(TypeAST):
 
 
 class StrType(TypeAST):
+    __slots__ = ()
+
     def __init__(self, annotation=None):
         super().__init__(annotation)
         #self.elem_type = StrType() # how strange !
@@ -303,12 +439,22 @@ PREDEFINED_TYPE_VARIABLES = { 'T', 'U', 'V', 'W', 'K'
                               , 'K1', 'K2', 'K3', 'K4' }
 
 class TypeVariable(TypeAST):
+    __slots__ = ('var_name',)
+
     def __init__(self, var_name, annotation=None):
         super().__init__(annotation)
         if not isinstance(var_name, type("")):
             raise ValueError("Type variable name is not a string: {}".format(var_name))
         self.var_name = var_name
 
+    def components(self):
+        return (self.var_name,)
+
+    def unannotated(self):
+        return TypeVariable(self.var_name)
+
+    pure_node = False # bound by the calls of generic functions
+
     def __eq__(self, other):
         return isinstance(other, TypeVariable) and other.var_name == self.var_name
 
@@ -345,6 +491,8 @@ class TypeVariable(TypeAST):
         return 'TypeVariable({})'.format(self.var_name)
 
 class TupleType(TypeAST):
+    __slots__ = ('elem_types',)
+
     def __init__(self, elem_types, annotation=None):
         super().__init__(annotation)
         if len(elem_types) == 0:
@@ -354,7 +502,15 @@ class TupleType(TypeAST):
                 raise ValueError("Element type is not a TypeAST: {}".format(elem_type))
         self.elem_types = elem_types
 
+    def components(self):
+        return self.elem_types
+
+    def unannotated(self):
+        return TupleType([ elem_type.canonical for elem_type in self.elem_types ])
+
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         if isinstance(other, TupleType) and len(other.elem_types) == len(self.elem_types):
             for i in range(len(self.elem_types)):
                 if self.elem_types[i] != other.elem_types[i]:
@@ -410,12 +566,20 @@ class TupleType(TypeAST):
         return "TupleType([{}])".format(",".join((repr(et) for et in self.elem_types)))
 
 class ListType(TypeAST):
+    __slots__ = ('elem_type',)
+
     def __init__(self, elem_type=None, annotation=None):
         super().__init__(annotation)
         if elem_type is not None and not isinstance(elem_type, TypeAST):
             raise ValueError("Element type is not a TypeAST: {}".format(elem_type))
         self.elem_type = elem_type
 
+    def components(self):
+        return (self.elem_type,)
+
+    def unannotated(self):
+        return ListType(self.elem_type.canonical if self.elem_type is not None else None)
+
     def rename_type_variables(self, rmap):
         if self.elem_type is None:
             return self
@@ -436,6 +600,8 @@ class ListType(TypeAST):
                 , None)
 
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         return isinstance(other, ListType) \
             and (self.elem_type is None or other.elem_type is None \
                  or other.elem_type == self.elem_type)
@@ -465,13 +631,23 @@ class ListType(TypeAST):
         return "ListType({})".format(repr(self.elem_type)) if self.elem_type else "ListType()"
 
 class SetType(TypeAST):
+    __slots__ = ('elem_type',)
+
     def __init__(self, elem_type=None, annotation=None):
         super().__init__(annotation)
         if elem_type is not None and not isinstance(elem_type, TypeAST):
             raise ValueError("Element type is not a TypeAST: {}".format(elem_type))
         self.elem_type = elem_type
 
+    def components(self):
+        return (self.elem_type,)
+
+    def unannotated(self):
+        return SetType(self.elem_type.canonical if self.elem_type is not None else None)
+
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         return isinstance(other, SetType) and other.elem_type == self.elem_type
 
     def rename_type_variables(self, rmap):
@@ -522,6 +698,8 @@ class SetType(TypeAST):
         return "SetType({})".format(repr(self.elem_type))
 
 class DictType(TypeAST):
+    __slots__ = ('key_type', 'val_type')
+
     def __init__(self, key_type=None, val_type=None, annotation=None):
         super().__init__(annotation)
         if key_type is not None and not isinstance(key_type, TypeAST):
@@ -533,6 +711,14 @@ class DictType(TypeAST):
             raise ValueError("Value type is not a TypeAST: {}".format(val_type))
         self.val_type = val_type
 
+    def components(self):
+        return (self.key_type, self.val_type)
+
+    def unannotated(self):
+        if self.key_type is None:
+            return DictType()
+        return DictType(self.key_type.canonical, self.val_type.canonical)
+
     def rename_type_variables(self, rmap):
         if self.key_type is None:
             return self
@@ -586,6 +772,8 @@ class DictType(TypeAST):
 
 
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         return isinstance(other, DictType) and other.key_type == self.key_type \
             and other.val_type == self.val_type
 
@@ -602,12 +790,20 @@ class DictType(TypeAST):
         return "DictType({},{})".format(repr(self.key_type), repr(self.val_type))
 
 class IterableType(TypeAST):
+    __slots__ = ('elem_type',)
+
     def __init__(self, elem_type, annotation=None):
         super().__init__(annotation)
         if not isinstance(elem_type, TypeAST):
             raise ValueError("Element type is not a TypeAST: {}".format(elem_type))
         self.elem_type = elem_type
 
+    def components(self):
+        return (self.elem_type,)
+
+    def unannotated(self):
+        return IterableType(self.elem_type.canonical)
+
     def rename_type_variables(self, rmap):
         nelem_type = self.elem_type.rename_type_variables(rmap)
         return IterableType(nelem_type, self.annotation)
@@ -633,6 +829,8 @@ class IterableType(TypeAST):
         return None
 
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         return isinstance(other, IterableType) and other.elem_type == self.elem_type
 
     def __str__(self):
@@ -642,12 +840,20 @@ class IterableType(TypeAST):
         return "IterableType({})".format(repr(self.elem_type))
 
 class SequenceType(TypeAST):
+    __slots__ = ('elem_type',)
+
     def __init__(self, elem_type, annotation=None):
         super().__init__(annotation)
         if not isinstance(elem_type, TypeAST):
             raise ValueError("Element type is not a TypeAST: {}".format(elem_type))
         self.elem_type = elem_type
 
+    def components(self):
+        return (self.elem_type,)
+
+    def unannotated(self):
+        return SequenceType(self.elem_type.canonical)
+
     def rename_type_variables(self, rmap):
         nelem_type = self.elem_type.rename_type_variables(rmap)
         return SequenceType(nelem_type, self.annotation)
@@ -675,6 +881,8 @@ class SequenceType(TypeAST):
 
 
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         return isinstance(other, SequenceType) and other.elem_type == self.elem_type
 
     def __str__(self):
@@ -684,12 +892,22 @@ class SequenceType(TypeAST):
         return "SequenceType({})".format(repr(self.elem_type))
 
 class OptionType(TypeAST):
+    __slots__ = ('elem_type',)
+
     def __init__(self, elem_type, annotation=None):
         super().__init__(annotation)
         if not isinstance(elem_type, TypeAST):
             raise ValueError("Element type is not a TypeAST: {}".format(elem_type))
         self.elem_type = elem_type
 
+    def components(self):
+        return (self.elem_type,)
+
+    def unannotated(self):
+        return OptionType(self.elem_type.canonical)
+
+    pure_node = False # the option coercions are reported as warnings
+
     def rename_type_variables(self, rmap):
         nelem_type = self.elem_type.rename_type_variables(rmap)
         return OptionType(nelem_type, self.annotation if self.annotated else None)
@@ -716,6 +934,8 @@ class OptionType(TypeAST):
         return None
 
     def __eq__(self, other):
+        if isinstance(other, TypeAST) and other.canonical is self.canonical:
+            return True
         return isinstance(other, OptionType) and other.elem_type == self.elem_type
 
     def __str__(self):
@@ -725,12 +945,10 @@ class OptionType(TypeAST):
         return "OptionType({})".format(repr(self.elem_type))
 
 class FunctionType(TypeAST):
+    __slots__ = ('param_types', 'ret_type', 'partial')
+
     def __init__(self, param_types, ret_type, partial=False, annotation=None):
-        if annotation:
-            self.annotated=True
-            self.annotation=annotation
-        else:
-            self.annotated=False
+        super().__init__(annotation)
 
         for param_type in param_types:
             if not isinstance(param_type, TypeAST):
@@ -747,14 +965,24 @@ class FunctionType(TypeAST):
 
         self.partial = partial
 
+    def components(self):
+        return (self.partial, self.ret_type, len(self.param_types)) + tuple(self.param_types)
+
+
+    def proper_ret_type(self):
+        """ The return type, without the option of the partial functions """
+        return self.ret_type.elem_type if self.partial else self.ret_type
+
+    def unannotated(self):
+        return FunctionType([ param_type.canonical for param_type in self.param_types ]
+                            , self.proper_ret_type().canonical, self.partial)
+
     def rename_type_variables(self, rmap):
         nparam_types = []
         for param_type in self.param_types:
             nparam_types.append(param_type.rename_type_variables(rmap))
-        nret_type = self.ret_type.rename_type_variables(rmap)
-        nfntype = FunctionType(nparam_types, self.ret_type, self.partial, self.annotation if self.annotated else None)
-        nfntype.ret_type = nret_type
-        return nfntype
+        nret_type = self.proper_ret_type().rename_type_variables(rmap)
+        return FunctionType(nparam_types, nret_type, self.partial, self.annotation if self.annotated else None)
 
     def subst(self, type_env):
         raise ValueError("No substitution for function types (please report)")
@@ -780,13 +1008,12 @@ class FunctionType(TypeAST):
             else:
                 nparam_types.append(uparam_type)
 
-        nret_type, unknown_alias = self.ret_type.unalias(type_defs)
+        nret_type, unknown_alias = self.proper_ret_type().unalias(type_defs)
         if nret_type is None:
             return (None, unknown_alias)
 
-        nfntype = FunctionType(nparam_types, self.ret_type, self.partial, self.annotation if self.annotated else None)
-        nfntype.ret_type = nret_type
-        return (nfntype, None)
+        return (FunctionType(nparam_types, nret_type, self.partial, self.annotation if self.annotated else None)
+                , None)
 
     def __str__(self):
         return "{} -> {}".format(" * ".join((str(pt) for pt in self.param_types))
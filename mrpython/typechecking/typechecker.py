@@ -15,27 +15,81 @@ if __name__ == "__main__":
     from type_ast import *
     from type_converter import *
 
-    from translate import tr
+    from translate import Message
+    from stub_registry import StubRegistry
     from side_effects_utils import *
+    import parallel_checker
+    import project
 else:
     from .prog_ast import *
     from .type_ast import *
     from .type_converter import *
 
-    from .translate import tr
+    from .translate import Message
+    from .stub_registry import StubRegistry
 
     from .side_effects_utils import *
+    from . import parallel_checker
+    from . import project
 
 preconditions = dict()      #Dictionnary to save all the function preconditions
 
+# in recovery mode, the checking stops anyway after this number of errors
+RECOVERY_MAX_ERRORS = 100
+
 class TypeError:
     def is_fatal(self):
         raise NotImplementedError("is_fatal is an abstract method")
 
 
+# the binding of a name that was not bound (cf. ScopedEnv)
+UNBOUND = object()
+
+class ScopedEnv(dict):
+    """
+    An environment (dictionary) with nested blocks: within a block, the
+    first write of each name saves its previous binding, so that entering
+    and leaving a block only costs the names written in the block.
+    """
+    __slots__ = ('journals',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.journals = [] # the saved bindings of each (entered) block
+
+    def __reduce__(self):
+        # (the bindings are restored before the journals)
+        return (ScopedEnv, (dict(self),), (None, { 'journals' : self.journals }))
+
+    def __setitem__(self, name, info):
+        if self.journals:
+            journal = self.journals[-1]
+            if name not in journal:
+                journal[name] = dict.get(self, name, UNBOUND)
+        dict.__setitem__(self, name, info)
+
+    def enter_block(self):
+        self.journals.append(dict())
+
+    def leave_block(self):
+        """ Restore the bindings of the enclosing block, returns the list of
+            (name, enclosing binding or UNBOUND, binding in the block)
+            for the names written in the block (in order of first write) """
+        changes = []
+        for (name, previous) in self.journals.pop().items():
+            changes.append((name, previous, dict.__getitem__(self, name)))
+            if previous is UNBOUND:
+                dict.__delitem__(self, name)
+            else:
+                dict.__setitem__(self, name, previous)
+
+        return changes
+
 class TypingContext:
-    def __init__(self, prog):
+    def __init__(self, prog, recover=False):
         self.prog = prog
+        self.recover = recover
+        self.unchecked_functions = set() # functions with a broken signature (recovery mode)
         self.type_errors = []
         self.type_defs = {}
         self.global_env = {}
@@ -51,20 +105,54 @@ class TypingContext:
         self.local_env = None
         self.declared_env = None
         self.call_type_env = [] # stack of type environments when calling generic functions
-        self.local_env = {}  # will have global variables
-        self.declared_env={} #Will receive type declaration only
+        self.local_env = ScopedEnv()  # will have global variables
+        self.declared_env = ScopedEnv() #Will receive type declaration only
 
         self.in_call = False
         self.protected = set()
         self.aliasing = {}
+        self.alias_closures = {} # cf. get_all_alias_ctx
         self.var_def = {}
 
+        self.function_checks = {} # for incremental checking (cf. type_check_function_bodies)
+        self.renamed_signatures = {} # cf. renamed_signature
 
     def add_type_error(self, error):
         self.type_errors.append(error)
         if error.is_fatal():
             self.fatal_error = True
 
+    def recover_from_error(self):
+        """ In recovery mode, forget about the fatal error (if any) so that
+            the checking can go on, returns False if it must stop """
+        if not self.recover or len(self.type_errors) >= RECOVERY_MAX_ERRORS:
+            return False
+        self.fatal_error = False
+        return True
+
+    def checkpoint(self):
+        """ Save the environments before checking a function body
+            (to restore them after a fatal error, in recovery mode) """
+        return (dict(self.local_env), dict(self.declared_env), set(self.dead_variables))
+
+    def restore(self, checkpoint):
+        local_env, declared_env, dead_variables = checkpoint
+        self.local_env = ScopedEnv(local_env)
+        self.declared_env = ScopedEnv(declared_env)
+        self.dead_variables = dead_variables
+        self.param_env = None
+        self.return_type = None
+        self.function_def = None
+        self.partial_function = None
+        self.parent_stack = None
+        self.parent_decl_stack = None
+        self.call_type_env = []
+        self.in_call = False
+        self.protected = set()
+        self.aliasing = {}
+        self.alias_closures = {} # cf. get_all_alias_ctx
+        self.var_def = {}
+
     def register_import(self, import_map):
         for (fname, ftype) in import_map.items():
             self.global_env[fname] = ftype
@@ -93,14 +181,14 @@ class TypingContext:
         self.save_dead_variables = self.dead_variables.copy()
 
     def push_parent(self, parent_node):
-        parent_local_env = { var_name : var_info for (var_name, var_info) in self.local_env.items() }
         if not self.parent_stack:
             self.parent_stack = []
-        self.parent_stack.append((parent_node, parent_local_env))
-        parent_local_declare = {var_name : var_info for (var_name, var_info) in self.declared_env.items() }
+        self.parent_stack.append(parent_node)
+        self.local_env.enter_block()
         if not self.parent_decl_stack:
             self.parent_decl_stack = []
-        self.parent_decl_stack.append((parent_node, parent_local_declare))
+        self.parent_decl_stack.append(parent_node)
+        self.declared_env.enter_block()
 
     def pop_parent(self, protected_vars=None):
         if protected_vars is None:
@@ -109,35 +197,30 @@ class TypingContext:
         if not self.parent_decl_stack:
             raise ValueError("Cannot pop from empty parent declaration stack (please report)")
 
-        _, parent_local_declare = self.parent_decl_stack.pop()
-        for (var_name, var_info) in self.declared_env.items():
-            if var_name not in parent_local_declare:
+        self.parent_decl_stack.pop()
+        for (var_name, parent_info, var_info) in self.declared_env.leave_block():
+            if parent_info is UNBOUND:
                 # XXX: barendregt convention too strong ?
                 # self.dead_variables.add(var)
                 if var_name not in self.local_env and var_name not in protected_vars:
                     self.add_type_error(NotUsedDeclarationWarning(self.function_def, var_name,var_info))
 
-        self.declared_env = parent_local_declare
-
         if not self.parent_stack:
             raise ValueError("Cannot pop from empty parent stack (please report)")
 
         # all variables defined within the parent are now disallowed
+        # (except the ones declared outside)
 
-        _, parent_local_env = self.parent_stack.pop()
-        for (var_name, var_info) in self.local_env.items():
-            if (var_name, var_info) not in parent_local_env.items():
+        self.parent_stack.pop()
+        for (var_name, parent_info, var_info) in self.local_env.leave_block():
+            if parent_info is UNBOUND or parent_info != var_info:
                 if var_name in self.declared_env :
-                    parent_local_env[var_name]=var_info
+                    self.local_env[var_name]=var_info
                 else:
                     pass
                 # XXX: barendregt convention too strong ?
                 # self.dead_variables.add(var)
 
-        self.local_env = parent_local_env
-
-        # all variables defined within the parent are now disallowed
-
     def fetch_nominal_type(self, base_type):
         # TODO : follow metavar instantiations
         # (for now, just return the type as it is)
@@ -150,7 +233,7 @@ class TypingContext:
         self.partial_function = None
         self.parent_stack = None
         self.allow_declarations = None
-        self.local_env = self.save_local_env
+        self.local_env = ScopedEnv(self.save_local_env)
         self.save_local_env = None
         self.dead_variables = self.save_dead_variables
         self.save_dead_variables = None
@@ -158,6 +241,7 @@ class TypingContext:
         self.in_call = False
         self.protected = set()
         self.aliasing = {}
+        self.alias_closures = {} # cf. get_all_alias_ctx
         self.var_def = {}
 
     def fetch_scope_mode(self):
@@ -168,10 +252,11 @@ class TypingContext:
 
     #links must be bidirectionnal...
     def add_alias(self, var, aliased):
+        self.alias_closures.clear()
         tmp = AliasRef(var, self.var_def[var])
         self.aliasing[tmp] = self.aliasing[tmp] | aliased
         for a in aliased:
-            self.aliasing[AliasRef(a.ref, self.var_def[a.ref])].add(AliasRef(var, self.var_def[var], copy_deque(a.index_out), copy_deque(a.index_in)))
+            self.aliasing[AliasRef(a.ref, self.var_def[a.ref])].add(AliasRef(var, self.var_def[var], a.index_out, a.index_in))
 
     def print_alias(self):
         res = ""
@@ -185,6 +270,7 @@ class TypingContext:
         return set()
 
     def add_var_def(self, var_name):
+        self.alias_closures.clear()
         if var_name in self.var_def:
             self.var_def[var_name] += 1
         else:
@@ -212,19 +298,58 @@ UnsupportedNode.type_check = type_check_UnsupportedNode
 
 # Takes a program, and returns a
 # (possibly empty) list of type errors
-def type_check_Program(prog):
-    ctx = TypingContext(prog)
+# If the context of a previous check (of a previous version of the
+# program) is given, the functions that did not change are not re-checked.
+# The results of the functions are only recorded for such a later check
+# if incremental (or a previous context is given).
+# In recovery mode, the checking goes on after a fatal error
+# (each function, global and test case is checked independently).
+# With jobs > 1, the function bodies are checked by a pool of processes
+# (the errors are reported in the same order).
+def type_check_Program(prog, previous_ctx=None, recover=False, jobs=1, incremental=False):
+    # the lowered program and the typing context are (almost) acyclic: the collections
+    # would only scan the (freshly built) program again and again
+    with paused_gc():
+        return type_check_phases(prog, previous_ctx, recover, jobs, incremental)
+
+def type_check_phases(prog, previous_ctx, recover, jobs, incremental):
+    ctx = TypingContext(prog, recover)
+
+    for type_check_phase in (type_check_top_level,
+                             type_check_type_aliases,
+                             type_check_imports,
+                             type_check_signatures):
+        if not type_check_phase(prog, ctx):
+            return ctx
+
+    if not type_check_function_bodies(prog, ctx, previous_ctx, jobs, incremental):
+        return ctx
+
+    for type_check_phase in (type_check_globals,
+                             type_check_test_cases):
+        if not type_check_phase(prog, ctx):
+            return ctx
+
+    return ctx
+
+Program.type_check = type_check_Program
 
+# The type checking phases below return False if the
+# type checking must stop (the errors are recorded in the context)
+
+def type_check_top_level(prog, ctx):
     if len(prog.multi_declared_functions) != 0:
         for fun_name in prog.multi_declared_functions:
             ctx.add_type_error(DuplicateMultiFunDeclarationError(prog.multi_declared_functions[fun_name], fun_name))
-        return ctx
+        if not ctx.recover_from_error():
+            return False
 
     # we do not type check a program with unsupported top-level nodes
     for top_def in prog.other_top_defs:
         if isinstance(top_def.ast, ast.FunctionDef):
             ctx.add_type_error(WrongFunctionDefError(top_def))
-            return ctx
+            if not ctx.recover_from_error():
+                return False
         else:
             # HACK : (some) top-level commands are allowed (but not checked)
             # TODO : more proper type checking of top-level forms
@@ -238,39 +363,48 @@ def type_check_Program(prog):
                 pass # do nothing
             else:
                 ctx.add_type_error(UnsupportedTopLevelNodeError(top_def))
-                return ctx
+                if not ctx.recover_from_error():
+                    return False
 
-    # type checking begins here
+    return True
 
+def type_check_type_aliases(prog, ctx):
     # first step : extract type definitions from global_vars
+    # (after the ones of the imported modules, e.g. geometry.Point)
+    for interface in project.imported_interfaces(prog).values():
+        ctx.type_defs.update(interface.type_defs)
 
     declared_global_vars = set()
     for global_var in prog.global_vars:
         if isinstance(global_var, DeclareVar):
             # TODO: track duplicate global variable declaractions here ?
             if global_var.target.var_name in declared_global_vars:
-                ctx.add_type_error(DuplicateMultiAssignError(global_var.ast.lineno, global_var.target.var_name))
-                return ctx
+                ctx.add_type_error(DuplicateMultiAssignError(global_var.lineno, global_var.target.var_name))
+                if not ctx.recover_from_error():
+                    return False
             declared_global_vars.add(global_var.target.var_name)
 
     new_global_vars = []
     for global_var in prog.global_vars:
         to_remove = False
         if isinstance(global_var, Assign) and isinstance(global_var.target, LHSVar) \
-           and hasattr(global_var.ast, "value") and global_var.target.var_name not in declared_global_vars:
-            ok, type_annotation = type_converter(global_var.ast.value)
+           and global_var.value_ast is not None and global_var.target.var_name not in declared_global_vars:
+            ok, type_annotation = type_converter(global_var.value_ast)
             if ok:
                 to_remove = True
                 type_name = global_var.target.var_name
                 if type_name in ctx.type_defs:
-                    ctx.add_type_error(DuplicateTypeDefError(global_var.ast.lineno, type_name))
-                    return ctx
+                    ctx.add_type_error(DuplicateTypeDefError(global_var.lineno, type_name))
+                    if not ctx.recover_from_error():
+                        return False
+                    continue # the first definition is kept
 
                 type_def, unknown_alias = type_annotation.unalias(ctx.type_defs)
                 if type_def is None:
-                    if check_if_roughly_type_expr(global_var.ast.value):
-                        ctx.add_type_error(UnknownTypeAliasError(type_annotation, unknown_alias, global_var.expr.ast.lineno, global_var.expr.ast.col_offset))
-                        return ctx
+                    if check_if_roughly_type_expr(global_var.value_ast):
+                        ctx.add_type_error(UnknownTypeAliasError(type_annotation, unknown_alias, global_var.expr.lineno, global_var.expr.col_offset))
+                        if not ctx.recover_from_error():
+                            return False
                     else:
                         to_remove = False
                 else:
@@ -280,6 +414,9 @@ def type_check_Program(prog):
 
     prog.global_vars = new_global_vars
 
+    return True
+
+def type_check_imports(prog, ctx):
     # second step :  fill the global environment
 
     # first register the builtins
@@ -289,62 +426,214 @@ def type_check_Program(prog):
     for import_name in prog.imports:
         if import_name in REGISTERED_IMPORTS:
             ctx.register_import(REGISTERED_IMPORTS[import_name])
-            # HACK : import the math.pi constant  (the only constant)
-            if import_name == "math":
-                ctx.local_env['math.pi'] = (FloatType(), "global")
-                ctx.local_env['math.e'] = (FloatType(), "global")
+            # the constants (e.g. math.pi)
+            for (const_name, const_type) in REGISTERED_IMPORTS.constants(import_name).items():
+                ctx.local_env[const_name] = (const_type, "global")
+        elif import_name in project.imported_interfaces(prog):
+            # a module of the program directory (already checked)
+            interface = prog.module_interfaces[import_name]
+            if interface.cycle is not None:
+                ctx.add_type_error(ImportCycleError(interface.cycle, prog.imports[import_name]))
+                if not ctx.recover_from_error():
+                    return False
+            elif interface.nb_errors > 0:
+                ctx.add_type_error(ImportedModuleErrorsWarning(import_name, interface.nb_errors, prog.imports[import_name]))
+            ctx.register_import(interface.signatures)
         else:
             ctx.add_type_error(UnsupportedImportError(import_name, prog.imports[import_name]))
-            return ctx
+            if not ctx.recover_from_error():
+                return False
+
+    return True
 
+def type_check_signatures(prog, ctx):
     # third step : process each function to fill the global environment
+    # (in recovery mode, a function with a broken signature is left unchecked)
     for (fun_name, fun_def) in prog.functions.items():
         if fun_name in { "add", "append"
                          , "triangle", "draw_triangle", "ellipse", "fill_ellipse"}:
-            ctx.add_type_error(ReservedFunctionNameError(fun_def, fun_def.ast.lineno, fun_def.ast.col_offset))
-            return ctx
+            ctx.add_type_error(ReservedFunctionNameError(fun_def, fun_def.lineno, fun_def.col_offset))
+            if not ctx.recover_from_error():
+                return False
+            ctx.unchecked_functions.add(fun_name)
+            continue
 
         if fun_def.docstring is None:
             ctx.add_type_error(NoFunctionDocWarning(fun_def))
 
         if fun_def.returns is None:
-            ctx.add_type_error(MissingReturnTypeError(fun_def, fun_def.ast.lineno, fun_def.ast.col_offset))
-            return ctx
+            ctx.add_type_error(MissingReturnTypeError(fun_def, fun_def.lineno, fun_def.col_offset))
+            if not ctx.recover_from_error():
+                return False
+            ctx.unchecked_functions.add(fun_name)
+            continue
 
-        ok, fun_type_ast = fun_type_converter(fun_def)
+        ok, fun_type_ast = converted_fun_type(fun_def)
         if not ok:
-            ctx.add_type_error(TypeExprParseError(fun_def.ast.lineno, fun_def.ast.col_offset, fun_type_ast))
-            return ctx
+            ctx.add_type_error(TypeExprParseError(fun_def.lineno, fun_def.col_offset, fun_type_ast))
+            if not ctx.recover_from_error():
+                return False
+            ctx.unchecked_functions.add(fun_name)
+            continue
 
         fun_type, unknown_alias = fun_type_ast.unalias(ctx.type_defs)
         if fun_type is None:
-            ctx.add_type_error(UnknownTypeAliasError(fun_type_ast, unknown_alias, fun_def.ast.lineno, fun_def.ast.col_offset))
-            return ctx
+            ctx.add_type_error(UnknownTypeAliasError(fun_type_ast, unknown_alias, fun_def.lineno, fun_def.col_offset))
+            if not ctx.recover_from_error():
+                return False
+            ctx.unchecked_functions.add(fun_name)
         else:
             ctx.register_function(fun_name, fun_type, fun_def)
 
+    return True
+
+def type_check_function_bodies(prog, ctx, previous_ctx=None, jobs=1, incremental=False):
     # fourth step : type-check each function
+    check_keys = None
+    to_check = list(ctx.functions)
+    if incremental or previous_ctx is not None:
+        check_keys = function_check_keys(ctx, previous_ctx)
+        to_check = []
+        for fun_name in ctx.functions:
+            previous_check = None
+            if previous_ctx is not None:
+                previous_check = previous_ctx.function_checks.get(fun_name)
+            if previous_check is None or previous_check.key != check_keys[fun_name][0]:
+                to_check.append(fun_name)
+    changed = set(to_check)
+
+    parallel_checks = dict()
+    if jobs > 1:
+        jobs = parallel_checker.parallel_jobs(prog, to_check, jobs)
+    if jobs > 1:
+        # the bodies are checked independently, the results are merged below
+        # (in the sequential order)
+        parallel_checks = parallel_checker.check_functions_in_parallel(prog, ctx, to_check, jobs)
+
     for (fun_name, fun_def) in ctx.functions.items():
-        fun_def.type_check(ctx)
+        checkpoint = ctx.checkpoint() if ctx.recover else None
+        nb_errors = len(ctx.type_errors)
+
+        if fun_name not in changed:
+            # unchanged function (and dependencies): reuse the previous result
+            previous_check = previous_ctx.function_checks[fun_name]
+            for type_error in previous_check.type_errors:
+                ctx.add_type_error(type_error)
+            preconditions[fun_name] = previous_check.preconditions
+            ctx.function_checks[fun_name] = previous_check
+        elif fun_name in parallel_checks:
+            type_errors, fatal, fun_preconditions = parallel_checks[fun_name]
+            ctx.type_errors.extend(type_errors)
+            ctx.fatal_error = ctx.fatal_error or fatal
+            preconditions[fun_name] = fun_preconditions
+        else:
+            fun_def.type_check(ctx)
+
+        if check_keys is not None and fun_name in changed:
+            check_key, names = check_keys[fun_name]
+            ctx.function_checks[fun_name] = FunctionCheck(check_key, names, ctx.type_errors[nb_errors:]
+                                                          , preconditions.get(fun_name, []))
+
         if ctx.fatal_error:
-            return ctx
+            if not ctx.recover_from_error():
+                return False
+            ctx.restore(checkpoint)
+
+    return True
 
+def type_check_globals(prog, ctx):
     # fifth step: process each global variable definitions
     # (should not be usable from functions so it comes after)
     for global_var in prog.global_vars:
         global_var.type_check(ctx, global_scope=True)
-        if ctx.fatal_error:
-            return ctx
+        if ctx.fatal_error and not ctx.recover_from_error():
+            return False
+
+    return True
 
+def type_check_test_cases(prog, ctx):
     # sixth step: type-check test assertions
     for test_case in prog.test_cases:
         test_case.type_check(ctx)
-        if ctx.fatal_error:
-            return ctx
+        if ctx.fatal_error and not ctx.recover_from_error():
+            return False
 
-    return ctx
+    return True
 
-Program.type_check = type_check_Program
+class FunctionCheck:
+    """ The (reusable) result of type-checking the body of a function """
+    def __init__(self, key, names, type_errors, preconditions):
+        self.key = key
+        self.names = names # the (sorted) names in the definition
+        self.type_errors = type_errors
+        self.preconditions = preconditions
+
+def referenced_names(fun_def):
+    """ The names (and dotted names) that the function refers to: those
+        of its lowered body (cf. FunctionDef.names) and of its signature """
+    names = set(fun_def.names)
+    names.add(fun_def.name)
+    for annotation in fun_def.param_types + [ fun_def.returns ]:
+        if annotation is None:
+            continue
+        for node in ast.walk(annotation):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+            elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+                names.add(node.value.id + "." + node.attr)
+    return names
+
+def function_definition(fun_def, ctx, previous_check=None):
+    """ The definition of a function (its source text with its position)
+        and the sorted names it refers to (those of the previous check
+        if the definition is unchanged) """
+    source_lines = None
+    if ctx.prog.source:
+        if ctx.prog.source_lines is None:
+            ctx.prog.source_lines = ctx.prog.source.split('\n')
+        source_lines = ctx.prog.source_lines
+    if source_lines is not None and fun_def.end_lineno <= len(source_lines):
+        # the source text (with its position) is enough to identify the definition
+        fun_text = "\n".join(source_lines[fun_def.lineno-1:fun_def.end_lineno])
+        definition = (fun_def.lineno, fun_def.col_offset, fun_text)
+        if previous_check is not None and previous_check.key[0] == definition:
+            return (definition, previous_check.names)
+    else:
+        # (without its source, a definition is never reused)
+        definition = fun_def
+
+    return (definition, tuple(sorted(referenced_names(fun_def))))
+
+def function_check_keys(ctx, previous_ctx=None):
+    """ The check key of each function, with the names of its definition.
+        The key is what the type checking of a function depends on: its
+        definition (including the source positions), the types of the
+        names it refers to (signatures, imports, globals) and the type aliases """
+    global_vars = { global_var.target.var_name for global_var in ctx.prog.global_vars
+                    if isinstance(global_var, DeclareVar) and isinstance(global_var.target, LHSVar) }
+    type_defs = tuple((type_name, repr(type_def)) for (type_name, type_def) in sorted(ctx.type_defs.items()))
+
+    # the dependency on each name (None for the local names), shared by the functions
+    name_dependencies = dict()
+    def dependency(name):
+        if name not in name_dependencies:
+            name_dependencies[name] = None
+            if (name in ctx.global_env or name in ctx.local_env
+                or name in global_vars or name in ctx.unchecked_functions):
+                name_dependencies[name] = (name, repr(ctx.global_env.get(name)), repr(ctx.local_env.get(name))
+                                           , name in global_vars, name in ctx.unchecked_functions)
+        return name_dependencies[name]
+
+    check_keys = dict()
+    for (fun_name, fun_def) in ctx.functions.items():
+        previous_check = None
+        if previous_ctx is not None:
+            previous_check = previous_ctx.function_checks.get(fun_name)
+        definition, names = function_definition(fun_def, ctx, previous_check)
+        dependencies = tuple(dependency(name) for name in names if dependency(name) is not None)
+        check_keys[fun_name] = ((definition, dependencies, type_defs, ctx.recover), names)
+
+    return check_keys
 
 def type_check_FunctionDef(func_def, ctx):
     #Ici modifier : Func type converter
@@ -375,7 +664,7 @@ def type_check_FunctionDef(func_def, ctx):
         initCtxErrorsLen = len(ctx.type_errors)
         precondition_type = type_expect(ctx, precondition, BoolType(), False)
         if len(ctx.type_errors) != initCtxErrorsLen:
-            for i in range(len(ctx.type_errors)):
+            for i in range(initCtxErrorsLen, len(ctx.type_errors)):
                 #To delete the undefined var problem in preconditions
                 if(isinstance(ctx.type_errors[i],UnknownVariableError)):
                     poped = ctx.type_errors[i]
@@ -416,7 +705,7 @@ def type_check_FunctionDef(func_def, ctx):
         #we abort the type-checking of this function if a local var is declared multiple times
         if isinstance(instr, DeclareVar):
             if instr.target.var_name in local_vars:
-                ctx.add_type_error(DuplicateMultiAssignError(instr.ast.lineno, instr.target.var_name))
+                ctx.add_type_error(DuplicateMultiAssignError(instr.lineno, instr.target.var_name))
                 return ctx
             local_vars.add(instr.target.var_name)
 
@@ -444,35 +733,35 @@ def parse_var_name(declaration):
             if allow_colon:
                 return (vdecl, declaration[i:])
             else:
-                return (None, tr("Missing variable name before ':'"))
+                return (None, Message("Missing variable name before ':'"))
         elif not declaration[i].isspace():
             vdecl += declaration[i]
             allow_colon = True
         else: # a space character
             pass
 
-    return (None, tr("Missing ':' character before variable type declaration"))
+    return (None, Message("Missing ':' character before variable type declaration"))
 
 def fetch_assign_mypy_types(ctx, assign_target,annotation, strict=False):
 
-    lineno = assign_target.ast.lineno
+    lineno = assign_target.lineno
 
     var_name = assign_target.var_name
     ok, decl_type = type_converter(annotation)
     if not ok:
-        ctx.add_type_error(TypeExprParseError(lineno, assign_target.ast.col_offset, decl_type))
+        ctx.add_type_error(TypeExprParseError(lineno, assign_target.col_offset, decl_type))
         return None
 
     declared_types = dict()
 
     if var_name == "_":
-        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, tr("The special variable '_' cannot be declared")))
+        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, Message("The special variable '_' cannot be declared")))
         return None
 
     udecl_type, unknown_alias = decl_type.unalias(ctx.type_defs)
 
     if udecl_type is None:
-        ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, assign_target.ast.col_offset))
+        ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, assign_target.col_offset))
         return None
     else:
         declared_types[var_name] = udecl_type
@@ -480,7 +769,7 @@ def fetch_assign_mypy_types(ctx, assign_target,annotation, strict=False):
     return declared_types
 
 def fetch_assign_declared_mypy_types(ctx, assign_target, strict = False, only_warning=False):
-    lineno = assign_target.ast.lineno
+    lineno = assign_target.lineno
 
     vars = []
     if isinstance(assign_target, LHSTuple):
@@ -495,23 +784,23 @@ def fetch_assign_declared_mypy_types(ctx, assign_target, strict = False, only_wa
         if var_name not in ctx.declared_env:
             if var_name != "_" and strict:
                 if not only_warning:
-                    ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, tr("Missing variable declaration for variable: {}").format(var_name)))
+                    ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, Message("Missing variable declaration for variable: {}", var_name)))
                     return None
                 else: # only warning
-                    ctx.add_type_error(DeclarationWarning(ctx.function_def, assign_target, 'var-name', lineno, tr("Missing variable declaration for variable: {}").format(var_name)))
+                    ctx.add_type_error(DeclarationWarning(ctx.function_def, assign_target, 'var-name', lineno, Message("Missing variable declaration for variable: {}", var_name)))
                 continue
             else:
                 continue
 
         decl_type, idk = ctx.declared_env[var_name]
         if decl_type is None:
-            ctx.add_type_error(TypeExprParseError(lineno, assign_target.ast.col_offset, annotation.id))
+            ctx.add_type_error(TypeExprParseError(lineno, assign_target.col_offset, annotation.id))
             return None
 
         udecl_type, unknown_alias = decl_type.unalias(ctx.type_defs)
 
         if udecl_type is None:
-            ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, assign_target.ast.col_offset))
+            ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, assign_target.col_offset))
             return None
         else:
             declared_types[var_name] = udecl_type
@@ -520,22 +809,22 @@ def fetch_assign_declared_mypy_types(ctx, assign_target, strict = False, only_wa
 
 
 def fetch_declared_mypy_types(ctx, declaration_target, annotation, strict = False):
-    lineno = declaration_target.ast.lineno
+    lineno = declaration_target.lineno
     var_name = declaration_target.var_name
     ok, decl_type = type_converter(annotation)
     if not ok:
-        ctx.add_type_error(TypeExprParseError(lineno, declaration_target.ast.col_offset, decl_type))
+        ctx.add_type_error(TypeExprParseError(lineno, declaration_target.col_offset, decl_type))
         return None
 
     declared_types = dict()
     if var_name == "_":
-        ctx.add_type_error(DeclarationError(ctx.function_def, declaration_target, 'var-name', lineno, tr("The special variable '_' cannot be declared")))
+        ctx.add_type_error(DeclarationError(ctx.function_def, declaration_target, 'var-name', lineno, Message("The special variable '_' cannot be declared")))
         return None
 
     udecl_type, unknown_alias = decl_type.unalias(ctx.type_defs)
 
     if udecl_type is None:
-        ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, declaration_target.ast.col_offset))
+        ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, declaration_target.col_offset))
         return None
     else:
         declared_types[var_name] = udecl_type
@@ -544,19 +833,19 @@ def fetch_declared_mypy_types(ctx, declaration_target, annotation, strict = Fals
 
 
 def fetch_assign_declaration_types(ctx, assign_target, strict=False):
-    lineno = assign_target.ast.lineno - 1
+    lineno = assign_target.lineno - 1
 
     # the required variables (except underscore)
     req_vars = { v.var_name for v in assign_target.variables() if v.var_name != "_" }
     if not req_vars:  # if there is no required var, this means all vars are _'s
-        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, tr("The special variable '_' cannot be use alone")))
+        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, Message("The special variable '_' cannot be use alone")))
         return None
 
     declared_types = dict()
 
     var_name, decl_type, err_cat = parse_declaration_type(ctx, lineno)
     if var_name is None and strict:
-        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, err_cat, lineno if err_cat not in {"header-char"} else (lineno+1), tr(decl_type)))
+        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, err_cat, lineno if err_cat not in {"header-char"} else (lineno+1), decl_type))
         return None
 
     while var_name is not None:
@@ -566,29 +855,29 @@ def fetch_assign_declaration_types(ctx, assign_target, strict=False):
             return None
 
         if var_name == "_":
-            ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, tr("The special variable '_' cannot be declared")))
+            ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, Message("The special variable '_' cannot be declared")))
             return None
 
         if var_name not in req_vars: # if not a special var, it must be required
-            ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, tr("Unused variable name '{}' in declaration").format(var_name)))
+            ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'var-name', lineno, Message("Unused variable name '{}' in declaration", var_name)))
 
         else:
             req_vars.remove(var_name)
             udecl_type, unknown_alias = decl_type.unalias(ctx.type_defs)
             if udecl_type is None:
-                ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, assign_target.ast.col_offset))
+                ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, assign_target.col_offset))
                 return None
             else:
                 declared_types[var_name] = udecl_type
         lineno -= 1
         var_name, decl_type, err_cat = parse_declaration_type(ctx, lineno)
         if var_name is None and err_cat not in {'header-char', 'colon', 'noerror'} and strict:
-            ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, err_cat, lineno, tr(decl_type)))
+            ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, err_cat, lineno, decl_type))
             return None
 
 
     if strict and req_vars: # need all declarations in strict mode
-        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'unknown-vars', assign_target.ast.lineno, tr("Variable(s) not declared: {}").format(", ".join((v for v in req_vars)))))
+        ctx.add_type_error(DeclarationError(ctx.function_def, assign_target, 'unknown-vars', assign_target.lineno, Message("Variable(s) not declared: {}", ", ".join((v for v in req_vars)))))
         return None
 
     return declared_types
@@ -665,14 +954,14 @@ def type_check_DeclareVar(declareVar, ctx, global_scope = False):
     if strict:
         if working_var.var_name in declared_types:
             var_type = declared_types[working_var.var_name]
-            ctx.declared_env[working_var.var_name] = (var_type, { "lineno" : declareVar.ast.lineno
-                                                                  , "col_offset" : declareVar.ast.col_offset})
+            ctx.declared_env[working_var.var_name] = (var_type, { "lineno" : declareVar.lineno
+                                                                  , "col_offset" : declareVar.col_offset})
             return True
         else:
             return True #False
     else:
-        ctx.declared_env[working_var.var_name] = (working_type, { "lineno" : declareVar.ast.lineno
-                                                                  , "col_offset" : declareVar.ast.col_offset})
+        ctx.declared_env[working_var.var_name] = (working_type, { "lineno" : declareVar.lineno
+                                                                  , "col_offset" : declareVar.col_offset})
         return True
 
 DeclareVar.type_check = type_check_DeclareVar
@@ -681,7 +970,7 @@ def type_check_Assign(assign, ctx, global_scope = False):
     # first let's see if the variables are dead
     mono_assign = False # is this an actual assignment (and not an initialization ?)
     declaration = False # does the variable had already been declared?
-    lineno = assign.ast.lineno
+    lineno = assign.lineno
     for var in assign.target.variables():
 
         # check that the variable is not "dead"  (out of scope)
@@ -734,7 +1023,7 @@ def type_check_Assign(assign, ctx, global_scope = False):
     else: # no priori declaration
         if assign.target.arity() == 1:
             if not hasattr(assign, "type_annotation"):
-                ctx.add_type_error(DeclarationError(ctx.function_def, assign, 'missing', lineno, tr("Missing variable declaration for variable: {}").format(var.var_name)))
+                ctx.add_type_error(DeclarationError(ctx.function_def, assign, 'missing', lineno, Message("Missing variable declaration for variable: {}", var.var_name)))
                 return False
 
             declared_types = fetch_assign_mypy_types(ctx, assign.target,assign.type_annotation, True if assign.target.arity() == 1 else False)
@@ -814,14 +1103,15 @@ def type_check_For(for_node, ctx):
        or isinstance(iter_type, StrType) \
        or isinstance(iter_type, DictType):
 
-        if isinstance(iter_type, DictType):
-            # XXX: it's a hack but it is worth it ...
-            iter_type.elem_type = iter_type.key_type
-
         ctx.push_parent(for_node)
 
         # === do like in Assign ===
-        expr_type = iter_type.elem_type if not isinstance(iter_type, StrType) else StrType()
+        if isinstance(iter_type, StrType):
+            expr_type = StrType()
+        elif isinstance(iter_type, DictType):
+            expr_type = iter_type.key_type
+        else:
+            expr_type = iter_type.elem_type
         # treat the simpler "mono-var" case first
         strict = False
         if for_node.target.arity() == 1:
@@ -850,7 +1140,7 @@ For.type_check = type_check_For
 
 
 def fetch_iter_declaration_type(ctx, iter_node):
-    lineno = iter_node.ast.lineno - 1
+    lineno = iter_node.lineno - 1
 
     var_name, decl_type, err_cat = parse_declaration_type(ctx, lineno)
     if var_name is None:
@@ -858,12 +1148,12 @@ def fetch_iter_declaration_type(ctx, iter_node):
         return None
 
     if var_name != iter_node.var_name:
-        ctx.add_type_error(DeclarationError(ctx.function_def, iter_node, 'var-name', lineno, tr("Wrong variable name in declaration, it should be '{}'").format(iter_node.var_name)))
+        ctx.add_type_error(DeclarationError(ctx.function_def, iter_node, 'var-name', lineno, Message("Wrong variable name in declaration, it should be '{}'", iter_node.var_name)))
         return None
 
     udecl_type = decl_type.unalias(ctx.type_defs)
     if udecl_type is None:
-        ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, iter_node.ast.col_offset))
+        ctx.add_type_error(UnknownTypeAliasError(decl_type, unknown_alias, lineno, iter_node.col_offset))
         return None
     else:
         return udecl_type
@@ -1139,13 +1429,13 @@ def type_infer_EAdd(expr, ctx):
 
         if not isinstance(right_type, ListType):
             ctx.add_type_error(TypeComparisonError(ctx.function_def, left_type, expr.right, right_type,
-                                                   tr("Expecting a list")))
+                                                   Message("Expecting a list")))
             return None
 
 
         if left_type.elem_type is not None and right_type.elem_type is not None and left_type.elem_type != right_type.elem_type:
             ctx.add_type_error(TypeComparisonError(ctx.function_def, left_type.elem_type, expr.right, right_type.elem_type,
-                                                   tr("Expecting a list with elements of type: {}").format(left_type.elem_type)))
+                                                   Message("Expecting a list with elements of type: {}", left_type.elem_type)))
             return None
 
         if left_type.elem_type is None and right_type.elem_type is not None:
@@ -1155,7 +1445,7 @@ def type_infer_EAdd(expr, ctx):
 
     else:
         ctx.add_type_error(TypeComparisonError(ctx.function_def, ListType(), expr.left, left_type,
-                                               tr("Expecting a list")))
+                                               Message("Expecting a list")))
         return None
 
 EAdd.type_infer = type_infer_EAdd
@@ -1173,7 +1463,7 @@ def type_infer_ESub(expr, ctx):
             return None
 
         if not isinstance(right_type, SetType):
-            ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.right, right_type, tr("Expecting a set")))
+            ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.right, right_type, Message("Expecting a set")))
             return None
 
         if left_type.is_emptyset():
@@ -1327,7 +1617,7 @@ def type_infer_EBitOr(expr, ctx):
         return None
 
     if not isinstance(left_type, SetType):
-        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.left, left_type, tr("Expecting a set")))
+        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.left, left_type, Message("Expecting a set")))
         return None
 
     right_type = expr.right.type_infer(ctx)
@@ -1335,7 +1625,7 @@ def type_infer_EBitOr(expr, ctx):
         return None
 
     if not isinstance(right_type, SetType):
-        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.right, right_type, tr("Expecting a set")))
+        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.right, right_type, Message("Expecting a set")))
         return None
 
     if left_type.is_emptyset():
@@ -1358,7 +1648,7 @@ def type_infer_EBitAnd(expr, ctx):
         return None
 
     if not isinstance(left_type, SetType):
-        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.left, left_type, tr("Expecting a set")))
+        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.left, left_type, Message("Expecting a set")))
         return None
 
     right_type = expr.right.type_infer(ctx)
@@ -1366,7 +1656,7 @@ def type_infer_EBitAnd(expr, ctx):
         return None
 
     if not isinstance(right_type, SetType):
-        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.right, right_type, tr("Expecting a set")))
+        ctx.add_type_error(TypeExpectationError(ctx.function_def, expr.right, right_type, Message("Expecting a set")))
         return None
 
     if left_type.is_emptyset():
@@ -1399,7 +1689,11 @@ def type_infer_EVar(var, ctx):
 
     # or maybe the variable is a global function (HOF)
     if var.name in ctx.global_env:
-        return ctx.global_env[var.name]
+        signature = ctx.global_env[var.name]
+        # (an overloaded function is passed with its first signature)
+        return signature[0] if isinstance(signature, list) else signature
+    if var.name in ctx.unchecked_functions:
+        return None # broken signature (already reported)
 
     # or, is it a global variable ?
     for global_var in ctx.prog.global_vars:
@@ -1499,7 +1793,10 @@ def type_infer_ECall(call, ctx):
         hof_call = False
         signature = ctx.global_env[call.full_fun_name]
         arguments = call.arguments
-    elif "." + call.fun_name in { ".append", ".readlines", ".read", ".write", ".add", ".remove", ".items", ".keys" }: #XXX: needed ? and not call.multi_receivers:
+    elif call.full_fun_name in ctx.unchecked_functions:
+        # the signature is broken (already reported)
+        return None
+    elif "." + call.fun_name in ctx.global_env: # a method (cf. the stubs) XXX: and not call.multi_receivers ?
         method_call = True
         hof_call = False
         signature = ctx.global_env["." + call.fun_name]
@@ -1517,12 +1814,17 @@ def type_infer_ECall(call, ctx):
         ctx.add_type_error(UnknownFunctionError(ctx.function_def, call))
         return None
 
+    if isinstance(signature, list):
+        # an overloaded function (cf. the stubs)
+        signature = select_signature(call, ctx, signature, arguments, method_call)
+        if signature is None:
+            return None
+
     # step 1bis : we rename the type parameters to avoid any nameclash
-    rename_map = {}
-    if not hof_call:
-        signature = signature.rename_type_variables(rename_map)
-    #print("rename_map = {}".format(rename_map))
-    #print(repr(signature))
+    if hof_call:
+        check_arity = generic = True
+    else:
+        signature, check_arity, generic = renamed_signature(ctx, signature)
 
     # step 1ter : check that signature *is* a function signature
     if not isinstance(signature, FunctionType):
@@ -1530,15 +1832,19 @@ def type_infer_ECall(call, ctx):
         return None
 
     # step 2 : check the call arity (only if TypeAnything is not present)
-    check_arity = True
-    for param_type in signature.param_types:
-        if isinstance(param_type, Anything):
-            check_arity = False
+    if hof_call:
+        for param_type in signature.param_types:
+            if isinstance(param_type, Anything):
+                check_arity = False
 
     if check_arity and (len(signature.param_types) != len(arguments)):
         ctx.add_type_error(CallArityError(method_call, signature.param_types, arguments, call))
         return None
 
+    if not generic:
+        # no type variable to bind
+        return check_call_arguments(call, ctx, signature, arguments)
+
     # step 3 : check the argument types
     num_arg = 1
     ctx.call_type_env.append(dict())  # the type environment for calls (for generic functions)
@@ -1556,6 +1862,7 @@ def type_infer_ECall(call, ctx):
                 arg_type = arg.type_infer(ctx)
                 if arg_type is None:
                     # XXX: add an error ?
+                    ctx.call_type_env.pop()
                     return None
 
                 ctx.call_type_env[-1][param_type.var_name] = arg_type
@@ -1576,6 +1883,18 @@ def type_infer_ECall(call, ctx):
 
     ctx.call_type_env.pop()
 
+    return check_call_result(call, ctx, nret_type)
+
+def check_call_arguments(call, ctx, signature, arguments):
+    """ The argument checking of type_infer_ECall, for the
+        signatures without type variable """
+    for (arg, param_type) in zip(arguments, signature.param_types):
+        if type_expect(ctx, arg, param_type) is None:
+            return None
+
+    return check_call_result(call, ctx, signature.ret_type)
+
+def check_call_result(call, ctx, nret_type):
     # check if there is an unhashable set or dict
     unhashable = nret_type.fetch_unhashable()
     if unhashable is not None:
@@ -1594,6 +1913,45 @@ def type_infer_ECall(call, ctx):
 
 ECall.type_infer = type_infer_ECall
 
+def select_signature(call, ctx, signatures, arguments, method_call):
+    """ The signature of an overloaded function for the call: the first
+        one with the number of arguments of the call and (for a method)
+        the type of its receiver, None if the receiver is ill-typed """
+    candidates = [ signature for signature in signatures if len(signature.param_types) == len(arguments) ]
+    if not candidates:
+        # (the arity error is reported on the closest signature)
+        return min(signatures, key=lambda signature: abs(len(signature.param_types) - len(arguments)))
+    if len(candidates) == 1 or not method_call:
+        return candidates[0]
+
+    receiver_type = call.receiver.type_infer(ctx)
+    if receiver_type is None:
+        return None
+    for signature in candidates:
+        if type(signature.param_types[0]) is type(receiver_type):
+            return signature
+    # (the receiver error is reported on the first candidate)
+    return candidates[0]
+
+def renamed_signature(ctx, signature):
+    """ Returns the signature with its type variables renamed (as _1, _2, ...),
+        whether the arity of its calls must be checked (no parameter of type
+        Anything) and whether it is generic.
+        The renaming only depends on the signature, so it is done once per
+        check (the renamed signatures of the context are indexed by the
+        identity of the canonical signatures) """
+    canonical = signature.canonical
+    entry = ctx.renamed_signatures.get(id(canonical))
+    if entry is None or entry[0] is not canonical:
+        rename_map = {}
+        renamed = canonical.rename_type_variables(rename_map)
+        check_arity = not (isinstance(renamed, FunctionType)
+                           and any(isinstance(param_type, Anything) for param_type in renamed.param_types))
+        entry = (canonical, renamed, check_arity, len(rename_map) > 0)
+        ctx.renamed_signatures[id(canonical)] = entry
+
+    return entry[1:]
+
 
 def type_infer_ERange(erange, ctx):
     if erange.start is None and erange.stop is None:
@@ -1700,6 +2058,10 @@ def type_infer_ETuple(tup, ctx):
         ctx.add_type_error(EmptyTupleError(tup))
         return None
 
+    shape = literal_shape(tup) if len(tup.elements) >= LITERAL_SHAPE_MIN_SIZE else None
+    if shape is not None:
+        return literal_shape_type(shape)
+
     element_types = []
     for element in tup.elements:
         element_type = element.type_infer(ctx)
@@ -1711,11 +2073,108 @@ def type_infer_ETuple(tup, ctx):
 
 ETuple.type_infer = type_infer_ETuple
 
+# The (large) literals of constants are typed from the shapes of their
+# elements: 'int', 'float', 'str', 'bool' or the tuples ('tuple', runs)
+# and ('list', shape), without inferring the type of each element.
+# The runs of a tuple are the (shape, count) of its consecutive elements
+# of the same shape, so that a large tuple has a small shape.
+# The elements of a small literal are inferred as fast as their shapes
+# (which are then often tried again and again in the nested literals).
+
+LITERAL_SHAPE_MIN_SIZE = 16
+
+def literal_shape(expr):
+    """ The shape of a constant literal, or None if it is not a constant """
+    expr_class = expr.__class__
+    if expr_class is EStr:
+        return 'str'
+    elif expr_class is ENum:
+        if isinstance(expr.value, int):
+            return 'int'
+        elif isinstance(expr.value, float):
+            return 'float'
+        return None # reported by the type inference
+    elif expr_class is ETrue or expr_class is EFalse:
+        return 'bool'
+    elif expr_class is ETuple:
+        if not expr.elements:
+            return None # reported by the type inference
+        runs = []
+        run_shape = None
+        count = 0
+        for element in expr.elements:
+            shape = literal_shape(element)
+            if shape is None:
+                return None
+            if shape is run_shape or shape == run_shape:
+                count += 1
+            else:
+                if count > 0:
+                    runs.append((run_shape, count))
+                run_shape = shape
+                count = 1
+        runs.append((run_shape, count))
+        return ('tuple', tuple(runs))
+    elif expr_class is EList:
+        shape = literal_elements_shape(expr.elements)
+        return None if shape is None else ('list', shape)
+
+    return None
+
+def literal_elements_shape(elements):
+    """ The common shape of constant elements (a float
+        if they are numbers, one of them being a float), or None """
+    common_shape = None
+    for element in elements:
+        shape = literal_shape(element)
+        if shape is None:
+            return None
+        if shape is not common_shape and shape != common_shape:
+            if common_shape is None:
+                common_shape = shape
+            elif (common_shape == 'int' and shape == 'float') \
+                 or (common_shape == 'float' and shape == 'int'):
+                common_shape = 'float'
+            else:
+                return None
+
+    return common_shape
+
+LITERAL_SHAPE_TYPES = { 'int' : IntType, 'float' : FloatType, 'str' : StrType, 'bool' : BoolType }
+
+def literal_shape_type(shape):
+    if shape[0] == 'tuple':
+        elem_types = []
+        for (elem_shape, count) in shape[1]:
+            # (the types are not modified, the elements of a run share theirs)
+            elem_types.extend([ literal_shape_type(elem_shape) ] * count)
+        return TupleType(elem_types)
+    elif shape[0] == 'list':
+        return ListType(literal_shape_type(shape[1]))
+    return LITERAL_SHAPE_TYPES[shape]()
+
+def literal_elements_type(elements, hashable=False):
+    """ The common type of the elements if they are (many) constants, or None
+        (the type of the elements must then be inferred one by one) """
+    if len(elements) < LITERAL_SHAPE_MIN_SIZE:
+        return None
+    shape = literal_elements_shape(elements)
+    if shape is None:
+        return None
+    elements_type = literal_shape_type(shape)
+    if hashable and not elements_type.is_hashable():
+        return None
+    return elements_type
+
 def type_infer_EList(lst, ctx):
     lst_type = None
     if not lst.elements:
         return ListType()
 
+    lst_type = literal_elements_type(lst.elements)
+    if lst_type is not None:
+        return ListType(lst_type)
+
     for element in lst.elements:
         element_type = element.type_infer(ctx)
         if element_type is None:
@@ -1843,7 +2302,7 @@ def type_infer_EComp(ecomp, ctx):
             # else: # tuple destruct
             #     if not isinstance(iter_elem_type, TupleType):
             #         ctx.add_type_error(TypeExpectationError(ctx.function_def, generator.iter, iter_elem_type,
-            #                                                 tr("Expecting an iterator of tuples")))
+            #                                                 Message("Expecting an iterator of tuples")))
             #         ctx.pop_parent()
             #         return None
 
@@ -1934,6 +2393,10 @@ def type_infer_ESet(st, ctx):
     if not st.elements:
         return SetType()
 
+    st_type = literal_elements_type(st.elements, hashable=True)
+    if st_type is not None:
+        return SetType(st_type)
+
     for element in st.elements:
         element_type = element.type_infer(ctx)
         if element_type is None:
@@ -1965,45 +2428,46 @@ def type_infer_EDict(edict, ctx):
         return DictType()
 
     # key type
-    edict_key_type = None
-    for key in edict.keys:
-        key_type = key.type_infer(ctx)
-        if key_type is None:
-            return None
+    edict_key_type = literal_elements_type(edict.keys, hashable=True)
+    if edict_key_type is None:
+        for key in edict.keys:
+            key_type = key.type_infer(ctx)
+            if key_type is None:
+                return None
 
-        if not key_type.is_hashable():
-            ctx.add_type_error(UnhashableKeyError(edict, key, key_type))
-            return None
+            if not key_type.is_hashable():
+                ctx.add_type_error(UnhashableKeyError(edict, key, key_type))
+                return None
 
-        if edict_key_type is None:
-            edict_key_type = key_type
-        else:
-            if (isinstance(edict_key_type, (IntType, FloatType, NumberType))
-                and isinstance(key_type, (IntType, FloatType, NumberType))):
-                edict_key_type = infer_number_type(ctx, edict_key_type, key_type)
+            if edict_key_type is None:
+                edict_key_type = key_type
             else:
-                if not edict_key_type.type_compare(ctx, key, key_type, raise_error=False):
-                    ctx.add_type_error(HeterogeneousElementError('set', edict, edict_key_type, key_type, key))
-                    return None
+                if (isinstance(edict_key_type, (IntType, FloatType, NumberType))
+                    and isinstance(key_type, (IntType, FloatType, NumberType))):
+                    edict_key_type = infer_number_type(ctx, edict_key_type, key_type)
+                else:
+                    if not edict_key_type.type_compare(ctx, key, key_type, raise_error=False):
+                        ctx.add_type_error(HeterogeneousElementError('set', edict, edict_key_type, key_type, key))
+                        return None
 
     # value type
-    edict_val_type = None
-
-    for val in edict.values:
-        val_type = val.type_infer(ctx)
-        if val_type is None:
-            return None
+    edict_val_type = literal_elements_type(edict.values)
+    if edict_val_type is None:
+        for val in edict.values:
+            val_type = val.type_infer(ctx)
+            if val_type is None:
+                return None
 
-        if edict_val_type is None:
-            edict_val_type = val_type
-        else:
-            if (isinstance(edict_val_type, (IntType, FloatType, NumberType))
-                and isinstance(val_type, (IntType, FloatType, NumberType))):
-                edict_val_type = infer_number_type(ctx, edict_val_type, val_type)
+            if edict_val_type is None:
+                edict_val_type = val_type
             else:
-                if not edict_val_type.type_compare(ctx, val, val_type, raise_error=False):
-                    ctx.add_type_error(HeterogeneousElementError('dictionary', edict, edict_val_type, val_type, key))
-                    return None
+                if (isinstance(edict_val_type, (IntType, FloatType, NumberType))
+                    and isinstance(val_type, (IntType, FloatType, NumberType))):
+                    edict_val_type = infer_number_type(ctx, edict_val_type, val_type)
+                else:
+                    if not edict_val_type.type_compare(ctx, val, val_type, raise_error=False):
+                        ctx.add_type_error(HeterogeneousElementError('dictionary', edict, edict_val_type, val_type, val))
+                        return None
 
     return DictType(edict_key_type, edict_val_type)
 
@@ -2019,7 +2483,7 @@ def type_expect(ctx, expr, expected_type, raise_error=True):
         return None
     #print("[type_expect] expected_type={}".format(expected_type))
     if not expected_type.type_compare(ctx, expr, expr_type, raise_error):
-        #ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Mismatch type '{}' expecting: {} ").format(expr_type, expected_type)))
+        #ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Mismatch type '{}' expecting: {} ", expr_type, expected_type)))
         return None
     return expr_type
 
@@ -2032,7 +2496,7 @@ Anything.type_compare = type_compare_Anything
 def type_compare_FunctionType(expected_type, ctx, expr, expr_type, raise_error=True):
     if not isinstance(expr_type, FunctionType):
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a Function")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a Function")))
 
         return False
 
@@ -2040,19 +2504,19 @@ def type_compare_FunctionType(expected_type, ctx, expr, expr_type, raise_error=T
     expr_param_types = expr_type.param_types
     if len(expected_param_types) != len(expr_param_types):
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Wrong arity")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Wrong arity")))
         return False
 
 
     for (expected_param_type, expr_param_type) in zip(expected_param_types, expr_param_types):
         if not expected_param_type.type_compare(ctx, expr, expr_param_type, raise_error):
             if raise_error:
-                ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Error for function parameter")))
+                ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Error for function parameter")))
             return False
 
     if not expected_type.ret_type.type_compare(ctx, expr, expr_type.ret_type, raise_error):
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Error for function return type")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Error for function return type")))
         return False
 
     return True
@@ -2081,7 +2545,7 @@ def type_compare_NumberType(expected_type, ctx, expr, expr_type, raise_error=Tru
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a Number")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a Number")))
 
     return False
 
@@ -2096,12 +2560,12 @@ def type_compare_IntType(expected_type, ctx, expr, expr_type, raise_error=True):
 
     if isinstance(expr_type, NumberType):
         if raise_error:
-            ctx.add_type_error(TypeImprecisionWarning(ctx.function_def, expected_type, expr, expr_type, tr("Expecting an int")))
+            ctx.add_type_error(TypeImprecisionWarning(ctx.function_def, expected_type, expr, expr_type, Message("Expecting an int")))
         # the comparision is imprecise, but there's no failure
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting an int")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting an int")))
 
     return False
 
@@ -2115,7 +2579,7 @@ def type_compare_FloatType(expected_type, ctx, expr, expr_type, raise_error=True
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a float")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a float")))
 
     return False
 
@@ -2129,7 +2593,7 @@ def type_compare_BoolType(expected_type, ctx, expr, expr_type, raise_error=True)
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a Bool (type bool)")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a Bool (type bool)")))
 
     return False
 
@@ -2140,7 +2604,7 @@ def type_compare_FileType(expected_type, ctx, expr, expr_type, raise_error=True)
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a File")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a File")))
 
     return False
 
@@ -2154,7 +2618,7 @@ def type_compare_ImageType(expected_type, ctx, expr, expr_type, raise_error=True
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting an image (type Image)")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting an image (type Image)")))
 
     return False
 
@@ -2168,7 +2632,7 @@ def type_compare_StrType(expected_type, ctx, expr, expr_type, raise_error=True):
         return True
 
     if raise_error:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a string (type str)")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a string (type str)")))
 
     return False
 
@@ -2180,7 +2644,7 @@ def type_compare_ListType(expected_type, ctx, expr, expr_type, raise_error=True)
 
     if not isinstance(expr_type, ListType):
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a list")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a list")))
         return False
 
     if expr_type.is_emptylist():
@@ -2199,7 +2663,7 @@ def type_compare_SetType(expected_type, ctx, expr, expr_type, raise_error=True):
 
     if not isinstance(expr_type, SetType):
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a set")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a set")))
         return False
 
     if expr_type.is_emptyset():
@@ -2236,7 +2700,7 @@ def type_compare_IterableType(expected_type, ctx, expr, expr_type, raise_error=T
         return expected_type.elem_type.type_compare(ctx, expr, expr_type.key_type, raise_error)
     else:
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting an Iterable (Sequence, list, string, set or dictionnary)")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting an Iterable (Sequence, list, string, set or dictionnary)")))
         return False
 
 IterableType.type_compare = type_compare_IterableType
@@ -2255,7 +2719,7 @@ def type_compare_SequenceType(expected_type, ctx, expr, expr_type, raise_error=T
 
     else:
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a Sequence (list or string)")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a Sequence (list or string)")))
         return False
 
 SequenceType.type_compare = type_compare_SequenceType
@@ -2276,7 +2740,7 @@ def type_compare_TypeVariable(expected_type, ctx, expr, expr_type, raise_error=T
 
             if not isinstance(real_expected_type, TypeVariable):
                 if not real_expected_type.type_compare(ctx, expr, expr_type, raise_error=False):
-                    ctx.add_type_error(TypeComparisonError(ctx.function_def, real_expected_type, expr, expr_type, tr("Type mismatch for parameter #{} in call, expecting {} found: {}").format(expected_type.var_name[1:],real_expected_type, expr_type)))
+                    ctx.add_type_error(TypeComparisonError(ctx.function_def, real_expected_type, expr, expr_type, Message("Type mismatch for parameter #{} in call, expecting {} found: {}", expected_type.var_name[1:],real_expected_type, expr_type)))
                     return False
                 else:
                     return True
@@ -2286,7 +2750,7 @@ def type_compare_TypeVariable(expected_type, ctx, expr, expr_type, raise_error=T
                 return True
             # not equal
             if raise_error:
-                ctx.add_type_error(TypeComparisonError(ctx.function_def, real_expected_type, expr, expr_type, tr("Type mismatch for parameter #{} in call, expecting {} found: {}").format(expected_type.var_name[1:],real_expected_type, expr_type)))
+                ctx.add_type_error(TypeComparisonError(ctx.function_def, real_expected_type, expr, expr_type, Message("Type mismatch for parameter #{} in call, expecting {} found: {}", expected_type.var_name[1:],real_expected_type, expr_type)))
             return False
 
         else: # register type as type parameter:
@@ -2298,7 +2762,7 @@ def type_compare_TypeVariable(expected_type, ctx, expr, expr_type, raise_error=T
         return True
         
         # if raise_error:
-        #     ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Type mismatch for parameter #{} in call, expecting {} found: {}").format(expected_type.var_name[1:], expected_type, expr_type)))
+        #     ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Type mismatch for parameter #{} in call, expecting {} found: {}", expected_type.var_name[1:], expected_type, expr_type)))
         # return False
 
 TypeVariable.type_compare = type_compare_TypeVariable
@@ -2309,7 +2773,7 @@ def type_compare_NoneTypeType(expected_type, ctx, expr, expr_type, raise_error=T
 
     if not isinstance(expr_type, NoneTypeType):
         if raise_error:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting value None")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting value None")))
         return False
 
     return True
@@ -2322,7 +2786,7 @@ def type_compare_OptionType(expected_type, ctx, expr, expr_type, raise_error=Tru
     if isinstance(expr_type, OptionType):
         val_type = expected_type.elem_type.type_compare(ctx, expr, expr_type.elem_type, raise_error=False)
         if not val_type:
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type.elem_type, expr, expr_type.elem_type, tr("Expecting value of type: {}").format(expected_type)))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type.elem_type, expr, expr_type.elem_type, Message("Expecting value of type: {}", expected_type)))
             return False
         else:
             return True
@@ -2334,7 +2798,7 @@ def type_compare_OptionType(expected_type, ctx, expr, expr_type, raise_error=Tru
 
     val_type = expected_type.elem_type.type_compare(ctx, expr, expr_type, raise_error=False)
     if not val_type:
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting value None or of type: {}").format(expected_type.elem_type)))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting value None or of type: {}", expected_type.elem_type)))
         return False
 
     return True
@@ -2346,11 +2810,11 @@ def type_compare_TupleType(expected_type, ctx, expr, expr_type, raise_error=True
         return check_option_type(type_compare_TupleType, expected_type, ctx, expr, expr_type, raise_error)
 
     if not isinstance(expr_type, TupleType):
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a tuple")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a tuple")))
         return False
 
     if len(expr_type.elem_types) != len(expected_type.elem_types):
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a tuple of size '{}' but found: {}").format(len(expected_type.elem_types)
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a tuple of size '{}' but found: {}", len(expected_type.elem_types)
                                                                                                                                                            , len(expr_type.elem_types))))
         return False
 
@@ -2367,7 +2831,7 @@ def type_compare_DictType(expected_type, ctx, expr, expr_type, raise_error=True)
         return check_option_type(type_compare_DictType, expected_type, ctx, expr, expr_type, raise_error)
 
     if not isinstance(expr_type, DictType):
-        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting a dictionary")))
+        ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting a dictionary")))
         return False
 
     if expr_type.is_emptydict():
@@ -2375,7 +2839,7 @@ def type_compare_DictType(expected_type, ctx, expr, expr_type, raise_error=True)
 
     if expected_type.is_emptydict():
         if not expr_type.is_emptydict():
-            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, tr("Expecting an empty dictionary")))
+            ctx.add_type_error(TypeComparisonError(ctx.function_def, expected_type, expr, expr_type, Message("Expecting an empty dictionary")))
             return False
         else: # both empty
             return True
@@ -2390,81 +2854,47 @@ def type_compare_DictType(expected_type, ctx, expr, expr_type, raise_error=True)
 
 DictType.type_compare = type_compare_DictType
 
+# the successful comparisons between pure types, indexed by the
+# identities of the canonical types (which are kept in the entries),
+# emptied when it is full
+TYPE_COMPARE_MEMO = dict()
+TYPE_COMPARE_MEMO_SIZE = 4096
+
+def memoize_type_compare(type_compare):
+    """ Only the successful comparisons between pure types are memoized:
+        they do not depend on the context and report nothing.
+        Most of the inferred types are compared once, and interning them would
+        cost more than comparing them: the types are only interned (and the
+        memo used) from their second comparison on """
+    def memo_type_compare(expected_type, ctx, expr, expr_type, raise_error=True):
+        key = None
+        if isinstance(expr_type, TypeAST) and expr_type.compared_again() and expected_type.compared_again() \
+           and expected_type.pure and expr_type.pure:
+            if expected_type.canonical is expr_type.canonical:
+                return True
+            key = (id(expected_type.canonical), id(expr_type.canonical))
+            if key in TYPE_COMPARE_MEMO:
+                return True
+
+        ok = type_compare(expected_type, ctx, expr, expr_type, raise_error)
+        if ok and key is not None:
+            if len(TYPE_COMPARE_MEMO) >= TYPE_COMPARE_MEMO_SIZE:
+                TYPE_COMPARE_MEMO.clear()
+            TYPE_COMPARE_MEMO[key] = (expected_type.canonical, expr_type.canonical)
+        return ok
+
+    return memo_type_compare
+
+for type_class in (FunctionType, ListType, SetType, IterableType, SequenceType, OptionType, TupleType, DictType):
+    type_class.type_compare = memoize_type_compare(type_class.type_compare)
+
 ######################################
 # Standard imports                   #
 ######################################
 
-BUILTINS_IMPORTS = {
-    'len' : FunctionType([IterableType(TypeVariable('α'))], IntType())
-    ,'abs' : FunctionType([FloatType()], FloatType())
-    ,'print' : FunctionType([Anything()], NoneTypeType())
-    ,'min' : FunctionType([FloatType(), FloatType()], FloatType())
-    ,'max' : FunctionType([FloatType(), FloatType()], FloatType())
-    # ,'range' : function_type_parser("int * int -> Iterable[int]").content  # range is an expression now
-    , 'int' : FunctionType([Anything()], IntType())
-    , 'float' : FunctionType([Anything()], FloatType())
-    , 'str' : FunctionType([Anything()], StrType())
-    , 'ord' : FunctionType([StrType()], IntType())
-    , 'chr' : FunctionType([IntType()], StrType())
-    , 'round' : FunctionType([NumberType()], IntType())
-    , '.append' : FunctionType([ListType(TypeVariable('α')),TypeVariable('α')], NoneTypeType())
-    # images   ... TODO: the type system is not precise enough (for now)
-    , 'draw_line' :  FunctionType([FloatType(), FloatType(), FloatType(), FloatType(), Anything()], ImageType())
-    , 'overlay' : FunctionType([ImageType(), ImageType(), Anything()], ImageType())
-    , 'underlay' : FunctionType([ImageType(), ImageType(), Anything()], ImageType())
-    , 'fill_triangle' : FunctionType([FloatType(), FloatType(), FloatType(), FloatType(), FloatType(),FloatType(), Anything()], ImageType())
-    , 'draw_triangle' : FunctionType([FloatType(), FloatType(), FloatType(), FloatType(), FloatType(),FloatType(), Anything()], ImageType())
-    , 'draw_ellipse' : FunctionType([FloatType(), FloatType(), FloatType(), FloatType(), Anything()], ImageType())
-    , 'fill_ellipse' : FunctionType([FloatType(), FloatType(), FloatType(), FloatType(), Anything()], ImageType())
-    , 'show_image' : FunctionType([ImageType()], NoneTypeType())
-    # fichiers
-    , 'open' : FunctionType([StrType(),StrType()], FileType())
-    , '.readlines' : FunctionType([FileType()], ListType(StrType()))
-    , '.read' : FunctionType([FileType()], StrType())
-    , '.write' : FunctionType([FileType(),StrType()], NoneTypeType())
-    # ensembles
-    , 'set' : FunctionType([], SetType())
-    , '.add' : FunctionType([SetType(TypeVariable('α')),TypeVariable('α')], NoneTypeType())
-    , '.remove' : FunctionType([SetType(TypeVariable('α')),TypeVariable('α')], NoneTypeType())
-    # dictionnaires
-    , 'dict' : FunctionType([], DictType())
-    , '.items' : FunctionType([DictType(key_type = TypeVariable('α'),val_type = TypeVariable('β'))], IterableType(TupleType([TypeVariable('α'),TypeVariable('β')])))
-    , '.keys' : FunctionType([DictType(TypeVariable('α'),TypeVariable('β'))], SetType(TypeVariable('α')))
-    # iterables
-    , 'zip' :  FunctionType([IterableType(TypeVariable('α')),IterableType(TypeVariable('β'))], IterableType(TupleType([TypeVariable('α'),TypeVariable('β')])))
-}
-
-MATH_IMPORTS = {
-    'math.sqrt' : FunctionType([FloatType()], FloatType())
-    , 'math.floor' : FunctionType([FloatType()], IntType())
-    , 'math.ceil' : FunctionType([FloatType()], IntType())
-    , 'math.sin' : FunctionType([FloatType()], FloatType())
-    , 'math.cos' : FunctionType([FloatType()], FloatType())
-    , 'math.tan' : FunctionType([FloatType()], FloatType())
-    , 'math.cosh' : FunctionType([FloatType()], FloatType())
-    , 'math.sinh' : FunctionType([FloatType()], FloatType())
-    , 'math.tanh' : FunctionType([FloatType()], FloatType())
-    , 'math.acos' : FunctionType([FloatType()], FloatType())
-    , 'math.asin' : FunctionType([FloatType()], FloatType())
-    , 'math.atan' : FunctionType([FloatType()], FloatType())
-    , 'math.acosh' : FunctionType([FloatType()], FloatType())
-    , 'math.asinh' : FunctionType([FloatType()], FloatType())
-    , 'math.atanh' : FunctionType([FloatType()], FloatType())
-    , 'math.factorial' : FunctionType([IntType()], IntType())
-    , 'math.log' : FunctionType([FloatType()], FloatType())
-    }
-
-
-RANDOM_IMPORTS = {
-    'random.random' : FunctionType([], FloatType())
-    , 'random.seed' : FunctionType([IntType()], NoneTypeType())
-}
-
-REGISTERED_IMPORTS = {
-    '' : BUILTINS_IMPORTS
-    , 'math' : MATH_IMPORTS
-    , 'random' : RANDOM_IMPORTS
-}
+# the signatures of the builtins ('') and of the supported modules
+# (cf. the stubs directory)
+REGISTERED_IMPORTS = StubRegistry()
 
 
 ## All the possible kinds of error follow
@@ -2475,17 +2905,50 @@ class UnsupportedImportError(TypeError):
         self.import_ast = import_ast
 
     def fail_string(self):
-        return "UnsupportedImportError[{}]@{}:{}".format(self.import_name, self.import_ast.ast.lineno, self.import_ast.ast.col_offset)
+        return "UnsupportedImportError[{}]@{}:{}".format(self.import_name, self.import_ast.lineno, self.import_ast.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr('Import problem'), line=self.import_ast.ast.lineno
-                                    , offset=self.import_ast.ast.col_offset
-                                    , details=tr("the module '{}' is not supported in Python101").format(self.import_name))
+        report.add_convention_error('error', Message('Import problem'), line=self.import_ast.lineno
+                                    , offset=self.import_ast.col_offset
+                                    , details=Message("the module '{}' is not supported in Python101", self.import_name))
 
 
     def is_fatal(self):
         return True
 
+class ImportCycleError(TypeError):
+    def __init__(self, cycle, import_ast):
+        self.cycle = cycle
+        self.import_ast = import_ast
+
+    def fail_string(self):
+        return "ImportCycleError[{}]@{}:{}".format(" -> ".join(self.cycle), self.import_ast.lineno, self.import_ast.col_offset)
+
+    def report(self, report):
+        report.add_convention_error('error', Message('Import problem'), line=self.import_ast.lineno
+                                    , offset=self.import_ast.col_offset
+                                    , details=Message("the modules import each other: {}", " -> ".join(self.cycle)))
+
+    def is_fatal(self):
+        return True
+
+class ImportedModuleErrorsWarning(TypeError):
+    def __init__(self, import_name, nb_errors, import_ast):
+        self.import_name = import_name
+        self.nb_errors = nb_errors
+        self.import_ast = import_ast
+
+    def fail_string(self):
+        return "ImportedModuleErrorsWarning[{}]@{}:{}".format(self.import_name, self.import_ast.lineno, self.import_ast.col_offset)
+
+    def report(self, report):
+        report.add_convention_error('warning', Message('Import problem'), line=self.import_ast.lineno
+                                    , offset=self.import_ast.col_offset
+                                    , details=Message("the module '{}' has {} type error(s)", self.import_name, self.nb_errors))
+
+    def is_fatal(self):
+        return False
+
 class SignatureParseError(TypeError):
     def __init__(self, fun_name, fun_def, signature):
         self.fun_name = fun_name
@@ -2493,11 +2956,11 @@ class SignatureParseError(TypeError):
         self.signature = signature
 
     def fail_string(self):
-        return "SignatureParseError[{}]@{}:{}".format(self.fun_name, self.fun_def.ast.lineno, self.fun_def.ast.col_offset)
+        return "SignatureParseError[{}]@{}:{}".format(self.fun_name, self.fun_def.lineno, self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Signature problem"), self.fun_def.ast.lineno, self.fun_def.ast.col_offset
-                                    , details=tr("I don't understand the signature of function '{}'").format(self.fun_name))
+        report.add_convention_error('error', Message("Signature problem"), self.fun_def.lineno, self.fun_def.col_offset
+                                    , details=Message("I don't understand the signature of function '{}'", self.fun_name))
 
     def is_fatal(self):
         return False
@@ -2512,11 +2975,11 @@ class SignatureTrailingError(TypeError):
             remaining = remaining[1:]
 
     def fail_string(self):
-        return "SignatureTrailingError[{}/{}]@{}:{}".format(self.fun_name, self.trailing, self.fun_def.ast.lineno, self.fun_def.ast.col_offset)
+        return "SignatureTrailingError[{}/{}]@{}:{}".format(self.fun_name, self.trailing, self.fun_def.lineno, self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Signature problem"), self.fun_def.ast.lineno, self.fun_def.ast.col_offset
-                                    , details=tr("The signature of function '{}' contains some characters at the end that I do not understand: {}").format(self.fun_name, self.trailing))
+        report.add_convention_error('error', Message("Signature problem"), self.fun_def.lineno, self.fun_def.col_offset
+                                    , details=Message("The signature of function '{}' contains some characters at the end that I do not understand: {}", self.fun_name, self.trailing))
 
     def is_fatal(self):
         return False
@@ -2530,7 +2993,7 @@ class TypeDefParseError(TypeError):
         return "TypeDefParseError[{}]@{}:{}".format(self.type_name, self.lineno, 0)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Type expression problem"), self.lineno, 0
+        report.add_convention_error('error', Message("Type expression problem"), self.lineno, 0
                                     , details="{}".format(self.type_name))
 
     def is_fatal(self):
@@ -2546,7 +3009,7 @@ class TypeExprParseError(TypeError):
         return "TypeExprParseError[{}]@{}:{}".format(self.message, self.lineno, self.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Type expression problem"), self.lineno, self.col_offset
+        report.add_convention_error('error', Message("Type expression problem"), self.lineno, self.col_offset
                                     , details=self.message)
 
     def is_fatal(self):
@@ -2561,8 +3024,8 @@ class DuplicateTypeDefError(TypeError):
         return "DuplicateTypeDefError[{}]@{}:{}".format(self.type_name, self.lineno, 0)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Type definition problem"), self.lineno, 0
-                                    , details=tr("There is already a definition for type '{}'").format(self.type_name))
+        report.add_convention_error('error', Message("Type definition problem"), self.lineno, 0
+                                    , details=Message("There is already a definition for type '{}'", self.type_name))
 
     def is_fatal(self):
         return False
@@ -2576,8 +3039,8 @@ class DuplicateMultiAssignError(TypeError):
         return "DuplicateMultiAssignError[{}]@{}:{}".format(self.var_name, self.lineno, 0)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Declaration problem"), self.lineno, 0
-                                    , details=tr("Variable '{}' was declared multiple times").format(self.var_name))
+        report.add_convention_error('error', Message("Declaration problem"), self.lineno, 0
+                                    , details=Message("Variable '{}' was declared multiple times", self.var_name))
 
     def is_fatal(self):
         return True
@@ -2591,8 +3054,8 @@ class DuplicateMultiFunDeclarationError(TypeError):
         return "DuplicateMultiFunDeclarationError[{}]@{}:{}".format(self.fun_name, self.lineno, 0)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Function definition problem"), self.lineno, 0
-                                    , details=tr("Function '{}' was defined multiple times").format(self.fun_name))
+        report.add_convention_error('error', Message("Function definition problem"), self.lineno, 0
+                                    , details=Message("Function '{}' was defined multiple times", self.fun_name))
 
     def is_fatal(self):
         return True
@@ -2605,11 +3068,11 @@ class AssertionInFunctionWarning(TypeError):
         self.assertion = assertion
 
     def fail_string(self):
-        return "AssertionInFunctionWarning[{}]@{}:{}".format(self.fun_name, self.assertion.ast.lineno, self.assertion.ast.col_offset)
+        return "AssertionInFunctionWarning[{}]@{}:{}".format(self.fun_name, self.assertion.lineno, self.assertion.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Assertion issue"), self.assertion.ast.lineno, self.assertion.ast.col_offset
-                                    , details=tr("In Python101 the `asserts` are reserved for test cases, however one assert is present in the body of function '{}'").format(self.fun_name))
+        report.add_convention_error('warning', Message("Assertion issue"), self.assertion.lineno, self.assertion.col_offset
+                                    , details=Message("In Python101 the `asserts` are reserved for test cases, however one assert is present in the body of function '{}'", self.fun_name))
 
     def is_fatal(self):
         return False
@@ -2624,7 +3087,7 @@ class NotUsedDeclarationWarning(TypeError):
         return "NotUsedDeclarationWarning[{}]@{}:{}".format(self.var_name, self.var_info['lineno'], self.var_info['col_offset'])
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Unused variable"), self.var_info['lineno'], self.var_info['col_offset'], details=tr("The variable '{}' is declared but not used").format(self.var_name))
+        report.add_convention_error('warning', Message("Unused variable"), self.var_info['lineno'], self.var_info['col_offset'], details=Message("The variable '{}' is declared but not used", self.var_name))
 
     def is_fatal(self):
         return False
@@ -2638,8 +3101,8 @@ class DifferentDeclarationWarning(TypeError):
         return "DifferentDeclarationWarning[{}]@{}:{}".format(self.var_name, self.var_type)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Declaration problem"), self.lineno, 0
-                                    , details=tr("Warning you've initialzed in 2 differents ways the variable: '{}'").format(self.var_name))
+        report.add_convention_error('warning', Message("Declaration problem"), self.lineno, 0
+                                    , details=Message("Warning you've initialzed in 2 differents ways the variable: '{}'", self.var_name))
 
     def is_fatal(self):
         return False
@@ -2656,16 +3119,16 @@ class FunctionArityError(TypeError):
         return "FunctionArityError[{},{}/{}]@{}:{}".format(self.func_def.name
                                                            , len(self.func_def.parameters)
                                                            , len(self.signature.param_types)
-                                                           , self.func_def.ast.lineno
-                                                           , self.func_def.ast.col_offset)
+                                                           , self.func_def.lineno
+                                                           , self.func_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Function arity issue"), self.func_def.ast.lineno, self.func_def.ast.col_offset
-                                    , tr("the signature of function '{}' defines {} parameters, but there are {} effectively: {}").
-                                    format(self.func_def.name
-                                           , len(self.signature.param_types)
-                                           , len(self.func_def.parameters)
-                                           , "({})".format(", ".join(self.func_def.parameters))))
+        report.add_convention_error('error', Message("Function arity issue"), self.func_def.lineno, self.func_def.col_offset
+                                    , Message("the signature of function '{}' defines {} parameters, but there are {} effectively: {}"
+                                            , self.func_def.name
+                                            , len(self.signature.param_types)
+                                            , len(self.func_def.parameters)
+                                            , "({})".format(", ".join(self.func_def.parameters))))
 
 
 class FunctionUnhashableError(TypeError):
@@ -2679,12 +3142,12 @@ class FunctionUnhashableError(TypeError):
     def fail_string(self):
         return "FunctionUnhashableError[{}:{}]@{}:{}".format(self.func_def.name
                                                              , self.unhashable_type
-                                                             , self.func_def.ast.lineno
-                                                             , self.func_def.ast.col_offset)
+                                                             , self.func_def.lineno
+                                                             , self.func_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Type declaration error"), self.func_def.ast.lineno, self.func_def.ast.col_offset
-                                    , tr("Wrong use in signature of function '{}' of mutable (not hashable) type: {}").format(self.func_def.name, self.unhashable_type))
+        report.add_convention_error('error', Message("Type declaration error"), self.func_def.lineno, self.func_def.col_offset
+                                    , Message("Wrong use in signature of function '{}' of mutable (not hashable) type: {}", self.func_def.name, self.unhashable_type))
 
 
 class UnsupportedNodeError(TypeError):
@@ -2695,13 +3158,15 @@ class UnsupportedNodeError(TypeError):
         return True
 
     def fail_string(self):
-        return "UnsupportedNodeError[{}]@{}:{}".format(str(self.node.ast.__class__.__name__)
-                                                       , self.node.ast.lineno
-                                                       , self.node.ast.col_offset)
+        # the unsupported expressions (e.g. str * int) are not UnsupportedNode's
+        node_kind = self.node.ast.__class__ if isinstance(self.node, UnsupportedNode) else self.node.__class__
+        return "UnsupportedNodeError[{}]@{}:{}".format(str(node_kind.__name__)
+                                                       , self.node.lineno
+                                                       , self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr('Not-Python101'), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("this construction is not available in Python101 (try expert mode for standard Python)"))
+        report.add_convention_error('error', Message('Not-Python101'), self.node.lineno, self.node.col_offset
+                                    , Message("this construction is not available in Python101 (try expert mode for standard Python)"))
 
 class UnsupportedElseError(TypeError):
     def __init__(self, node):
@@ -2711,13 +3176,13 @@ class UnsupportedElseError(TypeError):
         return True
 
     def fail_string(self):
-        return "UnsupportedElseError[{}]@{}:{}".format(str(self.node.ast.__class__.__name__)
-                                                       , self.node.ast.lineno
-                                                       , self.node.ast.col_offset)
+        return "UnsupportedElseError[{}]@{}:{}".format(str(self.node.__class__.__name__)
+                                                       , self.node.lineno
+                                                       , self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr('Not-Python101'), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Loops with `else` clause not supported"))
+        report.add_convention_error('error', Message('Not-Python101'), self.node.lineno, self.node.col_offset
+                                    , Message("Loops with `else` clause not supported"))
 
 class UnsupportedTopLevelNodeError(TypeError):
     def __init__(self, node):
@@ -2728,12 +3193,12 @@ class UnsupportedTopLevelNodeError(TypeError):
 
     def fail_string(self):
         return "UnsupportedTopLevelNodeError[{}]@{}:{}".format(str(self.node.ast.__class__.__name__)
-                                                       , self.node.ast.lineno
-                                                       , self.node.ast.col_offset)
+                                                       , self.node.lineno
+                                                       , self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr('Wrong statement'), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("In Python 101 this statement cannot be done outside a function body (try expert mode for standard Python)"))
+        report.add_convention_error('error', Message('Wrong statement'), self.node.lineno, self.node.col_offset
+                                    , Message("In Python 101 this statement cannot be done outside a function body (try expert mode for standard Python)"))
 
 class WrongFunctionDefError(TypeError):
     def __init__(self, fun_def):
@@ -2744,12 +3209,12 @@ class WrongFunctionDefError(TypeError):
 
     def fail_string(self):
         return "WrongFunctionDefError[{}]@{}:{}".format(str(self.fun_def.ast.name)
-                                                        , self.fun_def.ast.lineno
-                                                        , self.fun_def.ast.col_offset)
+                                                        , self.fun_def.lineno
+                                                        , self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr('Wrong definition'), self.fun_def.ast.lineno, self.fun_def.ast.col_offset
-                                    , tr("The function '{}' has no correct specification.").format(self.fun_def.ast.name))
+        report.add_convention_error('error', Message('Wrong definition'), self.fun_def.lineno, self.fun_def.col_offset
+                                    , Message("The function '{}' has no correct specification.", self.fun_def.ast.name))
     
 class FunctionPreconditionWarning(TypeError):
     def __init__(self, fun_def, precondition_type, lineno):
@@ -2761,13 +3226,13 @@ class FunctionPreconditionWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "FunctionPreconditionWarning[{}]@{}:{}".format(str(self.fun_def.ast.name)
+        return "FunctionPreconditionWarning[{}]@{}:{}".format(str(self.fun_def.name)
                                                         , self.lineno
-                                                        , self.fun_def.ast.col_offset)
+                                                        , self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr('Wrong definition'), self.lineno, self.fun_def.ast.col_offset
-                                    , tr("The precondition in '{}' should be a 'bool', not a '{}'.").format(self.fun_def.ast.name, self.precondition_type))
+        report.add_convention_error('warning', Message('Wrong definition'), self.lineno, self.fun_def.col_offset
+                                    , Message("The precondition in '{}' should be a 'bool', not a '{}'.", self.fun_def.name, self.precondition_type))
 
 class UndefinedVarInPreconditionWarning(TypeError):
     def __init__(self, fun_def, var, lineno):
@@ -2779,11 +3244,11 @@ class UndefinedVarInPreconditionWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "UndefinedVarInPreconditionWarning[{} in {}]@{}:{}".format(self.var.name,str(self.fun_def.ast.name),self.lineno, self.fun_def.ast.col_offset)
+        return "UndefinedVarInPreconditionWarning[{} in {}]@{}:{}".format(self.var.name,str(self.fun_def.name),self.lineno, self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Undefined variable"), self.lineno, self.fun_def.ast.col_offset
-                                    , details=tr("The variable '{}' in the precondition is undefined.").format(self.var.name))
+        report.add_convention_error('warning', Message("Undefined variable"), self.lineno, self.fun_def.col_offset
+                                    , details=Message("The variable '{}' in the precondition is undefined.", self.var.name))
 
 class ErrorInPreconditionWarning(TypeError):
     def __init__(self, fun_def, lineno):
@@ -2794,11 +3259,11 @@ class ErrorInPreconditionWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "ErrorInPreconditionWarning[in {}]@{}:{}".format(str(self.fun_def.ast.name),self.lineno, self.fun_def.ast.col_offset)
+        return "ErrorInPreconditionWarning[in {}]@{}:{}".format(str(self.fun_def.name),self.lineno, self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Syntax error"), self.lineno, self.fun_def.ast.col_offset
-                                    , details=tr("There is an error in the function '{}' precondition.").format(self.fun_def.name))
+        report.add_convention_error('warning', Message("Syntax error"), self.lineno, self.fun_def.col_offset
+                                    , details=Message("There is an error in the function '{}' precondition.", self.fun_def.name))
 
 
 class NoFunctionDocWarning(TypeError):
@@ -2809,13 +3274,13 @@ class NoFunctionDocWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "NoFunctionDocWarning[{}]@{}:{}".format(str(self.fun_def.ast.name)
-                                                       , self.fun_def.ast.lineno
-                                                       , self.fun_def.ast.col_offset)
+        return "NoFunctionDocWarning[{}]@{}:{}".format(str(self.fun_def.name)
+                                                       , self.fun_def.lineno
+                                                       , self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr('Wrong definition'), self.fun_def.ast.lineno, self.fun_def.ast.col_offset
-                                    , tr("The function '{}' has no documentation.").format(self.fun_def.ast.name))
+        report.add_convention_error('warning', Message('Wrong definition'), self.fun_def.lineno, self.fun_def.col_offset
+                                    , Message("The function '{}' has no documentation.", self.fun_def.name))
 
 
 
@@ -2838,14 +3303,14 @@ class DeclarationError(TypeError):
     def fail_string(self):
         return "DeclarationError[{}]@{}:{}".format(self.category
                                                    , self.lineno
-                                                   , self.node.ast.col_offset)
+                                                   , self.node.col_offset)
 
     def is_fatal(self):
         return True
 
     def report(self, report):
-        col_offset = self.node.ast.col_offset
-        report.add_convention_error('error', tr('Declaration problem'), self.lineno, col_offset, self.explain)
+        col_offset = self.node.col_offset
+        report.add_convention_error('error', Message('Declaration problem'), self.lineno, col_offset, self.explain)
 
 
 class DeclarationWarning(TypeError):
@@ -2859,14 +3324,14 @@ class DeclarationWarning(TypeError):
     def fail_string(self):
         return "DeclarationWarning[{}]@{}:{}".format(self.category
                                                      , self.lineno
-                                                     , self.node.ast.col_offset)
+                                                     , self.node.col_offset)
 
     def is_fatal(self):
         return False
 
     def report(self, report):
-        col_offset = self.node.ast.col_offset
-        report.add_convention_error('warning', tr('Declaration problem'), self.lineno, col_offset, self.explain)
+        col_offset = self.node.col_offset
+        report.add_convention_error('warning', Message('Declaration problem'), self.lineno, col_offset, self.explain)
 
 class UnknownVariableError(TypeError):
     def __init__(self, in_function, var):
@@ -2878,12 +3343,12 @@ class UnknownVariableError(TypeError):
 
     def fail_string(self):
         return "UnknownVariableError[{}]@{}:{}".format(self.var.name
-                                                       , self.var.ast.lineno
-                                                       , self.var.ast.col_offset)
+                                                       , self.var.lineno
+                                                       , self.var.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Variable problem"), self.var.ast.lineno, self.var.ast.col_offset
-                                    , tr("there is such variable of name '{}'").format(self.var.name))
+        report.add_convention_error('error', Message("Variable problem"), self.var.lineno, self.var.col_offset
+                                    , Message("there is such variable of name '{}'", self.var.name))
 
 class TypeComparisonError(TypeError):
     def __init__(self, in_function, expected_type, expr, expr_type, explain):
@@ -2896,11 +3361,11 @@ class TypeComparisonError(TypeError):
         return True
 
     def fail_string(self):
-        return "TypeComparisonError[{}/{}]@{}:{}".format(self.expected_type, self.expr_type, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "TypeComparisonError[{}/{}]@{}:{}".format(self.expected_type, self.expr_type, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Incompatible types"), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr( "Expecting type '{}' but instead found: {}").format(self.expected_type, self.expr_type))
+        report.add_convention_error('error', Message("Incompatible types"), self.expr.lineno, self.expr.col_offset
+                                    , Message("Expecting type '{}' but instead found: {}", self.expected_type, self.expr_type))
 
 class TypeExpectationError(TypeError):
     def __init__(self, in_function, expr, expr_type, explain):
@@ -2913,11 +3378,11 @@ class TypeExpectationError(TypeError):
         return True
 
     def fail_string(self):
-        return "TypeExpectationError[{}/{}]@{}:{}".format(self.expr_type, self.explain, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "TypeExpectationError[{}/{}]@{}:{}".format(self.expr_type, self.explain, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Incorrect type"), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("Found type '{}' which is incorrect: {}").format(self.expr_type, self.explain))
+        report.add_convention_error('error', Message("Incorrect type"), self.expr.lineno, self.expr.col_offset
+                                    , Message("Found type '{}' which is incorrect: {}", self.expr_type, self.explain))
 
 
 class TypeImprecisionWarning(TypeError):
@@ -2931,11 +3396,11 @@ class TypeImprecisionWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "TypeImprecisionWarning[{}/{}]@{}:{}".format(self.expected_type, self.expr_type, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "TypeImprecisionWarning[{}/{}]@{}:{}".format(self.expected_type, self.expr_type, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Imprecise typing"), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("Expecting type '{}' but found '{}': there is a risk of imprecision (but it's maybe not a bug)").format(self.expected_type, self.expr_type))
+        report.add_convention_error('warning', Message("Imprecise typing"), self.expr.lineno, self.expr.col_offset
+                                    , Message("Expecting type '{}' but found '{}': there is a risk of imprecision (but it's maybe not a bug)", self.expected_type, self.expr_type))
 
 
 class OptionCoercionWarning(TypeError):
@@ -2948,11 +3413,11 @@ class OptionCoercionWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "OptionCoercionWarning[{}/{}]@{}:{}".format(self.expected_precise_type, self.expr_option_type, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "OptionCoercionWarning[{}/{}]@{}:{}".format(self.expected_precise_type, self.expr_option_type, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Imprecise typing"), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("Expecting type '{}' but found less precise type '{}' (the value could be None)").format(self.expected_precise_type, self.expr_option_type))
+        report.add_convention_error('warning', Message("Imprecise typing"), self.expr.lineno, self.expr.col_offset
+                                    , Message("Expecting type '{}' but found less precise type '{}' (the value could be None)", self.expected_precise_type, self.expr_option_type))
 
 
 class UnsupportedNumericTypeError(TypeError):
@@ -2964,11 +3429,11 @@ class UnsupportedNumericTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "UnsupportedNumericTypeError[{}]@{}:{}".format(self.num.value, self.num.ast.lineno, self.num.ast.col_offset)
+        return "UnsupportedNumericTypeError[{}]@{}:{}".format(self.num.value, self.num.lineno, self.num.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Number problem"), self.num.ast.lineno, self.num.ast.col_offset
-                                    , tr("this numeric value is not supported in Python 101: {} ({})").format(self.num.value, type(self.num.value)))
+        report.add_convention_error('error', Message("Number problem"), self.num.lineno, self.num.col_offset
+                                    , Message("this numeric value is not supported in Python 101: {} ({})", self.num.value, type(self.num.value)))
 
 class WrongReturnTypeError(TypeError):
     def __init__(self, in_function, expected_type, ret_type, ret_expr):
@@ -2981,11 +3446,11 @@ class WrongReturnTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "WrongReturnTypeError[{}/{}]@{}:{}".format(self.expected_type, self.ret_type, self.ret_expr.ast.lineno, self.ret_expr.ast.col_offset)
+        return "WrongReturnTypeError[{}/{}]@{}:{}".format(self.expected_type, self.ret_type, self.ret_expr.lineno, self.ret_expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Wrong return type"), self.ret_expr.ast.lineno, self.ret_expr.ast.col_offset
-                                    , tr("The declared return type for function '{}' is '{}' but the return expression has incompatible type: {}").format(self.in_function.name, self.expected_type, self.ret_type))
+        report.add_convention_error('error', Message("Wrong return type"), self.ret_expr.lineno, self.ret_expr.col_offset
+                                    , Message("The declared return type for function '{}' is '{}' but the return expression has incompatible type: {}", self.in_function.name, self.expected_type, self.ret_type))
 
 class UnknownFunctionError(TypeError):
     def __init__(self, in_function, call):
@@ -2996,11 +3461,11 @@ class UnknownFunctionError(TypeError):
         return True
 
     def fail_string(self):
-        return "UnknownFunctionError[{}]@{}:{}".format(self.call.full_fun_name, self.call.ast.lineno, self.call.ast.col_offset)
+        return "UnknownFunctionError[{}]@{}:{}".format(self.call.full_fun_name, self.call.lineno, self.call.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Call problem"), self.call.ast.lineno, self.call.ast.col_offset
-                                    , tr("I don't know any function named '{}'").format(self.call.full_fun_name))
+        report.add_convention_error('error', Message("Call problem"), self.call.lineno, self.call.col_offset
+                                    , Message("I don't know any function named '{}'", self.call.full_fun_name))
 
 class NotAFunctionError(TypeError):
     def __init__(self, in_function, call):
@@ -3011,11 +3476,11 @@ class NotAFunctionError(TypeError):
         return True
 
     def fail_string(self):
-        return "NotAFunctionError[{}]@{}:{}".format(self.call.full_fun_name, self.call.ast.lineno, self.call.ast.col_offset)
+        return "NotAFunctionError[{}]@{}:{}".format(self.call.full_fun_name, self.call.lineno, self.call.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Call problem"), self.call.ast.lineno, self.call.ast.col_offset
-                                    , tr("'{}' is not a function").format(self.call.full_fun_name))
+        report.add_convention_error('error', Message("Call problem"), self.call.lineno, self.call.col_offset
+                                    , Message("'{}' is not a function", self.call.full_fun_name))
 
 class CallArityError(TypeError):
     def __init__(self, method_call, param_types, arguments, call):
@@ -3028,13 +3493,14 @@ class CallArityError(TypeError):
         return True
 
     def fail_string(self):
-        return "CallArityError[{}:{}/{}]@{}:{}".format(self.call.fun_name, len(self.param_types), len(self.arguments), self.call.ast.lineno, self.call.ast.col_offset)
+        return "CallArityError[{}:{}/{}]@{}:{}".format(self.call.fun_name, len(self.param_types), len(self.arguments), self.call.lineno, self.call.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Call problem"), self.call.ast.lineno, self.call.ast.col_offset
-                                    , tr("calling '{}' with {} argument(s) but expecting: {}").format(self.call.fun_name
-                                                                                                      , len(self.arguments)
-                                                                                                      , len(self.param_types)))
+        report.add_convention_error('error', Message("Call problem"), self.call.lineno, self.call.col_offset
+                                    , Message("calling '{}' with {} argument(s) but expecting: {}"
+                                            , self.call.fun_name
+                                            , len(self.arguments)
+                                            , len(self.param_types)))
 
 class CallArgumentError(TypeError):
     def __init__(self, in_function, method_call, call, num_arg, arg, param_type):
@@ -3049,12 +3515,13 @@ class CallArgumentError(TypeError):
         return True
 
     def fail_string(self):
-        return "CallArgumentError[{}]@{}:{}".format(self.num_arg, self.arg.ast.lineno, self.arg.ast.col_offset)
+        return "CallArgumentError[{}]@{}:{}".format(self.num_arg, self.arg.lineno, self.arg.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Call problem"), self.arg.ast.lineno, self.arg.ast.col_offset
-                                    , tr("the {}-th argument in call to function '{}' is erroneous").format(self.num_arg
-                                                                                                           , self.call.fun_name))
+        report.add_convention_error('error', Message("Call problem"), self.arg.lineno, self.arg.col_offset
+                                    , Message("the {}-th argument in call to function '{}' is erroneous"
+                                            , self.num_arg
+                                            , self.call.fun_name))
 
 class TestCaseError(TypeError):
     def __init__(self, test_case, expr_type):
@@ -3065,7 +3532,7 @@ class TestCaseError(TypeError):
         return True
 
     def fail_string(self):
-        return "TestCaseError[{}]@{}:{}".format(self.expr_type.__class__.__name__, self.test_case.ast.lineno, self.test_case.ast.col_offset)
+        return "TestCaseError[{}]@{}:{}".format(self.expr_type.__class__.__name__, self.test_case.lineno, self.test_case.col_offset)
 
 class CompareConditionError(TypeError):
     def __init__(self, compare, cond, left_type, right_type):
@@ -3078,11 +3545,11 @@ class CompareConditionError(TypeError):
         return True
 
     def fail_string(self):
-        return "CompareConditionError[{}/{}]@{}:{}".format(self.left_type, self.right_type, self.compare.ast.lineno, self.compare.ast.col_offset)
+        return "CompareConditionError[{}/{}]@{}:{}".format(self.left_type, self.right_type, self.compare.lineno, self.compare.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Comparison error"), self.compare.ast.lineno, self.compare.ast.col_offset
-                                    , tr("The two operands of the comparision should have the same type: '{}' vs. '{}'").format(self.left_type, self.right_type))
+        report.add_convention_error('error', Message("Comparison error"), self.compare.lineno, self.compare.col_offset
+                                    , Message("The two operands of the comparision should have the same type: '{}' vs. '{}'", self.left_type, self.right_type))
 
 class CompareConditionWarning(TypeError):
     def __init__(self, compare, cond, left_type, right_type):
@@ -3095,11 +3562,11 @@ class CompareConditionWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "CompareConditionWarning[{}/{}]@{}:{}".format(self.left_type, self.right_type, self.compare.ast.lineno, self.compare.ast.col_offset)
+        return "CompareConditionWarning[{}/{}]@{}:{}".format(self.left_type, self.right_type, self.compare.lineno, self.compare.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Comparison issue"), self.compare.ast.lineno, self.compare.ast.col_offset
-                                    , tr("The two operands of the comparison are only \"weakly\" compatibles: '{}' vs. '{}'").format(self.left_type, self.right_type))
+        report.add_convention_error('warning', Message("Comparison issue"), self.compare.lineno, self.compare.col_offset
+                                    , Message("The two operands of the comparison are only \"weakly\" compatibles: '{}' vs. '{}'", self.left_type, self.right_type))
 
 class DeadVariableUseError(TypeError):
     def __init__(self, var_name, node):
@@ -3110,11 +3577,11 @@ class DeadVariableUseError(TypeError):
         return True
 
     def fail_string(self):
-        return "DeadVariableUseError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "DeadVariableUseError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of variable '{}' that is not in scope (Python101 scoping rule)").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of variable '{}' that is not in scope (Python101 scoping rule)", self.var_name))
 
 class DeadVariableDefineError(TypeError):
     def __init__(self, var_name, node):
@@ -3125,11 +3592,11 @@ class DeadVariableDefineError(TypeError):
         return True
 
     def fail_string(self):
-        return "DeadVariableDefineError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "DeadVariableDefineError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of a \"dead\" variable name '{}' (Python101 rule)").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of a \"dead\" variable name '{}' (Python101 rule)", self.var_name))
 
 class GlobalVariableUseError(TypeError):
     def __init__(self, var_name, node):
@@ -3140,11 +3607,11 @@ class GlobalVariableUseError(TypeError):
         return True
 
     def fail_string(self):
-        return "GlobalVariableUseError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "GlobalVariableUseError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of global variable '{}' (Python101 rule)").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of global variable '{}' (Python101 rule)", self.var_name))
 
 class VariableTypeError(TypeError):
     def __init__(self, target, var, declared_type, var_type):
@@ -3157,11 +3624,11 @@ class VariableTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "VariableTypeError[{}:{}/{}]@{}:{}".format(self.var.var_name, self.var_type, self.declared_type, self.var.ast.lineno, self.var.ast.col_offset)
+        return "VariableTypeError[{}:{}/{}]@{}:{}".format(self.var.var_name, self.var_type, self.declared_type, self.var.lineno, self.var.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable type"), self.var.ast.lineno, self.var.ast.col_offset
-                                    , tr("Type mismatch for variable '{}', expecting '{}' instead of: {}").format(self.var.var_name, self.declared_type, self.var_type))
+        report.add_convention_error('error', Message("Bad variable type"), self.var.lineno, self.var.col_offset
+                                    , Message("Type mismatch for variable '{}', expecting '{}' instead of: {}", self.var.var_name, self.declared_type, self.var_type))
 
 
 class ParameterInAssignmentError(TypeError):
@@ -3173,11 +3640,11 @@ class ParameterInAssignmentError(TypeError):
         return True
 
     def fail_string(self):
-        return "ParameterInAssignmentError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "ParameterInAssignmentError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of parameter '{}' in assignment").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of parameter '{}' in assignment", self.var_name))
 
 class ParameterInForError(TypeError):
     def __init__(self, var_name, node):
@@ -3188,11 +3655,11 @@ class ParameterInForError(TypeError):
         return True
 
     def fail_string(self):
-        return "ParameterInForError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "ParameterInForError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of parameter '{}' as iteration variable").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of parameter '{}' as iteration variable", self.var_name))
 
 class ParameterInCompError(TypeError):
     def __init__(self, var_name, node):
@@ -3203,11 +3670,11 @@ class ParameterInCompError(TypeError):
         return True
 
     def fail_string(self):
-        return "ParameterInCompError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "ParameterInCompError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of parameter '{}' as comprehension variable").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of parameter '{}' as comprehension variable", self.var_name))
 
 class ParameterInWithError(TypeError):
     def __init__(self, var_name, node):
@@ -3218,11 +3685,11 @@ class ParameterInWithError(TypeError):
         return True
 
     def fail_string(self):
-        return "ParameterInWithError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "ParameterInWithError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("Forbidden use of parameter '{}' in with construct").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("Forbidden use of parameter '{}' in with construct", self.var_name))
 
 
 class IndexingError(TypeError):
@@ -3234,11 +3701,11 @@ class IndexingError(TypeError):
         return True
 
     def fail_string(self):
-        return "IndexingError[{}]@{}:{}".format(self.subject_type, self.indexing.ast.lineno, self.indexing.ast.col_offset)
+        return "IndexingError[{}]@{}:{}".format(self.subject_type, self.indexing.lineno, self.indexing.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad indexing"), self.indexing.ast.lineno, self.indexing.ast.col_offset
-                                    , tr("One can only index a sequence or a dictionnary, not a '{}'").format(self.subject_type))
+        report.add_convention_error('error', Message("Bad indexing"), self.indexing.lineno, self.indexing.col_offset
+                                    , Message("One can only index a sequence or a dictionnary, not a '{}'", self.subject_type))
 
 
 class IndexingSequenceNotNumeric(TypeError):
@@ -3249,11 +3716,11 @@ class IndexingSequenceNotNumeric(TypeError):
         return True
 
     def fail_string(self):
-        return "IndexingSequenceNotNumeric[]@{}:{}".format(self.index.ast.lineno, self.index.ast.col_offset)
+        return "IndexingSequenceNotNumeric[]@{}:{}".format(self.index.lineno, self.index.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad index"), self.index.ast.lineno, self.index.ast.col_offset
-                                    , tr("Sequence index must be an integer"))
+        report.add_convention_error('error', Message("Bad index"), self.index.lineno, self.index.col_offset
+                                    , Message("Sequence index must be an integer"))
 
 class NaryNumOpArgNotNumeric(TypeError):
     def __init__(self, arg):
@@ -3263,11 +3730,11 @@ class NaryNumOpArgNotNumeric(TypeError):
         return True
 
     def fail_string(self):
-        return "NaryNumOpArgNotNumeric[]@{}:{}".format(self.arg.ast.lineno, self.arg.ast.col_offset)
+        return "NaryNumOpArgNotNumeric[]@{}:{}".format(self.arg.lineno, self.arg.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad argument"), self.arg.ast.lineno, self.arg.ast.col_offset
-                                    , tr("This argument is not numeric."))
+        report.add_convention_error('error', Message("Bad argument"), self.arg.lineno, self.arg.col_offset
+                                    , Message("This argument is not numeric."))
 
 
 class IndexingDictKeyTypeError(TypeError):
@@ -3279,11 +3746,11 @@ class IndexingDictKeyTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "IndexingDictKeyTypeError[{}]@{}:{}".format(self.dict_key_type, self.index.ast.lineno, self.index.ast.col_offset)
+        return "IndexingDictKeyTypeError[{}]@{}:{}".format(self.dict_key_type, self.index.lineno, self.index.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad index"), self.index.ast.lineno, self.index.ast.col_offset
-                                    , tr("Dictionnary key must be of type: {}").format(self.dict_key_type))
+        report.add_convention_error('error', Message("Bad index"), self.index.lineno, self.index.col_offset
+                                    , Message("Dictionnary key must be of type: {}", self.dict_key_type))
 
 
 class SlicingError(TypeError):
@@ -3295,11 +3762,11 @@ class SlicingError(TypeError):
         return True
 
     def fail_string(self):
-        return "SlicingError[{}]@{}:{}".format(self.subject_type, self.slicing.ast.lineno, self.slicing.ast.col_offset)
+        return "SlicingError[{}]@{}:{}".format(self.subject_type, self.slicing.lineno, self.slicing.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad slicing"), self.slicing.ast.lineno, self.slicing.ast.col_offset
-                                    , tr("One can only slice a sequence (str, list), not a '{}'").format(self.subject_type))
+        report.add_convention_error('error', Message("Bad slicing"), self.slicing.lineno, self.slicing.col_offset
+                                    , Message("One can only slice a sequence (str, list), not a '{}'", self.subject_type))
 
 class MembershipTypeError(TypeError):
     def __init__(self, container_expr, container_type):
@@ -3310,11 +3777,11 @@ class MembershipTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "MembershipTypeError[{}]@{}:{}".format(self.container_type, self.container_expr.ast.lineno, self.container_expr.ast.col_offset)
+        return "MembershipTypeError[{}]@{}:{}".format(self.container_type, self.container_expr.lineno, self.container_expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad membership"), self.container_expr.ast.lineno, self.container_expr.ast.col_offset
-                                    , tr("Membership only supported for sets and dicts, not for type: {}").format(self.container_type))
+        report.add_convention_error('error', Message("Bad membership"), self.container_expr.lineno, self.container_expr.col_offset
+                                    , Message("Membership only supported for sets and dicts, not for type: {}", self.container_type))
 
 class HeterogeneousElementError(TypeError):
     def __init__(self, container_kind, container, container_type, element_type, element):
@@ -3328,11 +3795,11 @@ class HeterogeneousElementError(TypeError):
         return True
 
     def fail_string(self):
-        return "HeterogenousElementError[{}]@{}:{}".format(self.element_type, self.element.ast.lineno, self.element.ast.col_offset)
+        return "HeterogenousElementError[{}]@{}:{}".format(self.element_type, self.element.lineno, self.element.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Heterogeneous elements (Python101 restriction)"), self.element.ast.lineno, self.element.ast.col_offset
-                                    , tr("All elements of must be of the same type '{}' but this element has incompatible type: {}").format(self.container_type, self.element_type))
+        report.add_convention_error('error', Message("Heterogeneous elements (Python101 restriction)"), self.element.lineno, self.element.col_offset
+                                    , Message("All elements of must be of the same type '{}' but this element has incompatible type: {}", self.container_type, self.element_type))
 
 
 class TupleDestructArityError(TypeError):
@@ -3345,11 +3812,11 @@ class TupleDestructArityError(TypeError):
         return True
 
     def fail_string(self):
-        return "TupleDestructArityError[{}]@{}:{}".format(self.expected_arity, self.destruct.ast.lineno, self.destruct.ast.col_offset)
+        return "TupleDestructArityError[{}]@{}:{}".format(self.expected_arity, self.destruct.lineno, self.destruct.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Tuple destruct error"), self.destruct.ast.lineno, self.destruct.ast.col_offset
-                                    , tr("Wrong number of variables to destruct tuple, expecting {} variables but {} given").format(self.expected_arity, self.actual_arity))
+        report.add_convention_error('error', Message("Tuple destruct error"), self.destruct.lineno, self.destruct.col_offset
+                                    , Message("Wrong number of variables to destruct tuple, expecting {} variables but {} given", self.expected_arity, self.actual_arity))
 
 class TupleTypeExpectationError(TypeError):
     def __init__(self, in_function, expr, expr_type):
@@ -3361,11 +3828,11 @@ class TupleTypeExpectationError(TypeError):
         return True
 
     def fail_string(self):
-        return "TupleTypeExpectationError[{}]@{}:{}".format(self.expr_type, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "TupleTypeExpectationError[{}]@{}:{}".format(self.expr_type, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Incorrect type"), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("Expecting an expression of tuple type, instead found type: '{}'").format(self.expr_type))
+        report.add_convention_error('error', Message("Incorrect type"), self.expr.lineno, self.expr.col_offset
+                                    , Message("Expecting an expression of tuple type, instead found type: '{}'", self.expr_type))
 
 
 
@@ -3383,8 +3850,8 @@ class UnknownTypeAliasError(TypeError):
         return "UnknownTypeAliasError[{}]@{}:{}".format(self.unknown_alias, self.lineno, self.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Type name error"), self.lineno, self.col_offset
-                                    , tr("I don't find any definition for the type: {}").format(self.unknown_alias))
+        report.add_convention_error('error', Message("Type name error"), self.lineno, self.col_offset
+                                    , Message("I don't find any definition for the type: {}", self.unknown_alias))
 
 
 class ReservedFunctionNameError(TypeError):
@@ -3400,8 +3867,8 @@ class ReservedFunctionNameError(TypeError):
         return "ReservedFunctionNameError[{}]@{}:{}".format(self.fun_def.name, self.lineno, self.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Wrong function name"), self.lineno, self.col_offset
-                                    , tr("The function name '{}' is reserved in student mode").format(self.fun_def.name))
+        report.add_convention_error('error', Message("Wrong function name"), self.lineno, self.col_offset
+                                    , Message("The function name '{}' is reserved in student mode", self.fun_def.name))
 
 class MissingReturnTypeError(TypeError):
     def __init__(self, fun_def, lineno, col_offset):
@@ -3416,8 +3883,8 @@ class MissingReturnTypeError(TypeError):
         return "MissingReturnTypeError[{}]@{}:{}".format(self.fun_def.name, self.lineno, self.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Missing return type"), self.lineno, self.col_offset
-                                    , tr("I don't find the return type for function: {}").format(self.fun_def.name))
+        report.add_convention_error('error', Message("Missing return type"), self.lineno, self.col_offset
+                                    , Message("I don't find the return type for function: {}", self.fun_def.name))
 
 class ExprAsInstrWarning(TypeError):
     def __init__(self, enode):
@@ -3427,11 +3894,11 @@ class ExprAsInstrWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "ExprAsInstrWarning@{}:{}".format(self.enode.ast.lineno, self.enode.ast.col_offset)
+        return "ExprAsInstrWarning@{}:{}".format(self.enode.lineno, self.enode.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Expression problem"), self.enode.ast.lineno, self.enode.ast.col_offset
-                                    , tr("This expression is in instruction position, the computed value is lost"))
+        report.add_convention_error('warning', Message("Expression problem"), self.enode.lineno, self.enode.col_offset
+                                    , Message("This expression is in instruction position, the computed value is lost"))
 
 class NoReturnInFunctionError(TypeError):
     def __init__(self, fun_def):
@@ -3441,11 +3908,11 @@ class NoReturnInFunctionError(TypeError):
         return True
 
     def fail_string(self):
-        return "NoReturnInFunctionError[{}]@{}:{}".format(self.fun_def.name, self.fun_def.ast.lineno, self.fun_def.ast.col_offset)
+        return "NoReturnInFunctionError[{}]@{}:{}".format(self.fun_def.name, self.fun_def.lineno, self.fun_def.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Return problem"), self.fun_def.ast.lineno, self.fun_def.ast.col_offset
-                                    , tr("The function '{}' should have `return` statement(s)").format(self.fun_def.name))
+        report.add_convention_error('error', Message("Return problem"), self.fun_def.lineno, self.fun_def.col_offset
+                                    , Message("The function '{}' should have `return` statement(s)", self.fun_def.name))
 
 
 class ForbiddenMultiAssign(TypeError):
@@ -3456,11 +3923,11 @@ class ForbiddenMultiAssign(TypeError):
         return True
 
     def fail_string(self):
-        return "ForbiddenMultiAssign[{}]@{}:{}".format(self.var.var_name, self.var.ast.lineno, self.var.ast.col_offset)
+        return "ForbiddenMultiAssign[{}]@{}:{}".format(self.var.var_name, self.var.lineno, self.var.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Assignment problem"), self.var.ast.lineno, self.var.ast.col_offset
-                                    , tr("This assignment to variable '{}' is forbidden in Python101.").format(self.var.var_name))
+        report.add_convention_error('error', Message("Assignment problem"), self.var.lineno, self.var.col_offset
+                                    , Message("This assignment to variable '{}' is forbidden in Python101.", self.var.var_name))
 
 
 
@@ -3472,24 +3939,24 @@ class ERangeArgumentError(TypeError):
         return True
 
     def fail_string(self):
-        return "ERangeArgumentError@{}:{}".format(self.erange.ast.lineno, self.erange.ast.col_offset)
+        return "ERangeArgumentError@{}:{}".format(self.erange.lineno, self.erange.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Range problem"), self.erange.ast.lineno, self.erange.ast.col_offset
-                                    , tr("the arguments of `range` are incorrect."))
+        report.add_convention_error('error', Message("Range problem"), self.erange.lineno, self.erange.col_offset
+                                    , Message("the arguments of `range` are incorrect."))
 
-def typecheck_from_ast(ast, filename=None, source=None):
+def typecheck_from_ast(ast, filename=None, source=None, previous_ctx=None, recover=False, jobs=1, incremental=False):
     prog = Program()
     if source is None:
         source = ""
     prog.build_from_ast(ast, filename, source)
-    ctx = prog.type_check()
+    ctx = prog.type_check(previous_ctx, recover, jobs, incremental)
     return ctx
 
-def typecheck_from_file(filename):
+def typecheck_from_file(filename, recover=False, jobs=1):
     prog = Program()
     prog.build_from_file(filename)
-    ctx = prog.type_check()
+    ctx = prog.type_check(recover=recover, jobs=jobs)
     return ctx
 
 class IteratorTypeError(TypeError):
@@ -3501,11 +3968,11 @@ class IteratorTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "IteratorTypeError[{}]@{}:{}".format(self.iter_type, self.for_node.iter.ast.lineno, self.for_node.iter.ast.col_offset)
+        return "IteratorTypeError[{}]@{}:{}".format(self.iter_type, self.for_node.iter.lineno, self.for_node.iter.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad iterator"), self.for_node.iter.ast.lineno, self.for_node.iter.ast.col_offset
-                                    , tr("Not an iterable type: {}").format(self.iter_type))
+        report.add_convention_error('error', Message("Bad iterator"), self.for_node.iter.lineno, self.for_node.iter.col_offset
+                                    , Message("Not an iterable type: {}", self.iter_type))
 
 
 
@@ -3518,11 +3985,11 @@ class IterVariableInEnvError(TypeError):
         return True
 
     def fail_string(self):
-        return "IterVariableInEnvError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "IterVariableInEnvError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("The iterator variable '{}' is already in use.").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("The iterator variable '{}' is already in use.", self.var_name))
 
 class WithVariableInEnvError(TypeError):
     def __init__(self, var_name, node):
@@ -3533,11 +4000,11 @@ class WithVariableInEnvError(TypeError):
         return True
 
     def fail_string(self):
-        return "WithVariableInEnvError[{}]@{}:{}".format(self.var_name, self.node.ast.lineno, self.node.ast.col_offset)
+        return "WithVariableInEnvError[{}]@{}:{}".format(self.var_name, self.node.lineno, self.node.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad variable"), self.node.ast.lineno, self.node.ast.col_offset
-                                    , tr("The `with` variable '{}' is already declared").format(self.var_name))
+        report.add_convention_error('error', Message("Bad variable"), self.node.lineno, self.node.col_offset
+                                    , Message("The `with` variable '{}' is already declared", self.var_name))
 
 
 
@@ -3551,11 +4018,11 @@ class UnhashableElementError(TypeError):
         return True
 
     def fail_string(self):
-        return "UnhashableElementError[{}]@{}:{}".format(self.element_type, self.element.ast.lineno, self.element.ast.col_offset)
+        return "UnhashableElementError[{}]@{}:{}".format(self.element_type, self.element.lineno, self.element.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad set"), self.element.ast.lineno, self.element.ast.col_offset
-                                    , tr("Unhashable (mutable) element forbidden in set, element type is: {}").format(self.element_type))
+        report.add_convention_error('error', Message("Bad set"), self.element.lineno, self.element.col_offset
+                                    , Message("Unhashable (mutable) element forbidden in set, element type is: {}", self.element_type))
 
 
 class UnhashableKeyError(TypeError):
@@ -3568,11 +4035,11 @@ class UnhashableKeyError(TypeError):
         return True
 
     def fail_string(self):
-        return "UnhashableKeyError@{}:{}".format(self.key.ast.lineno, self.key.ast.col_offset)
+        return "UnhashableKeyError@{}:{}".format(self.key.lineno, self.key.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad dictionary"), self.key.ast.lineno, self.key.ast.col_offset
-                                    , tr("Unhashable (mutable) key in dictionary, key type is: {}").format(self.key_type))
+        report.add_convention_error('error', Message("Bad dictionary"), self.key.lineno, self.key.col_offset
+                                    , Message("Unhashable (mutable) key in dictionary, key type is: {}", self.key_type))
 
 
 class ContainerAssignTypeError(TypeError):
@@ -3584,11 +4051,11 @@ class ContainerAssignTypeError(TypeError):
         return True
 
     def fail_string(self):
-        return "ContainerAssignTypeError[{}]@{}:{}".format(self.container_type, self.cassign.container_expr.ast.lineno, self.cassign.container_expr.ast.col_offset)
+        return "ContainerAssignTypeError[{}]@{}:{}".format(self.container_type, self.cassign.container_expr.lineno, self.cassign.container_expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad assignment"), self.cassign.container_expr.ast.lineno, self.cassign.container_expr.ast.col_offset
-                                    , tr("In Python101 this kind of assignment is only available for dictionaries, not for objects of type: {}").format(self.container_type))
+        report.add_convention_error('error', Message("Bad assignment"), self.cassign.container_expr.lineno, self.cassign.container_expr.col_offset
+                                    , Message("In Python101 this kind of assignment is only available for dictionaries, not for objects of type: {}", self.container_type))
 
 class ContainerAssignEmptyError(TypeError):
     def __init__(self, cassign):
@@ -3598,11 +4065,11 @@ class ContainerAssignEmptyError(TypeError):
         return True
 
     def fail_string(self):
-        return "ContainerAssignEmptyError@{}:{}".format(self.cassign.container_expr.ast.lineno, self.cassign.container_expr.ast.col_offset)
+        return "ContainerAssignEmptyError@{}:{}".format(self.cassign.container_expr.lineno, self.cassign.container_expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Bad assignment"), self.cassign.container_expr.ast.lineno, self.cassign.container_expr.ast.col_offset
-                                    , tr("Assignment in an empty dictionary"))
+        report.add_convention_error('error', Message("Bad assignment"), self.cassign.container_expr.lineno, self.cassign.container_expr.col_offset
+                                    , Message("Assignment in an empty dictionary"))
 
 
 class EmptyTupleError(TypeError):
@@ -3613,11 +4080,11 @@ class EmptyTupleError(TypeError):
         return True
 
     def fail_string(self):
-        return "EmptyTupleError@{}:{}".format(self.etup.ast.lineno, self.etup.ast.col_offset)
+        return "EmptyTupleError@{}:{}".format(self.etup.lineno, self.etup.col_offset)
 
     def report(self, report):
-        report.add_convention_error('error', tr("Empty tuple"), self.etup.ast.lineno, self.etup.ast.col_offset
-                                    , tr("Python 101 does not allow empty tuples, only in expert mode"))
+        report.add_convention_error('error', Message("Empty tuple"), self.etup.lineno, self.etup.col_offset
+                                    , Message("Python 101 does not allow empty tuples, only in expert mode"))
 
 
 class SideEffectWarning(TypeError):
@@ -3632,11 +4099,11 @@ class SideEffectWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "SideEffectWarning[{}]@{}:{}".format(self.fun_name, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "SideEffectWarning[{}]@{}:{}".format(self.fun_name, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Call to '{}' may cause side effect").format(self.fun_name), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("There is a risk of side effect as on the following parameter(s) {}").format(self.protected_var))
+        report.add_convention_error('warning', Message("Call to '{}' may cause side effect", self.fun_name), self.expr.lineno, self.expr.col_offset
+                                    , Message("There is a risk of side effect as on the following parameter(s) {}", self.protected_var))
 
 class SideEffectContainerWarning(TypeError):
     def __init__(self, in_function, expr, fun_name, receiver, protected_var):
@@ -3650,11 +4117,11 @@ class SideEffectContainerWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "SideEffectContainerWarning[{}]@{}:{}".format(self.fun_name, self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "SideEffectContainerWarning[{}]@{}:{}".format(self.fun_name, self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Assignment may cause side effect").format(self.fun_name), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("There is a risk of side effect as on the following parameter(s) {}").format(self.protected_var))
+        report.add_convention_error('warning', Message("Assignment may cause side effect", self.fun_name), self.expr.lineno, self.expr.col_offset
+                                    , Message("There is a risk of side effect as on the following parameter(s) {}", self.protected_var))
 
 class CallNotNoneWarning(TypeError):
     def __init__(self, expr, call_type):
@@ -3665,11 +4132,11 @@ class CallNotNoneWarning(TypeError):
         return False
 
     def fail_string(self):
-        return "CallNotNoneWarning@{}:{}".format(self.expr.ast.lineno, self.expr.ast.col_offset)
+        return "CallNotNoneWarning@{}:{}".format(self.expr.lineno, self.expr.col_offset)
 
     def report(self, report):
-        report.add_convention_error('warning', tr("Expression in instruction position"), self.expr.ast.lineno, self.expr.ast.col_offset
-                                    , tr("The value calculated of type `{}` is lost").format(self.call_type))
+        report.add_convention_error('warning', Message("Expression in instruction position"), self.expr.lineno, self.expr.col_offset
+                                    , Message("The value calculated of type `{}` is lost", self.call_type))
 
 if __name__ == '__main__':
 
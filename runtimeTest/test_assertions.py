@@ -0,0 +1,74 @@
+import sys
+import os.path
+import tempfile
+
+sys.path.append("../mrpython")
+
+import StudentRunner as studentRunner
+from ExecutionBudget import ExecutionBudget
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+SOURCE = '''
+def succ(n : int) -> int:
+    """ successeur """
+    return n + 1
+
+def div(a : int, b : int) -> int:
+    """ division entiere """
+    return a // b
+
+def boucle(n : int) -> int:
+    """ ne termine pas """
+    while n >= 0:
+        n = n + 1
+    return n
+
+assert succ(1) == 2
+assert succ(succ(1)) == 4
+assert div(1, 0) == 0
+assert boucle(0) == 0
+assert div(4, 2) == succ(1)
+'''
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+if __name__ == "__main__":
+    filename = os.path.join(tempfile.gettempdir(), "assertions.py")
+    runner = studentRunner.StudentRunner(None, filename, SOURCE, check_tk=False, budget=ExecutionBudget(test_time=1))
+    runner.execute(dict(), capture_stdout=False)
+    report = runner.report
+
+    statuses = [ (test['line'], test['status']) for test in report.test_results ]
+    check("one result per assertion", statuses == [ (16, 'pass'), (17, 'fail'), (18, 'error'), (19, 'error'), (20, 'pass') ]
+          , statuses)
+    check("passed tests", report.nb_passed_tests == 2, report.nb_passed_tests)
+    # (the loop is interrupted on one of its lines)
+    check("errors of the failed tests", [ error.line for error in report.execution_errors ] in ([ 17, 8, 12 ], [ 17, 8, 13 ])
+          , [ str(error) for error in report.execution_errors ])
+
+    calls = [ test['calls'] for test in report.test_results ]
+    check("calls of the tested functions", calls == [ { 'succ' : 1 }, { 'succ' : 2 }, { 'div' : 1 }
+                                                      , { 'boucle' : 1 }, { 'div' : 1, 'succ' : 1 } ], calls)
+    check("timings", all(test['elapsed'] >= 0 for test in report.test_results)
+          and report.test_results[3]['elapsed'] >= 0.5, [ test['elapsed'] for test in report.test_results ])
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
@@ -0,0 +1,131 @@
+import sys
+import os.path
+import tempfile
+
+sys.path.append("../mrpython")
+
+import StudentRunner as studentRunner
+from ExecutionBudget import ExecutionBudget, resource
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+LOOP = '''
+def boucle(n : int) -> int:
+    """ ne termine pas """
+    while n >= 0:
+        n = n + 1
+    return n
+
+assert boucle(0) == 0
+'''
+
+STEPS = '''
+def somme(n : int) -> int:
+    """ la somme des entiers de 1 a n """
+    s : int = 0
+    i : int
+    for i in range(1, n + 1):
+        s = s + i
+    return s
+
+assert somme(10000) == 50005000
+'''
+
+MEMORY = '''
+from typing import List
+
+def grande_liste(n : int) -> List[int]:
+    """ une liste de n entiers """
+    return [0] * n
+
+assert len(grande_liste(10 ** 10)) == 10 ** 10
+'''
+
+TESTS = '''
+def boucle(n : int) -> int:
+    """ ne termine pas """
+    while n >= 0:
+        n = n + 1
+    return n
+
+def succ(n : int) -> int:
+    """ successeur """
+    return n + 1
+
+assert boucle(0) == 0
+assert succ(1) == 2
+'''
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def run(source, budget):
+    filename = os.path.join(tempfile.gettempdir(), "budget.py")
+    runner = studentRunner.StudentRunner(None, filename, source, check_tk=False, budget=budget)
+    runner.execute(dict(), capture_stdout=False)
+    return runner.report
+
+def exhausted(report, budget, lines):
+    """ The run is interrupted at one of the lines, by the given budget """
+    return len(report.execution_errors) == 1 \
+        and report.execution_errors[0].line in lines \
+        and report.execution_errors[0].details.args[0] == budget
+
+def errors(report):
+    return [ str(error) for error in report.execution_errors ]
+
+def address_space_mib():
+    """ The current size of the address space of the process (or None) """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+if __name__ == "__main__":
+    report = run(LOOP, ExecutionBudget(cpu_time=1))
+    check("cpu-time budget", exhausted(report, 'cpu-time', (4, 5)), errors(report))
+
+    report = run(LOOP, ExecutionBudget(wall_time=1))
+    check("wall-time budget", exhausted(report, 'wall-time', (4, 5)), errors(report))
+
+    report = run(STEPS, ExecutionBudget(steps=1000))
+    check("steps budget", exhausted(report, 'steps', (7,)), errors(report))
+
+    report = run(STEPS, ExecutionBudget(steps=100000))
+    check("within the steps budget", not report.has_execution_error() and report.nb_passed_tests == 1, errors(report))
+
+    size = address_space_mib()
+    if resource is not None and size is not None:
+        report = run(MEMORY, ExecutionBudget(memory=size + 256))
+        check("memory budget", exhausted(report, 'memory', (6,)), errors(report))
+    else:
+        print("* Skipping: memory budget (not available on this platform)")
+
+    # a test case over budget is an error, the next ones are run
+    report = run(TESTS, ExecutionBudget(test_time=1))
+    statuses = [ (test['line'], test['status']) for test in report.test_results ]
+    check("test-time budget", exhausted(report, 'test-time', (4, 5)) and statuses == [ (12, 'error'), (13, 'pass') ]
+          , (errors(report), statuses))
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
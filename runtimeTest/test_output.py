@@ -0,0 +1,93 @@
+import sys
+import os.path
+import tempfile
+
+sys.path.append("../mrpython")
+
+from StreamedOutput import StreamedOutput, TruncatedOutput
+from FullRunner import FullRunner
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+# an output of 10000 characters, written line by line
+LINES = [ "ligne {:05d} {}\n".format(n, "x" * (n % 37)) for n in range(400) ]
+OUTPUT = "".join(LINES)[:10000]
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def write_lines(output, text):
+    for line in text.splitlines(keepends=True):
+        output.write(line)
+
+def head_and_tail(value, head, dropped, tail):
+    return isinstance(value, TruncatedOutput) and value.head == head \
+        and value.dropped == dropped and value.tail == tail
+
+if __name__ == "__main__":
+    output = StreamedOutput()
+    write_lines(output, OUTPUT)
+    check("kept output (no cap)", output.getvalue() == OUTPUT)
+
+    output = StreamedOutput(max_output=len(OUTPUT))
+    write_lines(output, OUTPUT)
+    check("kept output (within the cap)", output.getvalue() == OUTPUT)
+
+    output = StreamedOutput(max_output=1000)
+    write_lines(output, OUTPUT)
+    value = output.getvalue()
+    check("capped output: head and tail", head_and_tail(value, OUTPUT[:500], len(OUTPUT) - 1000, OUTPUT[-500:])
+          , (len(value.head), value.dropped, len(value.tail)) if isinstance(value, TruncatedOutput) else len(value))
+    check("truncation note", str(value).startswith(OUTPUT[:500]) and str(value).endswith(OUTPUT[-500:])
+          and str(value.dropped) in str(value.truncation_note()), str(value.truncation_note()))
+
+    output = StreamedOutput(max_output=1001)
+    output.write(OUTPUT)
+    check("capped output (single write, odd cap)", head_and_tail(output.getvalue(), OUTPUT[:501], len(OUTPUT) - 1001, OUTPUT[-500:]))
+
+    chunks = []
+    output = StreamedOutput(lambda chunk: chunks.append(chunk.text))
+    write_lines(output, OUTPUT)
+    value = output.getvalue()
+    check("streamed output (no cap)", "".join(chunks) == OUTPUT and value == "", (len("".join(chunks)), value))
+
+    chunks = []
+    output = StreamedOutput(lambda chunk: chunks.append(chunk.text), max_output=1000)
+    write_lines(output, OUTPUT)
+    value = output.getvalue()
+    check("capped streamed output: head streamed, tail kept", "".join(chunks) == OUTPUT[:500]
+          and head_and_tail(value, "", len(OUTPUT) - 1000, OUTPUT[-500:]), "".join(chunks))
+
+    # the errors of the full mode are captured (and capped) in memory
+    filename = os.path.join(tempfile.gettempdir(), "output.py")
+    original_output = sys.stdout
+    sys.stdout = StreamedOutput()
+    try:
+        runner = FullRunner(filename, "raise ValueError('{}')\n".format("erreur " * 1000), max_output=1000)
+        ok = runner.execute(dict())
+    finally:
+        sys.stdout = original_output
+    errors = runner.report.compilation_errors
+    details = errors[0].details if errors else None
+    check("capped errors of the full mode", not ok and isinstance(details, TruncatedOutput)
+          and details.head.startswith("Traceback") and details.tail.endswith("erreur \n")
+          and len(details.head) + len(details.tail) == 1000, details)
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
@@ -0,0 +1,121 @@
+import sys
+import json
+
+sys.path.append("../mrpython")
+
+import translate
+import typechecking.translate as typechecking_translate
+import ReportFormat
+from RunReport import RunReport
+from StreamedOutput import TruncatedOutput
+from translate import message
+from typechecking.translate import Message
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def set_locale(locale_key):
+    translate.set_translator_locale(locale_key)
+    typechecking_translate.set_translator_locale(locale_key)
+
+def sample_report(output):
+    report = RunReport()
+    report.add_convention_error('error', Message("Declaration problem"), 3, 4
+                                , Message("Parameter '{}': {}", 'x', Message("Does not understand the declared type.")))
+    report.add_convention_error('warning', Message("Incorrect type"), 5, 0
+                                , Message("Found type '{}' which is incorrect: {}", 'int', Message("Expecting a set")))
+    report.add_compilation_error('error', "SyntaxError", 7, 2, "invalid syntax")
+    report.add_execution_error('error', message("Execution budget exceeded"), 9
+                               , details=message("the {} budget is exhausted (limit: {})", 'steps', 1000))
+    report.set_output(output)
+    report.set_header("header")
+    report.set_footer("footer")
+    report.set_result([1, 2.5, "trois"])
+    report.nb_defined_funs = 2
+    report.nb_passed_tests = 1
+    report.add_test_result(12, 'pass', 0.001, { 'f' : 2 })
+    report.add_test_result(13, 'fail', 0.002, { 'f' : 1 })
+    return report
+
+def round_trip(report, shared_output=False):
+    """ The report decoded from its (JSON) encoding """
+    return ReportFormat.decode_report(json.loads(json.dumps(ReportFormat.encode_report(report, shared_output))))
+
+if __name__ == "__main__":
+    set_locale('en')
+
+    report = sample_report("une sortie\n")
+    decoded = round_trip(report)
+    check("round trip", decoded.to_dict() == report.to_dict(), decoded.to_dict())
+    check("round trip of the encoding", ReportFormat.encode_report(decoded) == ReportFormat.encode_report(report)
+          , ReportFormat.encode_report(decoded))
+
+    # the messages are translated by the receiver
+    english = [ str(error) for error in decoded.convention_errors + decoded.execution_errors ]
+    set_locale('fr')
+    french = [ str(error) for error in decoded.convention_errors + decoded.execution_errors ]
+    check("messages translated after decoding", french == [ str(error) for error in report.convention_errors
+                                                            + report.execution_errors ] and french != english, french)
+    set_locale('en')
+
+    truncated = TruncatedOutput("debut\n", 12345, "fin\n")
+    decoded = round_trip(sample_report(truncated))
+    check("round trip of a truncated output", isinstance(decoded.output, TruncatedOutput)
+          and (decoded.output.head, decoded.output.dropped, decoded.output.tail) == ("debut\n", 12345, "fin\n")
+          , decoded.output)
+
+    # a large output is sent through shared memory
+    large_output = "é" * (ReportFormat.SHARED_OUTPUT_SIZE + 1) + "\n"
+    encoded = ReportFormat.encode_report(sample_report(large_output), shared_output=True)
+    if ReportFormat.shared_memory is not None and isinstance(encoded['output'], list):
+        check("large output in shared memory", encoded['output'][0] == 'shm', encoded['output'][:2])
+        decoded = ReportFormat.decode_report(json.loads(json.dumps(encoded)))
+        check("round trip of a shared output", decoded.output == large_output, len(decoded.output))
+        try:
+            block = ReportFormat.shared_memory.SharedMemory(name=encoded['output'][1])
+            block.close()
+            block.unlink()
+            released = False
+        except OSError:
+            released = True
+        check("shared memory released by the receiver", released)
+
+        encoded = ReportFormat.encode_report(sample_report(TruncatedOutput(large_output, 1, "fin\n")), shared_output=True)
+        decoded = ReportFormat.decode_report(json.loads(json.dumps(encoded)))
+        check("round trip of a truncated shared output", isinstance(decoded.output, TruncatedOutput)
+              and decoded.output.head == large_output and decoded.output.tail == "fin\n", decoded.output)
+    else:
+        print("* Skipping: shared memory (not available on this platform)")
+
+    small = ReportFormat.encode_report(sample_report("petit\n"), shared_output=True)
+    check("small output sent directly", small['output'] == "petit\n", small['output'])
+
+    encoded = ReportFormat.encode_report(report)
+    encoded['version'] = ReportFormat.REPORT_FORMAT_VERSION + 1
+    try:
+        ReportFormat.decode_report(encoded)
+        rejected = False
+    except ValueError:
+        rejected = True
+    check("other version rejected", rejected)
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
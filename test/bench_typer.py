@@ -0,0 +1,314 @@
+import sys
+import glob
+import os.path
+import ast
+import io
+import json
+import time
+import tracemalloc
+import contextlib
+import argparse
+import importlib
+
+# the modules of the benched checker (cf. load_checker)
+prog_ast = None
+typechecker = None
+profiler = None
+
+TESTPROG_PATH = "./progs"
+BASELINE_FILE = "./bench_baseline.json"
+
+# sizes (in lines) of the generated programs
+SYNTHETIC_SIZES = { '1k' : 1000, '10k' : 10000, '100k' : 100000 }
+
+# a timing is reported as a regression above this ratio of the baseline
+# (the shorter baseline timings are too noisy to be compared)
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_TIME = 0.01
+
+# the phases of the checking (cf. typechecking.profiler.PHASES)
+PHASE_NAMES = ('top_level', 'aliases', 'imports', 'signatures', 'bodies', 'globals', 'tests')
+
+def load_checker(root):
+    """ Import the type checker of the MrPython tree root.
+        The phases are not timed if it has no profiler (older versions) """
+    global prog_ast, typechecker, profiler
+    sys.path.insert(0, root)
+    prog_ast = importlib.import_module("mrpython.typechecking.prog_ast")
+    typechecker = importlib.import_module("mrpython.typechecking.typechecker")
+    try:
+        profiler = importlib.import_module("mrpython.typechecking.profiler")
+    except ImportError:
+        profiler = None
+
+def type_check(prog):
+    """ Type-check the program, returns the typing context
+        and the times of the phases (or None) """
+    with contextlib.redirect_stdout(io.StringIO()):
+        if profiler is None:
+            return (prog.type_check(), None)
+        ctx, profile = profiler.profile_type_check(prog, dispatches=False)
+    return (ctx, profile.phases)
+
+def gen_literals(num, size):
+    """ A (global) dict and set literal of the given size """
+    lines = []
+    lines.append("TABLE_{} : Dict[str, int] = {{".format(num))
+    for i in range(size):
+        lines.append("    'k{}_{}' : {},".format(num, i, i))
+    lines.append("}")
+    lines.append("")
+    lines.append("KEYS_{} : Set[int] = {{ {} }}".format(num, ", ".join(str(i) for i in range(size))))
+    lines.append("")
+    return lines
+
+def gen_nested(depth, indent):
+    """ Nested conditionals and loops on the local variables n, acc and i """
+    lines = []
+    pad = "    " * indent
+    if depth == 0:
+        lines.append(pad + "acc = acc + i")
+        return lines
+
+    if depth % 2 == 0:
+        lines.append(pad + "if acc % {} == 0:".format(depth + 1))
+        lines.extend(gen_nested(depth - 1, indent + 1))
+        lines.append(pad + "else:")
+        lines.append(pad + "    acc = acc - 1")
+    else:
+        lines.append(pad + "while i < n and acc < {}:".format(depth * 100))
+        lines.extend(gen_nested(depth - 1, indent + 1))
+        lines.append(pad + "    i = i + 1")
+
+    return lines
+
+def gen_function(num, depth):
+    """ A Python101 function (with its test cases) calling the previous one """
+    lines = []
+    lines.append("def fun_{}(n : int, xs : List[int]) -> int:".format(num))
+    lines.append("    \"\"\"Précondition : n >= 0")
+    lines.append("    Retourne un entier calculé à partir de n et xs.\"\"\"")
+    lines.append("")
+    lines.append("    acc : int = 0")
+    lines.append("    i : int = 0")
+    lines.append("    ys : List[int] = [x * 2 for x in xs if x > 0]")
+    lines.append("    seen : Set[int] = set()")
+    lines.append("    counts : Dict[int, int] = dict()")
+    lines.append("    x : int")
+    lines.append("    for x in ys:")
+    lines.append("        seen.add(x)")
+    lines.append("        if x in counts:")
+    lines.append("            counts[x] = counts[x] + 1")
+    lines.append("        else:")
+    lines.append("            counts[x] = 1")
+    lines.extend(gen_nested(depth, 1))
+    if num > 0:
+        lines.append("    acc = acc + fun_{}(n - 1, ys) + len(seen)".format(num - 1))
+    else:
+        lines.append("    acc = acc + len(seen)")
+    lines.append("    return acc")
+    lines.append("")
+    lines.append("assert fun_{}(0, []) == 0".format(num))
+    lines.append("")
+    return lines
+
+def gen_program(nb_lines, depth=6, literal_size=50):
+    """ Generate a (well-typed) program of about nb_lines lines """
+    lines = [ "from typing import List, Dict, Set", "" ]
+    num = 0
+    while len(lines) < nb_lines:
+        if num % 20 == 0:
+            lines.extend(gen_literals(num, literal_size))
+        lines.extend(gen_function(num, depth))
+        num += 1
+
+    return "\n".join(lines) + "\n"
+
+def gen_calls(nb_lines):
+    """ Functions calling a function on values of a large declared type
+        (the same types are compared again and again) """
+    decl_type = "Tuple[{}]".format(", ".join(["Dict[str, List[Tuple[int, str, Set[float]]]]"] * 6))
+    lines = [ "from typing import List, Dict, Tuple, Set", "" ]
+    lines.append("def pick(t : {}, u : {}) -> {}:".format(decl_type, decl_type, decl_type))
+    lines.append("    \"\"\"Retourne t.\"\"\"")
+    lines.append("    return t")
+    lines.append("")
+    num = 0
+    while len(lines) < nb_lines:
+        lines.append("def calls_{}(t : {}) -> {}:".format(num, decl_type, decl_type))
+        lines.append("    \"\"\"Retourne t.\"\"\"")
+        lines.append("    v : {} = t".format(decl_type))
+        for _ in range(500):
+            lines.append("    v = pick(v, t)")
+        lines.append("    return v")
+        lines.append("")
+        num += 1
+
+    return "\n".join(lines) + "\n"
+
+def gen_nested_literals(nb_lines):
+    """ Literals of nested containers of variables
+        (the types of the elements are inferred, and compared once) """
+    half = nb_lines // 2
+    lines = [ "from typing import List, Dict, Tuple, Set", "", "a : int = 1", "s : str = 'x'", "" ]
+    lines.append("D : Dict[str, List[Tuple[int, str]]] = {")
+    for i in range(half):
+        lines.append("    'k{}' : [(a, s), (a + {}, s), ({}, 'v')],".format(i, i, i))
+    lines.append("}")
+    lines.append("")
+    lines.append("E : List[Dict[int, Set[str]]] = [")
+    for i in range(half):
+        lines.append("    {{ a : {{ s, 'w{}' }}, {} : {{ s }} }},".format(i, i))
+    lines.append("]")
+    return "\n".join(lines) + "\n"
+
+def gen_constant_literal(kind, size):
+    """ A (global) tuple or list literal of size constants
+        (the tuple has runs of integers, strings and floats) """
+    if kind == 'tuple':
+        third = size // 3
+        elements = [ str(i) for i in range(third) ] + [ "'s{}'".format(i) for i in range(third) ] \
+            + [ "{}.5".format(i) for i in range(size - 2 * third) ]
+        elem_types = [ "int" ] * third + [ "str" ] * third + [ "float" ] * (size - 2 * third)
+        return "from typing import Tuple\n\nCONSTANTS : Tuple[{}] = ({})\n".format(", ".join(elem_types), ", ".join(elements))
+    return "from typing import List\n\nCONSTANTS : List[int] = [{}]\n".format(", ".join(str(i) for i in range(size)))
+
+# the generated programs stressing a single part of the checker
+WORKLOADS = { 'calls' : lambda: gen_calls(20000)
+              , 'nested' : lambda: gen_nested_literals(16000)
+              , 'tuple' : lambda: gen_constant_literal('tuple', 50000)
+              , 'list' : lambda: gen_constant_literal('list', 50000) }
+
+def bench_source(source, filename, repeat=1):
+    """ Time the building of the program and its type checking, with
+        its phases (the best of repeat runs), and measure the peak memory """
+    modast = ast.parse(source, filename)
+    build_time = check_time = phases = None
+    nb_errors = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prog = prog_ast.Program()
+        prog.build_from_ast(modast, filename, source)
+        middle = time.perf_counter()
+        ctx, run_phases = type_check(prog)
+        end = time.perf_counter()
+        build_time = middle - start if build_time is None else min(build_time, middle - start)
+        if check_time is None or end - middle < check_time:
+            check_time = end - middle
+            phases = run_phases
+        nb_errors = len(ctx.type_errors)
+
+    # the memory is measured apart (tracemalloc slows down the checker):
+    # the peak during the checking, with all that is still alive
+    # from the parsing and the building (the python AST is dropped)
+    del modast
+    tracemalloc.start()
+    prog = prog_ast.Program()
+    prog.build_from_ast(ast.parse(source, filename), filename, source)
+    tracemalloc.reset_peak()
+    type_check(prog)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = { 'lines' : source.count("\n") + 1
+               , 'build' : round(build_time, 6)
+               , 'check' : round(check_time, 6)
+               , 'peak_memory' : peak
+               , 'errors' : nb_errors }
+    if phases is not None:
+        result['phases'] = { name : round(phases.get(name, 0.0), 6) for name in PHASE_NAMES }
+    return result
+
+def bench_corpus(repeat):
+    """ Bench the whole test/progs corpus (the timings are summed) """
+    total = { 'lines' : 0, 'build' : 0.0, 'check' : 0.0, 'peak_memory' : 0, 'errors' : 0 }
+    for prog_file in sorted(glob.glob("{}/*.py".format(TESTPROG_PATH))):
+        with open(prog_file, encoding="utf-8") as f:
+            source = f.read()
+        try:
+            result = bench_source(source, prog_file, repeat)
+        except SyntaxError:
+            continue
+        for key in ('lines', 'build', 'check', 'errors'):
+            total[key] += result[key]
+        total['peak_memory'] = max(total['peak_memory'], result['peak_memory'])
+        if 'phases' in result:
+            phases = total.setdefault('phases', { name : 0.0 for name in PHASE_NAMES })
+            for name in PHASE_NAMES:
+                phases[name] += result['phases'][name]
+
+    total['build'] = round(total['build'], 6)
+    total['check'] = round(total['check'], 6)
+    if 'phases' in total:
+        total['phases'] = { name : round(time, 6) for (name, time) in total['phases'].items() }
+    return total
+
+def regression(name, value, baseline_value):
+    """ The report of a regression of the timing (or None) """
+    if baseline_value is not None and baseline_value >= REGRESSION_MIN_TIME and value > REGRESSION_RATIO * baseline_value:
+        return "\n         ==> REGRESSION: {} {:.4f} s (baseline: {:.4f} s)".format(name, value, baseline_value)
+    return None
+
+def show_result(name, result, baseline):
+    line = "{:>8} | {:>7} lines | build {:9.4f} s | check {:9.4f} s | peak {:8.1f} MiB | {} error(s)".format(
+        name, result['lines'], result['build'], result['check'], result['peak_memory'] / (1024 * 1024), result['errors'])
+    if 'phases' in result:
+        line += "\n         | " + " | ".join("{} {:.4f} s".format(phase, result['phases'][phase]) for phase in PHASE_NAMES)
+    if baseline is not None:
+        reports = [ regression(phase, result[phase], baseline[phase]) for phase in ('build', 'check') ]
+        if 'phases' in result:
+            reports.extend(regression(phase, result['phases'][phase], baseline.get('phases', {}).get(phase))
+                           for phase in PHASE_NAMES)
+        line += "".join(report for report in reports if report is not None)
+    print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the MrPython type checker")
+    parser.add_argument('-s', '--sizes', nargs='*', default=list(SYNTHETIC_SIZES.keys()),
+                        choices=list(SYNTHETIC_SIZES.keys()), help="Sizes of the generated programs")
+    parser.add_argument('-w', '--workloads', nargs='*', default=list(WORKLOADS.keys()),
+                        choices=list(WORKLOADS.keys()), help="Programs stressing a single part of the checker")
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help="Number of timed runs (the best one is kept)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Save the results as the new baseline")
+    parser.add_argument('--dump', metavar='<dir>', default=None,
+                        help="Also write the generated programs in <dir>")
+    parser.add_argument('--root', metavar='<dir>', default="..",
+                        help="The MrPython tree whose checker is benched (default: this one),"
+                        " e.g. a checkout of an older version to record its baseline")
+    config = parser.parse_args()
+    load_checker(config.root)
+
+    baselines = dict()
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baselines = json.load(f)
+
+    results = dict()
+    results['progs'] = bench_corpus(config.repeat)
+    show_result('progs', results['progs'], baselines.get('progs'))
+
+    for size in config.sizes:
+        source = gen_program(SYNTHETIC_SIZES[size])
+        if config.dump is not None:
+            with open(os.path.join(config.dump, "synthetic_{}.py".format(size)), "w", encoding="utf-8") as f:
+                f.write(source)
+        # the largest program is only checked once
+        results[size] = bench_source(source, "synthetic_{}.py".format(size),
+                                     config.repeat if SYNTHETIC_SIZES[size] < 100000 else 1)
+        show_result(size, results[size], baselines.get(size))
+
+    for workload in config.workloads:
+        source = WORKLOADS[workload]()
+        if config.dump is not None:
+            with open(os.path.join(config.dump, "workload_{}.py".format(workload)), "w", encoding="utf-8") as f:
+                f.write(source)
+        results[workload] = bench_source(source, "workload_{}.py".format(workload), config.repeat)
+        show_result(workload, results[workload], baselines.get(workload))
+
+    if config.save_baseline:
+        baselines.update(results)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print("Baseline saved in {}".format(BASELINE_FILE))
@@ -0,0 +1,11 @@
+import math
+import random
+from typing import List, Dict
+
+def f(s : str, d : Dict[str, int], xs : List[int]) -> int:
+    """doc"""
+    ws : List[str] = s.upper().split(",")
+    xs.insert(0, d.get("a", 0))
+    return xs.pop() + len(",".join(ws)) + math.gcd(4, 6) + random.randint(1, 2) + math.floor(math.tau)
+
+assert f("a,b", {"a": 1}, [1]) >= 0
@@ -0,0 +1,7 @@
+##!FAIL: TypeComparisonError[int/str]@7:18
+
+from typing import List
+
+def f(xs : List[int]) -> int:
+    """doc"""
+    return xs.pop("0")
@@ -0,0 +1,7 @@
+##!FAIL: CallArityError[split:2/3]@7:11
+
+from typing import List
+
+def f(s : str) -> List[str]:
+    """doc"""
+    return s.split(",", 1)
@@ -0,0 +1,7 @@
+##!FAIL: TypeComparisonError[str/int]@7:17
+
+from typing import Dict
+
+def f(d : Dict[str, int]) -> int:
+    """doc"""
+    return d.get(1, 0)
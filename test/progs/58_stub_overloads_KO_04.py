@@ -0,0 +1,5 @@
+##!FAIL: TypeComparisonError[str/int]@5:19
+
+def f(s : str) -> str:
+    """doc"""
+    return s.strip(1)
@@ -0,0 +1,7 @@
+##!FAIL: TypeComparisonError[int/str]@7:14
+
+from typing import List
+
+def f(xs : List[int]) -> None:
+    """doc"""
+    xs.remove("a")
@@ -0,0 +1,14 @@
+from typing import List, Dict, Set
+
+def f(s : str, d : Dict[str, int], xs : List[int], e : Set[int]) -> int:
+    """doc"""
+    ws : List[str] = s.strip().split()
+    vs : List[str] = s.strip("()").split(",")
+    if d.get("a") == None:
+        return 0
+    xs.remove(1)
+    e.remove(2)
+    return xs.pop(0) + xs.pop() + xs.count(3) + xs.index(4) \
+        + s.count("a") + s.index("a") + len(ws) + len(vs) + d.get("b", 0)
+
+assert f("(a,b)", {"a": 1}, [1, 2, 3, 4, 5], {2}) >= 0
@@ -0,0 +1,5 @@
+##!FAIL: HeterogenousElementError[str]@5:29
+
+from typing import List
+
+ENTIERS : List[int] = [1, 2, 'trois', 4]
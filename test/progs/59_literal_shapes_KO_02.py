@@ -0,0 +1,5 @@
+##!FAIL: HeterogenousElementError[str]@5:47
+
+from typing import Dict
+
+AGES : Dict[str, int] = {'alice' : 21, 'bob' : 'trente', 'eve' : 19}
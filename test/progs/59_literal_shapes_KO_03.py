@@ -0,0 +1,5 @@
+##!FAIL: TypeComparisonError[Tuple[int,int]/Tuple[int,int,int]]@5:50
+
+from typing import List, Tuple
+
+POINTS : List[Tuple[int, int]] = [(1, 2), (2, 3), (3, 4, 5)]
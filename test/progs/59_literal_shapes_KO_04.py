@@ -0,0 +1,5 @@
+##!FAIL: VariableTypeError[NOMBRES:List[float]/List[int]]@5:0
+
+from typing import List
+
+NOMBRES : List[int] = [1, 2.5, 3]
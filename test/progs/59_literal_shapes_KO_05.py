@@ -0,0 +1,5 @@
+##!FAIL: HeterogenousElementError[bool]@5:33
+
+from typing import Set
+
+MOTS : Set[str] = {'un', 'deux', True}
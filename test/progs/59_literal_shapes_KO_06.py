@@ -0,0 +1,5 @@
+##!FAIL: HeterogenousElementError[str]@5:81
+
+from typing import List
+
+ENTIERS : List[int] = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, '17', 18, 19]
@@ -0,0 +1,5 @@
+##!FAIL: VariableTypeError[FICHE:Tuple[str,int,int,int,int,int,int,int,int,int,int,int,int,int,int,float]/Tuple[str,int,int,int,int,int,int,int,int,int,int,int,int,int,int,int]]@5:0
+
+from typing import Tuple
+
+FICHE : Tuple[str, int, int, int, int, int, int, int, int, int, int, int, int, int, int, int] = ('alice', 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15.5)
@@ -0,0 +1,36 @@
+from typing import List, Set, Dict, Tuple
+
+ENTIERS : List[int] = [1, 2, 3, 4, 5, 6, 7, 8]
+
+NOMBRES : List[float] = [1, 2.5, 3, 4.25]
+
+MOTS : Set[str] = {'un', 'deux', 'trois'}
+
+AGES : Dict[str, int] = {'alice' : 21, 'bob' : 32, 'eve' : 19}
+
+POINTS : List[Tuple[int, float]] = [(1, 2.5), (2, 3.0), (3, 1)]
+
+MATRICE : List[List[int]] = [[1, 2], [3, 4], [], [5]]
+
+CARRES : List[int] = [0, 1, 4, 9, 16, 25, 36, 49, 64, 81, 100, 121, 144, 169, 196, 225]
+
+MESURES : List[float] = [0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5, 5.5, 6, 6.5, 7, 7.5]
+
+FICHE : Tuple[str, str, int, int, int, int, int, int, int, int, int, int, int, int, float, bool] = ('alice', 'dupont', 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13.5, True)
+
+COORDS : List[Tuple[int, float]] = [(0, 0.0), (1, 0.5), (2, 1.0), (3, 1.5), (4, 2.0), (5, 2.5), (6, 3.0), (7, 3.5)
+                                    , (8, 4.0), (9, 4.5), (10, 5.0), (11, 5.5), (12, 6.0), (13, 6.5), (14, 7.0), (15, 7.5)]
+
+def somme(l : List[int]) -> int:
+    """ la somme des elements de l """
+    s : int = 0
+    x : int
+    for x in l:
+        s = s + x
+    return s
+
+assert somme(ENTIERS) == 36
+assert len(MATRICE) == 4
+assert somme(CARRES) == 1240
+assert len(COORDS) == 16
+assert AGES['bob'] == 32
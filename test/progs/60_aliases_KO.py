@@ -0,0 +1,40 @@
+##!FAIL: SideEffectWarning[append]@18:8
+
+from typing import List, Tuple
+
+def f(xs : List[int], ys : List[List[int]]) -> List[int]:
+    """"""
+    a : List[int] = xs
+    b : List[List[int]] = [a, xs]
+    t : Tuple[List[int], List[int]] = (a, xs)
+    c : List[int]
+    d : List[int]
+    c, d = t
+    e : List[int] = b[0]
+    g : List[int] = xs[1:]
+    h : List[int] = a + xs
+    z : List[int]
+    for z in ys:
+        z.append(1)
+    e.append(3)
+    c.append(2)
+    g.append(4)
+    h.append(5)
+    return a
+
+def g2(xs : List[int]) -> List[int]:
+    """"""
+    ys : List[List[int]] = []
+    ys.append(xs)
+    zs : List[int] = ys[0]
+    zs.append(1)
+    return zs
+
+def g3(xs : List[List[int]]) -> int:
+    """"""
+    p : Tuple[List[int], int] = (xs[0], 1)
+    q : List[int]
+    r : int
+    q, r = p
+    q.append(r)
+    return r
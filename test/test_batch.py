@@ -0,0 +1,113 @@
+import sys
+import os.path
+import tempfile
+import multiprocessing as mp
+
+sys.path.append("../mrpython")
+
+from Checkfile import BatchChecker, FileChecker, collect_submissions, grade_file
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+# the submissions of the batch, with their expected status (in check mode)
+SUBMISSIONS = {
+    "ok.py" : ("ok", '''
+def f(x : int) -> int:
+    """ successeur """
+    return x + 1
+
+assert f(1) == 2
+''')
+    , "type_error.py" : ("error", '''
+def f(x : int) -> int:
+    """ successeur """
+    return x + "1"
+
+assert f(1) == 2
+''')
+    , "syntax_error.py" : ("error", '''
+def f(x : int) -> int
+    return x + 1
+''')
+    , "indentation_error.py" : ("error", '''
+def f(x : int) -> int:
+    """ successeur """
+  return x + 1
+''') }
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+if __name__ == "__main__":
+    mp.set_start_method('spawn')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for (name, (status, source)) in SUBMISSIONS.items():
+            with open(os.path.join(directory, name), "w") as f:
+                f.write(source)
+
+        filenames = collect_submissions(directory)
+        check("collect submissions", len(filenames) == len(SUBMISSIONS), filenames)
+
+        # a compilation error is a result of the submission, not a crash of the grader
+        record = grade_file(os.path.join(directory, "syntax_error.py"), run=False)
+        check("grade a syntax error", record['status'] == 'error' and len(record['compilation_errors']) == 1
+              and record['compilation_errors'][0]['line'] == 2, record)
+
+        records = { os.path.basename(record['file']) : record
+                    for record in BatchChecker(run=False, jobs=2).grade(filenames) }
+        for (name, (status, source)) in sorted(SUBMISSIONS.items()):
+            record = records.get(name, {})
+            check("batch check of {}".format(name), record.get('status') == status, record)
+
+        record = records["indentation_error.py"]
+        check("indentation error reported as compilation error", len(record['compilation_errors']) == 1
+              and not record['convention_errors'], record)
+
+        # the runs share a worker, that is reset after each one
+        checker = BatchChecker(run=True, jobs=1)
+        check("several runs per worker", checker.max_tasks_per_worker > 1, checker.max_tasks_per_worker)
+        run_filenames = [ os.path.join(directory, name) for name in ("ok.py", "type_error.py") ]
+        records = { os.path.basename(record['file']) : record for record in checker.grade(run_filenames) }
+        check("batch run", records.get("ok.py", {}).get('status') == 'ok'
+              and records.get("type_error.py", {}).get('status') == 'error', records)
+
+        # two submissions with their own (homonymous) module, run by the same worker
+        run_filenames = []
+        for (name, value) in (("alice", 1), ("bob", 2)):
+            os.mkdir(os.path.join(directory, name))
+            with open(os.path.join(directory, name, "aide.py"), "w") as f:
+                f.write('def valeur() -> int:\n    """ la valeur """\n    return {}\n'.format(value))
+            run_filenames.append(os.path.join(directory, name, "main.py"))
+            with open(run_filenames[-1], "w") as f:
+                f.write("import aide\n\nassert aide.valeur() == {}\n".format(value))
+        records = list(BatchChecker(run=True, jobs=1).grade(run_filenames))
+        check("student modules of a previous run forgotten", [ (record['status'], record['nb_passed_tests']) for record in records ]
+              == [ ('ok', 1), ('ok', 1) ], records)
+
+        # a run whose interpreter process dies without any report
+        filename = os.path.join(directory, "died.py")
+        with open(filename, "w") as f:
+            f.write("import os\nos._exit(3)\n")
+        report = FileChecker().run(filename)
+        check("death of the interpreter process", len(report.execution_errors) == 1
+              and report.execution_errors[0].details.args == (3,), [ str(error) for error in report.execution_errors ])
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
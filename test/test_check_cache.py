@@ -0,0 +1,129 @@
+import sys
+import os
+import ast
+import tempfile
+
+sys.path.append("../")
+
+import mrpython.typechecking.prog_ast as prog_ast
+import mrpython.typechecking.check_cache as check_cache
+import mrpython.typechecking.translate as translate
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+SOURCE = '''
+def f(x : int) -> int:
+    """ successeur """
+    return x + "1"
+
+def g(x : int) -> int:
+    """ double """
+    y = 2 * x
+    return y
+
+assert f(1) == 2
+'''
+
+class ReportLines:
+    """ Renders the reported messages (in the current locale) """
+    def __init__(self):
+        self.lines = []
+
+    def add_convention_error(self, severity, err_type, line=None, offset=None, details=""):
+        self.lines.append("{} {}:{} {}: {}".format(severity, line, offset, err_type, details))
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def report_lines(type_errors):
+    report = ReportLines()
+    for error in type_errors:
+        error.report(report)
+    return report.lines
+
+def type_check(source):
+    prog = prog_ast.Program()
+    prog.build_from_ast(ast.parse(source), "cached.py", source)
+    return prog.type_check(recover=True).type_errors
+
+def fail_strings(type_errors):
+    return [ error.fail_string() for error in type_errors ]
+
+def cached(type_errors):
+    return all(isinstance(error, check_cache.CachedTypeError) for error in type_errors)
+
+if __name__ == "__main__":
+    translate.set_translator_locale('en')
+
+    cache = check_cache.TypeCheckCache()
+    checked = cache.type_check(SOURCE, recover=True)
+    check("miss: the program is checked", checked and not cached(checked), fail_strings(checked))
+
+    hit = cache.type_check(SOURCE, recover=True)
+    check("hit: the result is restored", cached(hit), fail_strings(hit))
+    check("hit: same errors", fail_strings(hit) == fail_strings(checked), fail_strings(hit))
+    check("hit: same reported messages", report_lines(hit) == report_lines(checked), report_lines(hit))
+
+    program_key = cache.program_key(SOURCE)
+    check("program not cached on the first miss", program_key not in cache.entries)
+    first_error = cache.type_check(SOURCE, recover=False)
+    check("miss: another mode", not cached(first_error) and len(first_error) == 1, fail_strings(first_error))
+    check("program cached on the second miss", program_key in cache.entries)
+
+    edited = cache.type_check(SOURCE.replace('x + "1"', 'x + 1'), recover=True)
+    check("miss: an edited source", not cached(edited) and len(edited) == len(checked) - 1, fail_strings(edited))
+
+    # the messages are cached untranslated
+    english = report_lines(hit)
+    translate.set_translator_locale('fr')
+    french = cache.type_check(SOURCE, recover=True)
+    check("hit: in another locale", cached(french) and report_lines(french) != english
+          and report_lines(french) == report_lines(type_check(SOURCE)), report_lines(french))
+    translate.set_translator_locale('en')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        disk_cache = check_cache.TypeCheckCache(cache_dir)
+        disk_cache.type_check(SOURCE, recover=True)
+        check("results and programs written to disk"
+              , len([ name for name in os.listdir(cache_dir) if name.endswith(".pickle") ]) == 2, os.listdir(cache_dir))
+
+        # a new cache (e.g. another session) reads the disk
+        restored = check_cache.TypeCheckCache(cache_dir).type_check(SOURCE, recover=True)
+        check("disk round trip", cached(restored) and fail_strings(restored) == fail_strings(checked)
+              and report_lines(restored) == report_lines(checked), report_lines(restored))
+
+        # a corrupted entry is checked again
+        key = disk_cache.key(SOURCE, True)
+        with open(disk_cache.entry_path(key), "wb") as f:
+            f.write(b"corrupted")
+        rechecked = check_cache.TypeCheckCache(cache_dir).type_check(SOURCE, recover=True)
+        check("corrupted entry checked again", not cached(rechecked)
+              and fail_strings(rechecked) == fail_strings(checked), fail_strings(rechecked))
+
+    sources = [ SOURCE + "\nassert g({}) == {}\n".format(n, 2*n) for n in range(3) ]
+    small_cache = check_cache.TypeCheckCache()
+    small_cache.type_check(sources[0])
+    small_cache = check_cache.TypeCheckCache(max_bytes=2 * small_cache.nb_bytes)
+    for source in sources:
+        small_cache.type_check(source)
+    check("bounded memory cache", len(small_cache.entries) == 2 and small_cache.nb_bytes <= small_cache.max_bytes
+          and small_cache.key(sources[0]) not in small_cache.entries, (len(small_cache.entries), small_cache.nb_bytes))
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
@@ -0,0 +1,87 @@
+import sys
+import glob
+import json
+import os.path
+
+sys.path.append("../")
+
+import mrpython.typechecking.prog_ast as prog_ast
+import mrpython.typechecking.typechecker as typechecker
+import mrpython.typechecking.translate as translate
+
+TESTPROG_PATH = "./progs"
+EXAMPLES_PATH = "../examples"
+
+# the complete lists of errors (in first error and recovery modes, with their
+# rendered messages) reported on the programs, that a rework of the checker
+# internals must not change (python test_errors.py --save-baseline to update)
+BASELINE_FILE = "./errors_baseline.json"
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+class ReportLines:
+    """ Renders the reported messages """
+    def __init__(self):
+        self.lines = []
+
+    def add_convention_error(self, severity, err_type, line=None, offset=None, details=""):
+        self.lines.append("{} {}:{} {}: {}".format(severity, line, offset, err_type, details))
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def reported_errors(prog_filename, recover):
+    prog = prog_ast.Program()
+    prog.build_from_file(prog_filename)
+    report = ReportLines()
+    fail_strings = []
+    for error in prog.type_check(recover=recover).type_errors:
+        fail_strings.append(error.fail_string())
+        error.report(report)
+    return { 'errors' : fail_strings, 'reports' : report.lines }
+
+if __name__ == "__main__":
+    translate.set_translator_locale('en')
+
+    results = dict()
+    prog_filenames = sorted(glob.glob(os.path.join(TESTPROG_PATH, "*.py"))) \
+        + sorted(glob.glob(os.path.join(EXAMPLES_PATH, "*.py")))
+    for prog_filename in prog_filenames:
+        for recover in (False, True):
+            name = "{} ({})".format(os.path.relpath(prog_filename), "recovery" if recover else "first error")
+            results[name] = reported_errors(prog_filename, recover)
+
+    if "--save-baseline" in sys.argv[1:]:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True, ensure_ascii=False)
+        print("Baseline saved: {} reports".format(len(results)))
+        sys.exit(0)
+
+    with open(BASELINE_FILE) as f:
+        baseline = json.load(f)
+
+    for (name, result) in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is None:
+            print("* Skipping: {} (not in the baseline)".format(name))
+            continue
+        check(name, result == expected, "expecting {}, computed {}".format(expected, result))
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
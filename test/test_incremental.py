@@ -0,0 +1,89 @@
+import sys
+import ast
+
+sys.path.append("../")
+
+import mrpython.typechecking.prog_ast as prog_ast
+import mrpython.typechecking.typechecker as typechecker
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+SOURCE = '''
+def f(x : int) -> int:
+    """ successeur """
+    return x + 1
+
+def g(x : int) -> int:
+    """ double du successeur """
+    return 2 * f(x)
+
+def h(s : str) -> int:
+    """ erreur (sans appel de f) """
+    # ni de g
+    return s + 1
+
+assert g(1) == 4
+'''
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def type_check(source, previous_ctx=None, incremental=True):
+    prog = prog_ast.Program()
+    prog.build_from_ast(ast.parse(source), "incremental.py", source)
+    return prog.type_check(previous_ctx, incremental=incremental)
+
+def rechecked(ctx, previous_ctx):
+    """ The functions of ctx that have been checked again """
+    return { fun_name for (fun_name, fun_check) in ctx.function_checks.items()
+             if fun_check is not previous_ctx.function_checks.get(fun_name) }
+
+def fail_strings(ctx):
+    return [ error.fail_string() for error in ctx.type_errors ]
+
+if __name__ == "__main__":
+    one_off_ctx = type_check(SOURCE, incremental=False)
+    check("no function results recorded by a one-off check", not one_off_ctx.function_checks
+          , one_off_ctx.function_checks)
+
+    ctx = type_check(SOURCE)
+    check("first check", set(ctx.function_checks) == { 'f', 'g', 'h' } and len(ctx.type_errors) == 1
+          , fail_strings(ctx))
+
+    unchanged_ctx = type_check(SOURCE, ctx)
+    check("unchanged program not checked again", not rechecked(unchanged_ctx, ctx)
+          , rechecked(unchanged_ctx, ctx))
+    check("errors of the unchanged functions", fail_strings(unchanged_ctx) == fail_strings(ctx)
+          , fail_strings(unchanged_ctx))
+
+    # same positions, only the body of f changes
+    edited_ctx = type_check(SOURCE.replace("return x + 1", "return x + 2"), unchanged_ctx)
+    check("edited function checked again", rechecked(edited_ctx, unchanged_ctx) == { 'f' }
+          , rechecked(edited_ctx, unchanged_ctx))
+
+    # the signature of f changes: g (that calls f) is checked again
+    # (not h, whose docstring and comment mention f and g)
+    signature_ctx = type_check(SOURCE.replace("def f(x : int) -> int:", "def f(x : float) -> float:"), edited_ctx)
+    check("caller of a changed signature checked again", rechecked(signature_ctx, edited_ctx) == { 'f', 'g' }
+          , rechecked(signature_ctx, edited_ctx))
+    check("errors of the changed functions", fail_strings(signature_ctx) == fail_strings(
+        type_check(SOURCE.replace("def f(x : int) -> int:", "def f(x : float) -> float:"))), fail_strings(signature_ctx))
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
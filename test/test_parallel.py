@@ -0,0 +1,77 @@
+import sys
+import glob
+import os.path
+import multiprocessing as mp
+
+sys.path.append("../")
+
+import mrpython.typechecking.prog_ast as prog_ast
+import mrpython.typechecking.typechecker as typechecker
+import mrpython.typechecking.parallel_checker as parallel_checker
+
+TESTPROG_PATH = "./progs"
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def type_errors(prog_filename, recover, jobs):
+    prog = prog_ast.Program()
+    prog.build_from_file(prog_filename)
+    ctx = prog.type_check(recover=recover, jobs=jobs)
+    return [ error.fail_string() for error in ctx.type_errors ]
+
+if __name__ == "__main__":
+    mp.set_start_method('spawn')
+
+    # small programs: only the checking processes are tested
+    # (not the choice of the number of processes)
+    parallel_checker.PARALLEL_MIN_LINES = 1
+    parallel_checker.available_cpus = lambda: 2
+
+    prog = prog_ast.Program()
+    prog.build_from_file(os.path.join(TESTPROG_PATH, "03_fact_OK_00.py"))
+    check("number of processes bounded by the processors"
+          , parallel_checker.parallel_jobs(prog, list(prog.functions), 4) == 2)
+
+    # all the functions are checked by the processes (none left to the main process)
+    prog = prog_ast.Program()
+    prog.build_from_file(os.path.join(TESTPROG_PATH, "32_list_compr_OK.py"))
+    ctx = typechecker.TypingContext(prog)
+    for type_check_phase in (typechecker.type_check_top_level,
+                             typechecker.type_check_type_aliases,
+                             typechecker.type_check_imports,
+                             typechecker.type_check_signatures):
+        type_check_phase(prog, ctx)
+    results = parallel_checker.check_functions_in_parallel(prog, ctx, list(prog.functions), 2)
+    check("functions checked by the processes", set(results) == set(prog.functions), results)
+
+    for prog_filename in sorted(glob.glob(os.path.join(TESTPROG_PATH, "*.py"))):
+        prog_name = os.path.basename(prog_filename)
+        for recover in (False, True):
+            sequential = type_errors(prog_filename, recover, 1)
+            parallel = type_errors(prog_filename, recover, 2)
+            check("{} ({})".format(prog_name, "recovery" if recover else "first error")
+                  , parallel == sequential, "expecting {}, computed {}".format(sequential, parallel))
+
+    parallel_checker.shutdown_check_pool()
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
@@ -0,0 +1,129 @@
+import sys
+import os.path
+import tempfile
+
+sys.path.append("../")
+
+import mrpython.typechecking.typechecker as typechecker
+import mrpython.typechecking.check_cache as check_cache
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+# the modules of the project (main imports shapes, that imports geom)
+MODULES = {
+    "geom.py" : '''from typing import Tuple
+
+Point = Tuple[float, float]
+
+def norm2(p : Point) -> float:
+    """Retourne le carre de la norme de p."""
+    x, y = p
+    return x * x + y * y
+
+assert norm2((1.0, 2.0)) == 5.0
+'''
+    , "shapes.py" : '''import geom
+
+def farthest(p : geom.Point, q : geom.Point) -> geom.Point:
+    """Retourne le point le plus eloigne de l'origine."""
+    if geom.norm2(p) >= geom.norm2(q):
+        return p
+    else:
+        return q
+
+assert farthest((1.0, 0.0), (0.0, 2.0)) == (0.0, 2.0)
+'''
+    , "main.py" : '''import shapes
+import geom
+
+def total(p : geom.Point) -> float:
+    """Retourne une norme."""
+    return geom.norm2(shapes.farthest(p, (3.0, 4.0)))
+
+assert total((0.0, 0.0)) == 25.0
+'''
+    , "bad.py" : '''import geom
+
+def f(x : int) -> int:
+    """doc"""
+    return geom.norm2(x)
+
+assert f(1) == 1
+'''
+    , "cyc_a.py" : '''import cyc_b
+
+def fa(x : int) -> int:
+    """doc"""
+    return x
+
+assert fa(1) == 1
+'''
+    , "cyc_b.py" : '''import cyc_a
+
+def fb(x : int) -> int:
+    """doc"""
+    return cyc_a.fa(x)
+
+assert fb(1) == 1
+''' }
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def write_module(directory, name, source):
+    with open(os.path.join(directory, name), "w") as f:
+        f.write(source)
+
+def fail_strings(filename):
+    ctx = typechecker.typecheck_from_file(filename, recover=True)
+    return [ error.fail_string() for error in ctx.type_errors ]
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        for (name, source) in MODULES.items():
+            write_module(directory, name, source)
+
+        errors = fail_strings(os.path.join(directory, "main.py"))
+        check("imported modules and type aliases", errors == [], errors)
+
+        errors = fail_strings(os.path.join(directory, "bad.py"))
+        check("wrong call of an imported function", errors == [ 'TypeComparisonError[Tuple[float,float]/int]@5:22' ], errors)
+
+        errors = fail_strings(os.path.join(directory, "cyc_a.py"))
+        check("import cycle", errors == [ 'ImportCycleError[cyc_a -> cyc_b -> cyc_a]@1:0' ], errors)
+
+        # the cached results of main depend on the interfaces of its imports
+        cache = check_cache.TypeCheckCache()
+        main_filename = os.path.join(directory, "main.py")
+        cache.type_check(MODULES["main.py"], main_filename, recover=True)
+
+        write_module(directory, "geom.py", MODULES["geom.py"].replace("-> float", "-> str")
+                     .replace("return x * x + y * y", 'return "norme"'))
+        expected = [ 'ImportedModuleErrorsWarning[geom]@2:0', 'WrongReturnTypeError[float/str]@6:4' ]
+        errors = fail_strings(main_filename)
+        check("edited imported module", errors == expected, errors)
+        errors = [ error.fail_string() for error in cache.type_check(MODULES["main.py"], main_filename, recover=True) ]
+        check("cached result of an edited imported module", errors == expected, errors)
+
+        write_module(directory, "geom.py", MODULES["geom.py"])
+        errors = [ error.fail_string() for error in cache.type_check(MODULES["main.py"], main_filename, recover=True) ]
+        check("cached result of a restored imported module", errors == [], errors)
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))
@@ -0,0 +1,76 @@
+import sys
+import ast
+
+sys.path.append("../")
+
+import mrpython.typechecking.prog_ast as prog_ast
+import mrpython.typechecking.typechecker as typechecker
+
+nb_tests_pass = 0
+nb_tests_fail = 0
+nb_tests = 0
+
+# one error in a signature, two in function bodies and one in a test case
+SOURCE = '''
+def f(x : int) -> int:
+    """ erreur fatale """
+    return x + "1"
+
+def g(s : str) -> int:
+    """ deuxieme erreur """
+    return len(s) + s
+
+def h(x : int) -> Truc:
+    """ signature erronee """
+    return x
+
+def k(x : int) -> int:
+    """ correcte """
+    return f(x) + 1
+
+assert k(1) == "3"
+'''
+
+EXPECTED_ERRORS = [ 'UnknownTypeAliasError[Truc]@10:0'
+                    , 'TypeComparisonError[float/str]@4:15'
+                    , 'TypeComparisonError[float/str]@8:20'
+                    , 'CompareConditionError[int/str]@18:7' ]
+
+def check(name, ok, details=""):
+    global nb_tests, nb_tests_pass, nb_tests_fail
+    nb_tests += 1
+    print("* Testing: {}".format(name))
+    if ok:
+        print("  ==> PASS")
+        nb_tests_pass += 1
+    else:
+        print("  ==> FAIL: {}".format(details))
+        nb_tests_fail += 1
+    print("")
+
+def percent(value, maxi):
+    return int(100.0*value/maxi)
+
+def fail_strings(source, recover):
+    prog = prog_ast.Program()
+    prog.build_from_ast(ast.parse(source), "recovery.py", source)
+    return [ error.fail_string() for error in prog.type_check(recover=recover).type_errors ]
+
+if __name__ == "__main__":
+    first_error = fail_strings(SOURCE, False)
+    check("first error only", first_error == EXPECTED_ERRORS[:1], first_error)
+
+    all_errors = fail_strings(SOURCE, True)
+    check("all the errors in recovery mode", all_errors == EXPECTED_ERRORS, all_errors)
+
+    correct = fail_strings(SOURCE.replace('x + "1"', 'x + 1').replace('len(s) + s', 'len(s)'), True)
+    check("errors of the corrected functions not reported", correct == [ EXPECTED_ERRORS[0], EXPECTED_ERRORS[3] ], correct)
+
+    many_errors = SOURCE + "".join('\nassert k({}) == "{}"\n'.format(n, n) for n in range(2 * typechecker.RECOVERY_MAX_ERRORS))
+    bounded = fail_strings(many_errors, True)
+    check("number of errors bounded", len(bounded) == typechecker.RECOVERY_MAX_ERRORS, len(bounded))
+
+    print("-----")
+    print("Summary: {} test cases".format(nb_tests))
+    print("  ==> {} passed ({} %)".format(nb_tests_pass, percent(nb_tests_pass, nb_tests)))
+    print("  ==> {} failed ({} %)".format(nb_tests_fail, percent(nb_tests_fail, nb_tests)))